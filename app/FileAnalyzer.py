@@ -1,5 +1,8 @@
 import os
 import sys
+import time
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime  # Import datetime
 from analyzer.common import AnalyzerHelper  # if needed elsewhere
 from analyzer.java.JavaClassAnalyzer import JavaClassAnalyzer
@@ -8,127 +11,342 @@ from analyzer.kotlin.KotlinClassAnalyzer import KotlinClassAnalyzer
 from analyzer.csharp.CSharpClassAnalyzer import CSharpClassAnalyzer
 from model.AnalyzerEntities import FileTypeEnum
 from utils.SystemUtility import *
+from utils.SourceFile import SourceFile
 from drawer.DataGenerator import DataGenerator
+from drawer.SymbolResolver import SymbolResolver
 from analyzer.AbstractAnalyzer import AbstractAnalyzer
+from cache.ParseCache import ParseCache
+from metrics.RunMetrics import RunMetrics
+from utils.TimeBudget import TimeBudget, AnalysisTimeout
 from drawer.ClassUmlDrawer import *
 
+# Source file extensions handled by each class analyzer
+LANGUAGE_EXTENSIONS = {
+    FileTypeEnum.JAVA: (".java",),
+    FileTypeEnum.CPP: (".cpp", ".h", ".hpp"),
+    FileTypeEnum.CSHARP: (".cs",),
+    FileTypeEnum.KOTLIN: (".kt",),
+}
+
+# Seconds the class analysis of one file may take before the file is skipped
+FILE_TIME_BUDGET = 60
+
+# Worker processes are started from a clean process instead of forking the caller:
+# the threads of other jobs and of the renderers may hold locks at the time of the
+# fork, which the child would inherit locked
+POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def analyze_file(filePath, language, budget=None):
+    """Analyzes a single source file, returns its ClassNode list, the FileInfo of the
+    analyzed content, stage timings and the reason it was skipped.
+
+    Kept at module level so it can be pickled and run by process pool workers. The
+    file is read once and the SourceFile is handed to every analyzer stage. The
+    analysis stops after budget seconds, see TimeBudget. The list is None and the
+    reason set when the file could not be read, the analyzer failed or ran out of
+    time, so the result is not cached.
+    """
+    classAnalyzer = FileAnalyzer.get_class_analyzer(language)
+    if not classAnalyzer:
+        return [], None, {}, None
+    RunMetrics.begin_file()
+    try:
+        with RunMetrics.file_stage("read"):
+            source = SourceFile.read(filePath)
+    except OSError as e:
+        print(f"ERROR reading file {filePath}: {e}")
+        return None, None, RunMetrics.end_file(), f"unreadable: {e}"
+    try:
+        # Pass language context if needed by analyzer (e.g., for package name)
+        with TimeBudget(budget), RunMetrics.file_stage("classes"):
+            listOfClasses = classAnalyzer.analyze(source, language)
+        file_info = FileInfo(
+            name=filePath, size=source.size, last_modifies=source.mtime, md5=source.md5
+        )
+        return listOfClasses, file_info, RunMetrics.end_file(), None
+    except AnalysisTimeout:
+        print(f"ERROR analyzing file {filePath}: timed out after {budget:g}s")
+        return None, None, RunMetrics.end_file(), f"timed out after {budget:g}s"
+    except Exception as e:
+        print(f"ERROR analyzing file {filePath}: {e}")
+        return None, None, RunMetrics.end_file(), f"error: {e}"
+
 
 class FileAnalyzer(AbstractAnalyzer):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        workers=None,
+        use_cache=True,
+        progress=None,
+        layout=True,
+        file_budget=FILE_TIME_BUDGET,
+    ) -> None:
         if not os.path.exists("static/out"):
             os.makedirs("static/out")
+        # Number of worker processes used for per-file analysis, 1 means serial
+        self.workers = workers if workers else (os.cpu_count() or 1)
+        # Reuse parse results of unchanged files from previous runs
+        self.use_cache = use_cache
+        # Called as progress(phase, processed, total) while analyze() runs
+        self.progress = progress
+        # Precompute the 3D layout into the .pos.json sidecar of each result
+        self.layout = layout
+        # Seconds allowed per file, None or 0 for no limit
+        self.file_budget = file_budget
+        # Resolved relations of the current run, shared by the UML and JSON output
+        self.symbolResolver = None
+        # Stage timings and counters of the current run
+        self.metrics = RunMetrics()
+
+    def report_progress(self, phase, processed=0, total=0):
+        if self.progress:
+            self.progress(phase, processed, total)
 
     def analyze(self, targetPath, pattern=None):
-        systemUtility = SystemUtility()
-        listOfFiles = systemUtility.get_list_of_files(targetPath, "*")
-        print(listOfFiles)
-
-        listOfClassNodes = []
-        analyzed_languages = set()
-        # Temporary map to help determine language context later
-        language_map = {}
-
-        for filePath in listOfFiles:
-            language = self.detectLang(filePath)
-            if language != FileTypeEnum.UNDEFINED:
+        """Analyzes targetPath and writes the results; returns their base filename."""
+        self.metrics = RunMetrics()
+        task_languages = []
+
+        def tasks():
+            # Files are analyzed while the tree is still being walked
+            sourceFiles = self.iter_source_files(targetPath)
+            while True:
+                with self.metrics.stage("discover"):
+                    task = next(sourceFiles, None)
+                if task is None:
+                    return
+                filePath, language = task
                 print(f"- Analyzing: {filePath} {language}")
-                analyzed_languages.add(language)
-                language_map[filePath] = language  # Store language per file
-                classAnalyzer = self.get_class_analyzer(language)
-                if classAnalyzer:
-                    try:
-                        # Pass language context if needed by analyzer (e.g., for package name)
-                        listOfClasses = classAnalyzer.analyze(filePath, language)
-                        listOfClassNodes.extend(listOfClasses)
-                    except Exception as e:
-                        print(f"ERROR analyzing file {filePath}: {e}")
-            else:
-                print(f"- Skipping unsupported file: {filePath}")
-
-        # --- Deduplicate listOfClassNodes ---
-        unique_class_nodes = {}
-        # Determine primary language for qualification *before* deduplication loop
-        primary_language = FileTypeEnum.JAVA  # Default or determine more intelligently
-        if analyzed_languages:
-            # Simple heuristic: pick the first one found, or prioritize Java/C++ etc.
-            primary_language = list(analyzed_languages)[0]
-        temp_data_gen = DataGenerator()  # Need instance for _get_qualified_name
-        temp_data_gen._language_context = primary_language  # Set context
-
-        for node in listOfClassNodes:
-            qualified_name = temp_data_gen._get_qualified_name(node)
-            if qualified_name not in unique_class_nodes:
-                unique_class_nodes[qualified_name] = node
-
-        deduplicated_list = list(unique_class_nodes.values())
+                task_languages.append(language)
+                yield filePath, language
+
+        start = time.perf_counter()
+        results = self.analyze_files(tasks())
+        # The walk runs inside the analysis, its time is only counted as discover
+        self.metrics.add_time(
+            "analyze",
+            time.perf_counter() - start - self.metrics.stages.get("discover", 0.0),
+        )
+
+        # Classes are partitioned by source language, in the order the languages are
+        # found, and named in the context of their own language
+        partitions = dict()
+        unique_names = set()
+        total_classes = 0
+        for language, listOfClasses in zip(task_languages, results):
+            partition = partitions.setdefault(language, [])
+            total_classes += len(listOfClasses)
+            for node in listOfClasses:
+                qualified_name = SymbolResolver.qualified_name_of(node, language)
+                if qualified_name not in unique_names:
+                    unique_names.add(qualified_name)
+                    partition.append(node)
+
+        # One resolver serves all partitions, edges between languages are kept
+        with self.metrics.stage("resolve"):
+            self.symbolResolver = SymbolResolver.partitioned(partitions)
+        primary_language = self.symbolResolver.language
+        deduplicated_list = self.symbolResolver.listOfClassNodes
+        self.report_progress(
+            "generating", len(deduplicated_list), len(deduplicated_list)
+        )
         print(
-            f"Total classes found: {len(listOfClassNodes)}, Unique classes: {len(deduplicated_list)}"
+            f"Total classes found: {total_classes}, Unique classes: {len(deduplicated_list)}"
         )
-        # --- End Deduplication ---
+        self.metrics.count("classes", total_classes)
+        self.metrics.count("uniqueClasses", len(deduplicated_list))
 
-        # Generate base filename
+        # Generate base filename, with milliseconds so that jobs analyzing the same
+        # path in the same second do not write to the same files
         sanitized_path_prefix = DataGenerator()._sanitize_path_for_filename(targetPath)
-        date_time = datetime.now().strftime("%m-%d-%Y_%H-%M-%S")
+        now = datetime.now()
+        date_time = (
+            now.strftime("%m-%d-%Y_%H-%M-%S") + f"-{now.microsecond // 1000:03d}"
+        )
         base_filename = f"{sanitized_path_prefix}_{date_time}"
 
         # Use the deduplicated list from now on
         if deduplicated_list:
-            # Use the previously determined primary_language
             print(
-                f"Generating consolidated UML for language context: {primary_language.name}"
+                "Generating consolidated UML for languages: "
+                + ", ".join(language.name for language in partitions)
             )
             try:
-                # Pass the primary language context to the drawer
-                umlDrawer = ClassUmlDrawer(primary_language)
-                umlDrawer.draw_multiple_uml(deduplicated_list, base_filename)
+                # Classes of the other languages are drawn in their own context
+                umlDrawer = ClassUmlDrawer(primary_language, self.metrics)
+                umlDrawer.draw_multiple_uml(
+                    deduplicated_list, base_filename, self.symbolResolver
+                )
             except Exception as e:
                 print(f"ERROR generating consolidated UML: {e}")
         else:
             print("No classes found to generate consolidated UML.")
 
         # Pass the deduplicated list to generateData
-        self.generateData(
+        dataGenerator = self.generateData(
             deduplicated_list, targetPath, base_filename, primary_language
         )
+        if self.layout and isinstance(dataGenerator, DataGenerator):
+            self.report_progress("layout")
+            try:
+                with self.metrics.stage("layout"):
+                    dataGenerator.writeLayout(base_filename)
+            except Exception as e:
+                print(f"ERROR computing the graph layout: {e}")
+        self.write_metrics(base_filename)
+        return base_filename
 
-    def get_class_analyzer(self, language):
+    def write_metrics(self, base_filename):
+        """Writes the run summary next to the result and adds it to the /metrics totals."""
+        self.metrics.publish()
+        summary = self.metrics.summary()
+        print(
+            "Stage times: "
+            + ", ".join(
+                f"{name} {seconds:.2f}s" for name, seconds in summary["stages"].items()
+            )
+        )
+        for entry in summary["slowestFiles"][:3]:
+            print(f"Slow file: {entry['path']} {entry['seconds']:.3f}s")
+        if summary["skippedFiles"]:
+            print(f"Skipped files: {len(summary['skippedFiles'])}")
+        try:
+            self.metrics.write(f"static/out/{base_filename}.run.json")
+        except OSError as e:
+            print(f"ERROR writing the run summary: {e}")
+
+    def iter_source_files(self, targetPath):
+        """Lazily yields (filePath, language) for every supported source file under targetPath."""
+        extensions = [ext for exts in LANGUAGE_EXTENSIONS.values() for ext in exts]
+        for filePath in SystemUtility.walk_files(targetPath, extensions):
+            yield filePath, self.detectLang(filePath)
+
+    def analyze_files(self, tasks):
+        """Analyzes (filePath, language) tasks and returns one list of classes per task.
+
+        Tasks may be a lazy iterable; files are dispatched as they arrive. Unchanged
+        files are served from the parse cache, the rest are analyzed by a process
+        pool when more than one worker is configured. Results are returned in task
+        order so the merged output is identical to a serial run. Files that fail or
+        run out of their time budget are skipped and listed in the run summary.
+        """
+        parseCache = ParseCache() if self.use_cache else None
+        budget = self.file_budget
+        # The budget needs signals; off the main thread files are always analyzed
+        # by worker processes, where it is enforced
+        in_process = not budget or TimeBudget.available()
+        serial = self.workers <= 1 and in_process
+        executor = None
+        listOfTasks = []
+        results = []
+        pending = []
+        processed = 0
+
+        for filePath, language in tasks:
+            index = len(listOfTasks)
+            listOfTasks.append((filePath, language))
+            self.metrics.count("files")
+            results.append(
+                parseCache.lookup(filePath, language) if parseCache else None
+            )
+            if results[index] is not None:
+                results[index] = [node.compact() for node in results[index]]
+                self.metrics.count("cachedFiles")
+                processed += 1
+                self.report_progress("analyzing", processed, len(listOfTasks))
+                continue
+
+            pending.append(index)
+            if serial:
+                results[index] = analyze_file(filePath, language, budget)
+                processed += 1
+                self.report_progress("analyzing", processed, len(listOfTasks))
+                continue
+            # Only start worker processes once there is more than one file to
+            # analyze, unless a single file needs one for its budget
+            if executor is None and (len(pending) > 1 or not in_process):
+                print(f"Analyzing files with {self.workers} worker processes")
+                executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=POOL_CONTEXT
+                )
+                if pending[0] != index:
+                    results[pending[0]] = executor.submit(
+                        analyze_file, *listOfTasks[pending[0]], budget
+                    )
+            if executor is not None:
+                results[index] = executor.submit(
+                    analyze_file, filePath, language, budget
+                )
+            # The total keeps growing while the tree is walked
+            self.report_progress("analyzing", processed, len(listOfTasks))
+
+        try:
+            for index in pending:
+                result = results[index]
+                if not serial:
+                    if isinstance(result, Future):
+                        result = result.result()
+                    else:
+                        result = analyze_file(*listOfTasks[index], budget)
+                    processed += 1
+                    self.report_progress("analyzing", processed, len(listOfTasks))
+                listOfClasses, file_info, timings, skip_reason = result
+                self.metrics.record_file(listOfTasks[index][0], timings)
+                if skip_reason:
+                    self.metrics.skip_file(listOfTasks[index][0], skip_reason)
+                if listOfClasses is not None and parseCache:
+                    # Cached against the content that was analyzed, not the file
+                    # as it is now
+                    parseCache.store(*listOfTasks[index], listOfClasses, file_info)
+                # Finished classes are kept with interned strings and tuples
+                results[index] = [node.compact() for node in listOfClasses or []]
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if parseCache:
+            print(
+                f"Parse cache: {parseCache.hits} reused, {parseCache.misses} analyzed"
+            )
+            parseCache.close()
+        return results
+
+    @staticmethod
+    def get_class_analyzer(language):
         if language == FileTypeEnum.JAVA:
-            return JavaClassAnalyzer()
+            return JavaClassAnalyzer.instance()
         elif language == FileTypeEnum.CPP:
-            return CppClassAnalyzer()
+            return CppClassAnalyzer.instance()
         elif language == FileTypeEnum.KOTLIN:
-            return KotlinClassAnalyzer()
+            return KotlinClassAnalyzer.instance()
         elif language == FileTypeEnum.CSHARP:
-            return CSharpClassAnalyzer()
+            return CSharpClassAnalyzer.instance()
         return None
 
     # Update generateData signature to accept primary_language
     def generateData(
         self, deduplicated_list, targetPath, base_filename, primary_language
     ):
-        dataGenerator = DataGenerator()
+        dataGenerator = DataGenerator(metrics=self.metrics)
         # Explicitly set the language context in the DataGenerator instance
         dataGenerator._language_context = primary_language
-        dataGenerator.generateData(deduplicated_list, targetPath, base_filename)
+        dataGenerator.generateData(
+            deduplicated_list, targetPath, base_filename, self.symbolResolver
+        )
+        return dataGenerator
 
     def detectLang(self, fileName):
-        if fileName.endswith(".java"):
-            return FileTypeEnum.JAVA
-        elif (
-            fileName.endswith(".cpp")
-            or fileName.endswith(".h")
-            or fileName.endswith(".hpp")
-        ):
-            return FileTypeEnum.CPP
-        elif fileName.endswith(".cs"):
-            return FileTypeEnum.CSHARP
-        elif fileName.endswith(".kt"):
-            return FileTypeEnum.KOTLIN
-        else:
-            return FileTypeEnum.UNDEFINED
+        for language, extensions in LANGUAGE_EXTENSIONS.items():
+            if fileName.endswith(extensions):
+                return language
+        return FileTypeEnum.UNDEFINED
 
 
 if __name__ == "__main__":
     print(sys.argv)
-    fileAnalyzer = FileAnalyzer()
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    fileAnalyzer = FileAnalyzer(workers)
     fileAnalyzer.analyze(sys.argv[1])
@@ -1,3 +1,13 @@
 class AbstractAnalyzer:
+    instances = dict()
+
+    @classmethod
+    def instance(cls):
+        """Returns the shared analyzer of this class; analyzers keep no state between files."""
+        analyzer = AbstractAnalyzer.instances.get(cls)
+        if analyzer is None:
+            analyzer = AbstractAnalyzer.instances[cls] = cls()
+        return analyzer
+
     def analyze(self, filePath, lang):
         raise NotImplementedError("analyze method should be implemented!")
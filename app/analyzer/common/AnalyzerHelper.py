@@ -1,27 +1,40 @@
+from analyzer.common.BraceIndex import BraceIndex
+
+
 class AnalyzerHelper:
     def __init__(self) -> None:
         pass
 
-    def findClassBoundary(self, inputStr):
-        bracketCount = 0
-        index = 0
-        for index in range(len(inputStr)):
-            if inputStr[index] == "}":
-                bracketCount = bracketCount - 1
-                if bracketCount == 0:
-                    return index
-            elif inputStr[index] == "{":
-                bracketCount = bracketCount + 1
-        return index
+    def findClassBoundary(self, inputStr, start=0):
+        """Returns the offset, relative to start, of the brace closing the first block opened at or after start."""
+        end = BraceIndex.of(inputStr).block_end(start)
+        if end is None:
+            return max(len(inputStr) - 1 - start, 0)
+        return end - start
+
+    def findMethodBoundary(self, inputStr, start=0):
+        return self.findClassBoundary(inputStr, start)
+
+    @staticmethod
+    def search_from(
+        pattern, anchoredPattern, inputStr, pos=0, endpos=None, previous=None
+    ):
+        """Same result as pattern.search(inputStr[pos:endpos]) but without copying the slice.
 
-    def findMethodBoundary(self, inputStr):
-        bracketCount = 0
-        index = 0
-        for index in range(len(inputStr)):
-            if inputStr[index] == "}":
-                bracketCount = bracketCount - 1
-                if bracketCount == 0:
-                    return index
-            elif inputStr[index] == "{":
-                bracketCount = bracketCount + 1
-        return index
+        Match offsets are absolute. With re.MULTILINE a leading '^' also matches at the
+        start of a slice, so anchoredPattern (the pattern without that '^') is tried
+        at pos first. previous is the result of an earlier search_from call on the
+        same text and endpos; it is reused while it still lies at or after pos, and
+        when it is False (an earlier search found nothing) only pos is checked.
+        Returns False when there is no match so the result can be passed back in.
+        """
+        if endpos is None:
+            endpos = len(inputStr)
+        match = anchoredPattern.match(inputStr, pos, endpos)
+        if match:
+            return match
+        if previous is False:
+            return False
+        if previous is not None and previous.start() >= pos:
+            return previous
+        return pattern.search(inputStr, pos, endpos) or False
@@ -0,0 +1,103 @@
+import sys
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from analyzer.common.PatternRegistry import PatternRegistry
+
+# Literals and comments are matched as a whole so braces inside them are skipped
+TOKEN_PATTERN = PatternRegistry.compile(
+    r'"""[\s\S]*?"""'  # Java text blocks, Kotlin raw strings
+    r'|(?<!\w)(?:u8|[uUL])?R"([^()\\\s"]{0,16})\([\s\S]*?\)\1"'  # C++ raw strings
+    r'|@"(?:[^"]|"")*"'  # C# verbatim strings
+    r'|"(?:\\.|[^"\\\n])*"'  # string literals
+    r"|'(?:\\.|[^'\\\n])*'"  # char literals
+    r"|//[^\n]*"  # single-line comments
+    r"|/\*[\s\S]*?\*/"  # multi-line comments
+    r"|[{}]"
+)
+
+
+class BraceIndex:
+    """Matching brace pairs of a source text, built with a single tokenizer pass.
+
+    Braces inside string, char and comment literals are ignored. Use BraceIndex.of()
+    to share the index of a text between the analyzers working on it.
+    """
+
+    def __init__(self, text) -> None:
+        self.text = text
+        self.pairs = dict()
+        self.opens = list()
+        # Nesting level before each opening brace, and the index of the first later
+        # opening brace nested one level deeper (None when there is none)
+        self.open_levels = list()
+        self.deeper = list()
+        # Brace offsets and the nesting level after each of them; stray closing
+        # braces take the level below zero
+        self.positions = list()
+        self.levels = list()
+        self.build()
+
+    def build(self):
+        stack = []
+        # Opening braces still looking for a deeper one, their levels never increase
+        waiting = []
+        level = 0
+        for match in TOKEN_PATTERN.finditer(self.text):
+            token = match.group()
+            if token == "{":
+                index = len(self.opens)
+                while waiting and self.open_levels[waiting[-1]] < level:
+                    self.deeper[waiting.pop()] = index
+                waiting.append(index)
+                self.opens.append(match.start())
+                self.open_levels.append(level)
+                self.deeper.append(None)
+                stack.append(match.start())
+                level += 1
+            elif token == "}":
+                if stack:
+                    self.pairs[stack.pop()] = match.start()
+                level -= 1
+            else:
+                continue
+            self.positions.append(match.start())
+            self.levels.append(level)
+
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def of(text):
+        return BraceIndex(text)
+
+    def closing(self, pos):
+        """Returns the offset of the brace closing the one opened at pos, or None."""
+        return self.pairs.get(pos)
+
+    def level_at(self, pos):
+        """Returns the nesting level at offset pos."""
+        index = bisect_left(self.positions, pos)
+        return self.levels[index - 1] if index else 0
+
+    def block_end(self, start):
+        """Returns the offset closing the first block opened at or after start, or None.
+
+        Blocks are only considered at the nesting level of start, so when start lies
+        inside a block the braces closing it and the blocks after it are skipped.
+        The opening brace following start is at the level of start, answered with
+        one pair lookup, or below it when closing braces come first; every hop to a
+        deeper brace then climbs one level.
+        """
+        level = self.level_at(start)
+        index = bisect_left(self.opens, start)
+        if index == len(self.opens):
+            return None
+        while self.open_levels[index] < level:
+            index = self.deeper[index]
+            if index is None:
+                return None
+        return self.closing(self.opens[index])
+
+
+if __name__ == "__main__":
+    braceIndex = BraceIndex(open(sys.argv[1]).read())
+    print(len(braceIndex.pairs), "blocks,", len(braceIndex.opens), "opening braces")
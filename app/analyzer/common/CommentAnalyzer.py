@@ -5,65 +5,90 @@ import re
 from analyzer.AbstractAnalyzer import *
 from model.AnalyzerEntities import *
 from utils.FileReader import *
+from analyzer.common.PatternRegistry import PatternRegistry
+from metrics.RunMetrics import RunMetrics
+
+# A literal or comment that is never closed runs to the end of its line (or of the
+# file for block comments and multi-line literals), like compilers read it. A stray
+# quote or comment opener is then consumed once instead of failing and being
+# scanned again from every later position, which made the pass quadratic.
+UNCLOSED_LINE = r"(?=\n)|\Z"
+STRING_LITERAL = r'"(?:\\[\s\S]|[^"\\\n])*(?:"|' + UNCLOSED_LINE + ")"
+CHAR_LITERAL = r"'(?:\\[\s\S]|[^'\\\n])*(?:'|" + UNCLOSED_LINE + ")"
+LINE_COMMENT = r"//[^\n]*"
+BLOCK_COMMENT = r"/\*[\s\S]*?(?:\*/|\Z)"
 
 
 class CommentAnalyzer(AbstractAnalyzer):
+    """Removes comments while keeping string and char literals as they are.
+
+    Each language has one lexer pattern, literals first and comments second, applied
+    in a single left to right pass: whatever starts first wins, so comment markers
+    inside literals and quotes inside comments are both left alone.
+    """
+
     def __init__(self) -> None:
         self.pattern = dict()
+        self.commentPattern = dict()
         self.initPatterns()
+        self.lexers = {
+            lang: PatternRegistry.compile(
+                f"(?P<literal>{'|'.join(self.pattern[lang])})"
+                f"|(?P<comment>{'|'.join(self.commentPattern[lang])})"
+            )
+            for lang in self.pattern
+        }
 
     def initPatterns(self):
-        # Updated C++ patterns with non-greedy and proper string detection
         self.pattern[FileTypeEnum.CPP] = [
-            r'"(?:\\.|[^"\\])*"',  # string literals (keep)
-            r"//.*?$",  # single-line comments
-            r"/\*.*?\*/",  # multi-line comments
+            # Raw strings, the delimiter has to repeat before the closing quote
+            r'(?<!\w)(?:u8|[uUL])?R"(?P<delimiter>[^()\\\s"]{0,16})\([\s\S]*?(?:\)(?P=delimiter)"|\Z)',
+            r"(?:(?<!\w)(?:u8|[uUL]))?" + STRING_LITERAL,
+            # A quote right after a digit is a digit separator (1'000'000)
+            r"(?:(?<!\w)(?:u8|[uUL])|(?<!\w))" + CHAR_LITERAL,
         ]
+        self.commentPattern[FileTypeEnum.CPP] = [LINE_COMMENT, BLOCK_COMMENT]
 
         self.pattern[FileTypeEnum.CSHARP] = [
-            r'"(?:\\.|[^"\\])*"',  # string literals (keep)
-            r"//.*?$",  # single-line comments
-            r"/\*.*?\*/",  # multi-line comments
+            r'"""[\s\S]*?(?:"""|\Z)',  # raw string literals
+            r'(?:\$@|@\$?)"(?:[^"]|"")*(?:"|\Z)',  # verbatim strings
+            STRING_LITERAL,
+            CHAR_LITERAL,
         ]
+        self.commentPattern[FileTypeEnum.CSHARP] = [LINE_COMMENT, BLOCK_COMMENT]
 
         self.pattern[FileTypeEnum.JAVA] = [
-            r'"(?:\\.|[^"\\])*"',  # string literals
-            r"//.*?$",
-            r"/\*.*?\*/",
+            r'"""[\s\S]*?(?:"""|\Z)',  # text blocks
+            STRING_LITERAL,
+            CHAR_LITERAL,
         ]
+        self.commentPattern[FileTypeEnum.JAVA] = [LINE_COMMENT, BLOCK_COMMENT]
 
         self.pattern[FileTypeEnum.KOTLIN] = [
-            r'"(?:\\.|[^"\\])*"',
-            r"//.*?$",
-            r"/\*.*?\*/",
+            r'"""[\s\S]*?(?:"""|\Z)',  # raw strings
+            STRING_LITERAL,
+            CHAR_LITERAL,
+        ]
+        self.commentPattern[FileTypeEnum.KOTLIN] = [
+            LINE_COMMENT,
+            # Kotlin block comments nest, one nested level is matched
+            r"/\*(?:[^*/]|\*(?!/)|/(?!\*)|/\*[\s\S]*?(?:\*/|\Z))*(?:\*/|\Z)",
         ]
 
     def remove_comments(self, content, lang):
-        # Find all strings first so we can ignore them during comment removal
-        string_pattern = self.pattern[lang][0]
-        comment_patterns = self.pattern[lang][1:]
-
-        # Store string literal placeholders
-        strings = re.findall(string_pattern, content)
-        content = re.sub(string_pattern, "___STRING___", content)
-
-        # Remove comments
-        for comment_pattern in comment_patterns:
-            content = re.sub(
-                comment_pattern, "", content, flags=re.MULTILINE | re.DOTALL
-            )
-
-        # Restore strings
-        for s in strings:
-            content = content.replace("___STRING___", s, 1)
+        return self.lexers[lang].sub(self.keep_literal, content)
 
-        return content
+    @staticmethod
+    def keep_literal(match):
+        return match.group() if match.group("comment") is None else ""
 
     def analyze(self, filePath, lang, inputStr=None):
         fileReader = FileReader()
+        # filePath may also be the SourceFile already read by the caller
         content = inputStr if inputStr is not None else fileReader.read_file(filePath)
 
-        cleaned = self.remove_comments(content, lang)
+        with RunMetrics.file_stage("comments"):
+            cleaned = self.remove_comments(content, lang)
         return cleaned
 
 
@@ -0,0 +1,62 @@
+import os
+import re
+
+# Set to "regex" to match with the third party regex module when it is installed
+REGEX_ENGINE_ENV = "KUDSIGHT_REGEX_ENGINE"
+
+
+def load_regex_engine():
+    if os.environ.get(REGEX_ENGINE_ENV, "re") == "regex":
+        try:
+            import regex
+
+            return regex
+        except ImportError:
+            print(f"{REGEX_ENGINE_ENV}=regex but regex is not installed, using re")
+    return re
+
+
+class PatternRegistry:
+    """Compiled patterns shared by all analyzers.
+
+    Each (pattern, flags) pair is compiled once per process with the selected engine,
+    so analyzers keep their patterns as strings and look the compiled form up here.
+    """
+
+    engine = load_regex_engine()
+    patterns = dict()
+
+    @staticmethod
+    def compile(pattern, flags=0):
+        if not isinstance(pattern, str):
+            return pattern
+        key = (pattern, flags)
+        compiled = PatternRegistry.patterns.get(key)
+        if compiled is None:
+            compiled = PatternRegistry.engine.compile(pattern, flags)
+            PatternRegistry.patterns[key] = compiled
+        return compiled
+
+    @staticmethod
+    def search(pattern, string, flags=0):
+        return PatternRegistry.compile(pattern, flags).search(string)
+
+    @staticmethod
+    def match(pattern, string, flags=0):
+        return PatternRegistry.compile(pattern, flags).match(string)
+
+    @staticmethod
+    def sub(pattern, repl, string, count=0, flags=0):
+        return PatternRegistry.compile(pattern, flags).sub(repl, string, count)
+
+    @staticmethod
+    def findall(pattern, string, flags=0):
+        return PatternRegistry.compile(pattern, flags).findall(string)
+
+    @staticmethod
+    def finditer(pattern, string, flags=0):
+        return PatternRegistry.compile(pattern, flags).finditer(string)
+
+
+if __name__ == "__main__":
+    print(PatternRegistry.engine.__name__, len(PatternRegistry.patterns), "patterns")
@@ -7,6 +7,12 @@ from analyzer.common.AnalyzerHelper import *
 from analyzer.common.CommentAnalyzer import *
 from utils.FileReader import *
 from model.AnalyzerEntities import VariableNode
+from analyzer.common.PatternRegistry import PatternRegistry
+
+# Longest template parameter list or base class list of a class header
+MAX_HEADER_LENGTH = 2000
+# Modifiers taken before a class keyword, a match on more starts at a later one
+MAX_MODIFIERS = 8
 
 
 class CppClassAnalyzer(AbstractAnalyzer):
@@ -21,13 +27,21 @@ class CppClassAnalyzer(AbstractAnalyzer):
         self.templateParamPattern = r"template\s*<([^>]+)>"
 
     def initPatterns(self):
+        # The template parameters and base list are bounded: unbounded, each class
+        # keyword not followed by a '{' rescanned the rest of the file
         self.pattern = [
-            r"(template\s*<[^>]+>\s*)?"
-            r"(?:\s*(public|private|protected|static|final)\s+)*"
+            rf"(template\s*<[^>]{{1,{MAX_HEADER_LENGTH}}}>\s*)?"
+            # Whitespace before the modifiers is taken from the start of its run only,
+            # so a run is not scanned again from each of its positions
+            r"(?:(?<!\s)\s*(?=(?:public|private|protected|static|final)\s))?"
+            rf"(?:(public|private|protected|static|final)\s+){{0,{MAX_MODIFIERS}}}"
             r"(class|struct)\s+"
             r"([a-zA-Z_][a-zA-Z0-9_]*)"
             r"(?:\s+final)?"
-            r"(?:\s*:\s*[^{]+)?\s*\{"
+            rf"(?:\s*:\s*[^{{}};]{{1,{MAX_HEADER_LENGTH}}})?\s*\{{"
+        ]
+        self.compiledPatterns = [
+            PatternRegistry.compile(pattern) for pattern in self.pattern
         ]
 
         self.classNamePattern = r"\b(class|struct)\s+([a-zA-Z_][a-zA-Z0-9_]*)"
@@ -43,7 +57,7 @@ class CppClassAnalyzer(AbstractAnalyzer):
     def analyze(self, filePath, lang=None, inputStr=None):
         if inputStr == None:
             fileReader = FileReader()
-            commentAnalyzer = CommentAnalyzer()
+            commentAnalyzer = CommentAnalyzer.instance()
             fileContent = commentAnalyzer.analyze(filePath, FileTypeEnum.CPP)
         else:
             fileContent = inputStr
@@ -51,19 +65,19 @@ class CppClassAnalyzer(AbstractAnalyzer):
         package_name = self.extract_full_package_name(fileContent)
         listOfClasses = list()
 
-        for pattern in self.pattern:
+        for pattern in self.compiledPatterns:
             current_search_pos = 0
             while current_search_pos < len(fileContent):
-                match = re.search(pattern, fileContent[current_search_pos:])
+                match = pattern.search(fileContent, current_search_pos)
                 if match is None:
                     break
 
-                abs_match_start = current_search_pos + match.start()
-                abs_match_end = current_search_pos + match.end()
+                abs_match_start = match.start()
+                abs_match_end = match.end()
                 class_header = fileContent[abs_match_start:abs_match_end]
 
                 classBoundary = AnalyzerHelper().findClassBoundary(
-                    fileContent[abs_match_start:]
+                    fileContent, abs_match_start
                 )
                 if classBoundary <= 0:
                     current_search_pos = abs_match_end
@@ -81,7 +95,9 @@ class CppClassAnalyzer(AbstractAnalyzer):
                     current_search_pos = abs_match_end
                     continue
 
-                template_match = re.search(self.templateParamPattern, class_header)
+                template_match = PatternRegistry.search(
+                    self.templateParamPattern, class_header
+                )
                 if template_match:
                     params_str = template_match.group(1)
                     classInfo.params = [
@@ -92,13 +108,15 @@ class CppClassAnalyzer(AbstractAnalyzer):
 
                 classInfo = self.extract_class_spec(class_header, classInfo)
 
-                methods = CppMethodAnalyzer().analyze(None, lang, class_body_content)
+                methods = CppMethodAnalyzer.instance().analyze(
+                    None, lang, class_body_content
+                )
                 classInfo.methods.extend(methods)
 
                 if any(m.isAbstract for m in classInfo.methods):
                     classInfo.isAbstract = True
 
-                variables = CppVariableAnalyzer().analyze(
+                variables = CppVariableAnalyzer.instance().analyze(
                     None, lang, class_body_content
                 )
                 classInfo.variables.extend(variables)
@@ -119,14 +137,14 @@ class CppClassAnalyzer(AbstractAnalyzer):
         return listOfClasses
 
     def find_class_pattern(self, pattern, inputStr):
-        match = re.search(pattern, inputStr)
+        match = PatternRegistry.search(pattern, inputStr)
         if match != None:
             return match
         else:
             return None
 
     def extract_class_name(self, inputStr):
-        match = re.search(self.classNamePattern, inputStr)
+        match = PatternRegistry.search(self.classNamePattern, inputStr)
         if match:
             className = match.group(2).strip()
             return className
@@ -134,7 +152,7 @@ class CppClassAnalyzer(AbstractAnalyzer):
 
     def extract_class_inheritances(self, inputStr):
         inheritance = []
-        match = re.search(
+        match = PatternRegistry.search(
             r"class\s+[a-zA-Z_][a-zA-Z0-9_]*\s*(?:final)?\s*:\s*([^;{]+)", inputStr
         )
         if match:
@@ -165,7 +183,9 @@ class CppClassAnalyzer(AbstractAnalyzer):
         return classInfo
 
     def extract_full_package_name(self, inputStr: str) -> str:
-        namespace_matches = list(re.finditer(self.patternPackageName, inputStr))
+        namespace_matches = list(
+            PatternRegistry.finditer(self.patternPackageName, inputStr)
+        )
         if not namespace_matches:
             return ""
         return namespace_matches[-1].group(1).strip()
@@ -202,7 +222,7 @@ class CppClassAnalyzer(AbstractAnalyzer):
             temp_cleaner_keep_templates = self._get_type_cleaner(strip_templates=False)
             cleaned_full_type = temp_cleaner_keep_templates(type_name)
 
-            container_match = re.match(
+            container_match = PatternRegistry.match(
                 r"([a-zA-Z_][a-zA-Z0-9_:]+)\s*<(.+)>", cleaned_full_type
             )
             if container_match:
@@ -325,9 +345,9 @@ class CppClassAnalyzer(AbstractAnalyzer):
                 return ""
             name = name.replace("*", " ").replace("&", " ").strip()
             if strip_templates:
-                name = re.sub(r"<.*?>", "", name)
-            name = re.sub(r"\s*=[^,]+", "", name)
-            name = re.sub(r"\[.*?\]", "", name)
+                name = PatternRegistry.sub(r"<.*?>", "", name)
+            name = PatternRegistry.sub(r"\s*=[^,]+", "", name)
+            name = PatternRegistry.sub(r"\[.*?\]", "", name)
 
             parts = name.split()
             core_parts = [p for p in parts if p and p not in modifiers]
@@ -355,7 +375,7 @@ class CppClassAnalyzer(AbstractAnalyzer):
         return False
 
     def extract_class_params(self, inputStr):
-        return CppMethodAnalyzer().extractParams(inputStr)
+        return CppMethodAnalyzer.instance().extractParams(inputStr)
 
 
 if __name__ == "__main__":
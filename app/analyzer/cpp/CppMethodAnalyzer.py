@@ -6,13 +6,18 @@ from analyzer.AbstractAnalyzer import *
 from analyzer.common.AnalyzerHelper import *
 from analyzer.cpp.CppVariableAnalyzer import *
 from utils.FileReader import *
+from analyzer.common.PatternRegistry import PatternRegistry
+
+# Start of a member header or access specifier: the indentation of its own line
+# only, with any whitespace each line start of a run of blank lines rescanned the
+# rest of the run
+LINE_START = r"^[ \t]*"
 
 
 class CppMethodAnalyzer(AbstractAnalyzer):
     def __init__(self):
         self.pattern = (
-            r"^\s*"
-            r"(?:template\s*<[^>]+>\s*)?"
+            LINE_START + r"(?:template\s*<[^>]+>\s*)?"
             r"(?:virtual\s+|static\s+|inline\s+|explicit\s+)?"
             r"((?:(?:const\s+)?(?:[a-zA-Z_][a-zA-Z0-9_:]*(?:<[^>]*>)?)(?:\s*(?:const|[*&]))*\s+)|void\s+|~[a-zA-Z_][a-zA-Z0-9_<>]*\s*(?=\()|\b[a-zA-Z_][a-zA-Z0-9_<>]*\s*(?=\())?"
             r"(?:([a-zA-Z_][a-zA-Z0-9_:]*(?:<[^>]+>)?)::)?([~a-zA-Z_][a-zA-Z0-9_<>*&]+(?:<[^>]+>)?|operator\s*.*)\s*"
@@ -25,7 +30,20 @@ class CppMethodAnalyzer(AbstractAnalyzer):
             r"(\s*=\s*(?:0|default|delete))?\s*"
             r"\s*(?:\{|;|=)"
         )
-        self.access_pattern = r"^\s*(public|private|protected):"
+        self.access_pattern = LINE_START + r"(public|private|protected):"
+        # The analyzer searches from offsets inside the class body, where a search on
+        # a slice would have matched '^' and taken any whitespace, so the unanchored
+        # variants are tried there
+        self.compiledPattern = PatternRegistry.compile(self.pattern, re.MULTILINE)
+        self.compiledAnchoredPattern = PatternRegistry.compile(
+            r"\s*" + self.pattern[len(LINE_START) :], re.MULTILINE
+        )
+        self.compiledAccessPattern = PatternRegistry.compile(
+            self.access_pattern, re.MULTILINE
+        )
+        self.compiledAnchoredAccessPattern = PatternRegistry.compile(
+            r"\s*" + self.access_pattern[len(LINE_START) :], re.MULTILINE
+        )
 
     def analyze(self, filePath, lang=None, classStr=None):
         if classStr is None:
@@ -42,28 +60,32 @@ class CppMethodAnalyzer(AbstractAnalyzer):
         current_pos = 0
 
         while current_pos < len(full_content_for_boundaries):
-            next_access_match = re.search(
-                self.access_pattern,
-                full_content_for_boundaries[current_pos:],
-                re.MULTILINE,
+            next_access_match = AnalyzerHelper.search_from(
+                self.compiledAccessPattern,
+                self.compiledAnchoredAccessPattern,
+                full_content_for_boundaries,
+                current_pos,
             )
             next_access_pos = (
-                current_pos + next_access_match.start()
+                next_access_match.start()
                 if next_access_match
                 else len(full_content_for_boundaries)
             )
 
-            search_block = full_content_for_boundaries[current_pos:next_access_pos]
-            block_offset = current_pos
-
-            inner_pos = 0
-            while inner_pos < len(search_block):
-                match = re.search(self.pattern, search_block[inner_pos:], re.MULTILINE)
+            inner_pos = current_pos
+            while inner_pos < next_access_pos:
+                match = AnalyzerHelper.search_from(
+                    self.compiledPattern,
+                    self.compiledAnchoredPattern,
+                    full_content_for_boundaries,
+                    inner_pos,
+                    next_access_pos,
+                )
                 if not match:
                     break
 
-                abs_match_start = block_offset + inner_pos + match.start()
-                abs_match_end = block_offset + inner_pos + match.end()
+                abs_match_start = match.start()
+                abs_match_end = match.end()
                 method_header = full_content_for_boundaries[
                     abs_match_start:abs_match_end
                 ]
@@ -76,25 +98,20 @@ class CppMethodAnalyzer(AbstractAnalyzer):
                     header_strip = method_header.strip()
                     if header_strip.endswith(";"):
                         methods.append(methodInfo)
-                        inner_pos += match.end()
+                        inner_pos = abs_match_end
                     else:
-                        boundary_search_start = abs_match_start
-
                         boundary = AnalyzerHelper().findMethodBoundary(
-                            full_content_for_boundaries[boundary_search_start:]
+                            full_content_for_boundaries, abs_match_start
                         )
 
                         if boundary > 0:
                             methods.append(methodInfo)
-                            method_body_end_in_block = (
-                                inner_pos + match.start() + boundary
-                            )
-                            inner_pos = method_body_end_in_block
+                            inner_pos = abs_match_start + boundary
                         else:
                             methods.append(methodInfo)
-                            inner_pos += match.end()
+                            inner_pos = abs_match_end
                 else:
-                    inner_pos += match.end()
+                    inner_pos = abs_match_end
 
             current_pos = next_access_pos
             if next_access_match:
@@ -173,7 +190,7 @@ class CppMethodAnalyzer(AbstractAnalyzer):
             methodInfo.name = method_name
             methodInfo.dataType = cleaned_group1 if cleaned_group1 else "auto"
 
-        if re.search(r"^\s*static\s+", inputString, re.IGNORECASE):
+        if PatternRegistry.search(r"^\s*static\s+", inputString, re.IGNORECASE):
             methodInfo.isStatic = True
 
         methodInfo.isAbstract = is_abstract
@@ -213,7 +230,7 @@ class CppMethodAnalyzer(AbstractAnalyzer):
             if not item:
                 continue
 
-            item = re.sub(r"\s*=[^,]+", "", item).strip()
+            item = PatternRegistry.sub(r"\s*=[^,]+", "", item).strip()
             if not item:
                 continue
 
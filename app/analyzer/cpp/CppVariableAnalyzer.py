@@ -5,6 +5,7 @@ import re
 from analyzer.AbstractAnalyzer import *
 from model.AnalyzerEntities import *
 from utils.FileReader import *
+from analyzer.common.PatternRegistry import PatternRegistry
 
 
 class CppVariableAnalyzer(AbstractAnalyzer):
@@ -34,7 +35,7 @@ class CppVariableAnalyzer(AbstractAnalyzer):
 
     def analyze(self, filePath, lang=None, classStr=None):
         listOfVariables = []
-        content = classStr if classStr else FileReader().read_file(filePath)
+        content = classStr if classStr is not None else FileReader().read_file(filePath)
 
         current_access = AccessEnum.PRIVATE  # Default for C++ classes
 
@@ -44,7 +45,7 @@ class CppVariableAnalyzer(AbstractAnalyzer):
             if not line:
                 continue
 
-            access_match = re.match(self.access_pattern, line)
+            access_match = PatternRegistry.match(self.access_pattern, line)
             if access_match:
                 specifier = access_match.group(1)
                 if specifier == "public":
@@ -56,7 +57,7 @@ class CppVariableAnalyzer(AbstractAnalyzer):
                 continue  # Skip the access specifier line itself
 
             # Use re.search to find the pattern anywhere in the line, as fields might not start at the beginning
-            match = re.search(self.pattern, line)
+            match = PatternRegistry.search(self.pattern, line)
             if match:
                 # Check if it's inside a function body (basic check: presence of parentheses before match)
                 # This is imperfect but helps avoid capturing local variables.
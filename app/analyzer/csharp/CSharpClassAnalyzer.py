@@ -6,6 +6,12 @@ from analyzer.csharp.CSharpVariableAnalyzer import *
 from analyzer.common.AnalyzerHelper import *
 from analyzer.common.CommentAnalyzer import *
 from utils.FileReader import *
+from analyzer.common.PatternRegistry import PatternRegistry
+
+# Longest text between a class name and its opening brace: bases and constraints
+MAX_HEADER_LENGTH = 2000
+# Modifiers taken before a class keyword, a match on more starts at a later one
+MAX_MODIFIERS = 8
 
 
 class CSharpClassAnalyzer(AbstractAnalyzer):
@@ -20,8 +26,16 @@ class CSharpClassAnalyzer(AbstractAnalyzer):
 
     def initPatterns(self):
 
+        # Modifiers, keyword, name and the rest of the header up to the opening brace.
+        # Every part starts at a keyword or is bounded, so a search stays linear in
+        # the input, also on minified files and long runs of whitespace
         self.pattern = [
-            "(\\;|\\{|\\})*(\\r|\\n)*\\s*(\\r|\\n)*(\\/\\/\\s?[a-zA-Z0-9_].*(\\r|\\n)?)?(\\r|\\n)?\\s?[(public|private)\\s+|(static)\\s+|(final)\\s+].*((class|interface)\\s+)[a-zA-Z0-9_]+\\s?(:)?\\s?(\\n)?[a-zA-Z0-9_\\s]*(\\n)?[{;](\\n)?"
+            r"(?<![\w.])"
+            r"(?:(?:public|private|protected|internal|static|sealed|abstract|partial|unsafe"
+            rf"|new)\s+){{0,{MAX_MODIFIERS}}}"
+            r"(class|interface)\s+"
+            r"([a-zA-Z_][a-zA-Z0-9_]*)(?![a-zA-Z0-9_])"
+            rf"[^{{}};]{{0,{MAX_HEADER_LENGTH}}}[{{;]"
         ]
 
         self.classNamePattern = r"\b(class|interface)\s+([a-zA-Z_][a-zA-Z0-9_]*)"
@@ -35,7 +49,7 @@ class CSharpClassAnalyzer(AbstractAnalyzer):
     def analyze(self, filePath, lang=None, inputStr=None):
         if inputStr == None:
             fileReader = FileReader()
-            commentAnalyzer = CommentAnalyzer()
+            commentAnalyzer = CommentAnalyzer.instance()
             fileContent = commentAnalyzer.analyze(filePath, FileTypeEnum.CSHARP)
         else:
             fileContent = inputStr
@@ -70,13 +84,14 @@ class CSharpClassAnalyzer(AbstractAnalyzer):
                     tempContent[match.start() : match.end()], classInfo
                 )
 
+                # The boundary is relative to the match start, class_end is the
+                # closing brace of the class
                 classBoundary = AnalyzerHelper().findClassBoundary(
-                    tempContent[match.start() :]
+                    tempContent, match.start()
                 )
+                class_end = match.start() + classBoundary
 
-                raw_class_body = tempContent[
-                    match.start() : (match.end() + classBoundary)
-                ]
+                raw_class_body = tempContent[match.start() : class_end + 1]
 
                 cleaned_class_body = "\n".join(
                     line
@@ -85,11 +100,13 @@ class CSharpClassAnalyzer(AbstractAnalyzer):
                 )
 
                 ### Find the variables & methods within the class's boundary
-                methods = CSharpMethodAnalyzer().analyze(None, lang, cleaned_class_body)
+                methods = CSharpMethodAnalyzer.instance().analyze(
+                    None, lang, cleaned_class_body
+                )
                 classInfo.methods.extend(methods)
 
                 # Remove lines containing 'return' before passing to VariableAnalyzer
-                variables = CSharpVariableAnalyzer().analyze(
+                variables = CSharpVariableAnalyzer.instance().analyze(
                     None, lang, cleaned_class_body
                 )
                 classInfo.variables.extend(variables)
@@ -102,30 +119,31 @@ class CSharpClassAnalyzer(AbstractAnalyzer):
 
                 classInfo.relations = self.remove_primitive_types(classInfo.relations)
 
-                classAnalyzer = CSharpClassAnalyzer()
+                classAnalyzer = CSharpClassAnalyzer.instance()
                 classInfo.classes = classAnalyzer.analyze(
                     None,
                     lang,
-                    inputStr=tempContent[match.end() : (match.end() + classBoundary)],
+                    inputStr=tempContent[match.end() : class_end],
                 )
 
                 listOfClasses.append(classInfo)
 
-                tempContent = tempContent[match.end() + classBoundary :]
-                match = re.search(pattern, tempContent)
+                match = PatternRegistry.compile(pattern).search(
+                    tempContent, max(class_end, match.end())
+                )
 
         print(listOfClasses)
         return listOfClasses
 
     def find_class_pattern(self, pattern, inputStr):
-        match = re.search(pattern, inputStr)
+        match = PatternRegistry.search(pattern, inputStr)
         if match != None:
             return match
         else:
             return None
 
     def extract_class_name(self, inputStr):
-        match = re.search(self.classNamePattern, inputStr)
+        match = PatternRegistry.search(self.classNamePattern, inputStr)
         if match:
             className = match.group(2).strip()
             return className
@@ -157,7 +175,7 @@ class CSharpClassAnalyzer(AbstractAnalyzer):
         pattern = self.patternPackageName
         if not pattern:
             return None
-        match = re.search(pattern, inputStr)
+        match = PatternRegistry.search(pattern, inputStr)
         if match != None:
             # print("++++++++++++ extract_package_name:   ", inputStr[match.start() : match.end()].strip().split(" ")[1])
             return inputStr[match.start() : match.end()].strip().split(" ")[1]
@@ -185,7 +203,7 @@ class CSharpClassAnalyzer(AbstractAnalyzer):
         return inheritance_list
 
     def extract_class_params(self, inputStr):
-        return CSharpMethodAnalyzer().extractParams(inputStr)
+        return CSharpMethodAnalyzer.instance().extractParams(inputStr)
 
     def remove_primitive_types(self, relations):
         primitives = {
@@ -226,7 +244,7 @@ class CSharpClassAnalyzer(AbstractAnalyzer):
 
         def clean_type(name: str) -> list[str]:
             # Remove generic type arguments like <T>, <string, object>
-            name = re.sub(r"<.*?>", "", name)
+            name = PatternRegistry.sub(r"<.*?>", "", name)
             # Remove array/pointer symbols
             name = name.replace("[]", " ").replace("*", " ")
             # Tokenize and remove known modifiers
@@ -7,30 +7,34 @@ from analyzer.common.AnalyzerHelper import AnalyzerHelper
 from analyzer.csharp.CSharpVariableAnalyzer import CSharpVariableAnalyzer
 from model.AnalyzerEntities import *
 from utils.FileReader import *
+from analyzer.common.PatternRegistry import PatternRegistry
 
 
 class CSharpMethodAnalyzer(AbstractAnalyzer):
     def __init__(self):
+        # Starts at a word, not inside one or a run of whitespace, and the
+        # parameters stop at the next parenthesis: each position is tried in
+        # constant time, also in long literals or unbalanced parentheses
         self.pattern = (
-            r"(?:public|private|protected|internal)?\s*"
+            r"(?<![\w<>\[\]])(?:(?:public|private|protected|internal)\s+)?"
             r"(?:static\s+)?(?:override\s+)?"
             r"(?:[\w<>\[\]]+\s+)?([a-zA-Z_][a-zA-Z0-9_]*)\s*"
-            r"\([^)]*\)\s*[{;]"
+            r"\([^()]*\)\s*[{;]"
         )
 
     def analyze(self, filePath, lang=None, classStr=None):
-        content = classStr if classStr else FileReader().read_file(filePath)
+        content = classStr if classStr is not None else FileReader().read_file(filePath)
         methods = []
-        match = re.search(self.pattern, content)
+        compiledPattern = PatternRegistry.compile(self.pattern)
+        match = compiledPattern.search(content)
         while match:
             methodInfo = self.extractMethodInfo(match.group(0))
-            boundary = AnalyzerHelper().findMethodBoundary(content[match.start() :])
-            methodInfo.variables = CSharpVariableAnalyzer().analyze(
+            boundary = AnalyzerHelper().findMethodBoundary(content, match.start())
+            methodInfo.variables = CSharpVariableAnalyzer.instance().analyze(
                 None, None, content[match.start() : match.end() + boundary]
             )
             methods.append(methodInfo)
-            content = content[match.end() + boundary :]
-            match = re.search(self.pattern, content)
+            match = compiledPattern.search(content, match.end() + boundary)
         return methods
 
     def extractMethodInfo(self, inputString):
@@ -46,7 +50,7 @@ class CSharpMethodAnalyzer(AbstractAnalyzer):
 
         methodInfo.isStatic = "static" in cleaned
 
-        match = re.match(self.pattern, cleaned)
+        match = PatternRegistry.match(self.pattern, cleaned)
         if match:
             methodInfo.name = match.group(1)
             methodInfo.dataType = "inferred"
@@ -5,27 +5,33 @@ import re
 from analyzer.AbstractAnalyzer import *
 from model.AnalyzerEntities import *
 from utils.FileReader import *
+from analyzer.common.PatternRegistry import PatternRegistry
 
 
 class CSharpVariableAnalyzer(AbstractAnalyzer):
     def __init__(self) -> None:
+        # Starts at a word, not inside one or a run of whitespace
         self.pattern = (
-            r"(?:public|protected|private|internal)?\s*"
+            r"(?<![\w<>\[\]])(?:(?:public|protected|private|internal)\s+)?"
             r"(?:static\s+)?(?:readonly\s+)?"
             r"([\w<>\[\]]+)\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[=;]"
         )
 
     def analyze(self, filePath, lang=None, classStr=None):
         listOfVariables = []
-        content = classStr if classStr else FileReader().read_file(filePath)
+        content = classStr if classStr is not None else FileReader().read_file(filePath)
 
-        match = re.search(self.pattern, content, flags=re.MULTILINE | re.DOTALL)
+        match = PatternRegistry.search(
+            self.pattern, content, flags=re.MULTILINE | re.DOTALL
+        )
         while match:
             variable = self.extractVariableInfo(match.group(0))
             if variable is not None:
                 listOfVariables.append(variable)
             content = content[match.end() :]
-            match = re.search(self.pattern, content, flags=re.MULTILINE | re.DOTALL)
+            match = PatternRegistry.search(
+                self.pattern, content, flags=re.MULTILINE | re.DOTALL
+            )
 
         return listOfVariables
 
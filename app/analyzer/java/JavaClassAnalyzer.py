@@ -3,15 +3,22 @@ import re
 from analyzer.AbstractAnalyzer import *
 from analyzer.java.JavaMethodAnalyzer import *
 from analyzer.java.JavaVariableAnalyzer import *
+from analyzer.java.JavaOutline import JavaOutline
 from analyzer.common.AnalyzerHelper import *
 from analyzer.common.CommentAnalyzer import *
 from utils.FileReader import *
+from analyzer.common.PatternRegistry import PatternRegistry
 from model.AnalyzerEntities import (
     VariableNode,
     MethodNode,
     Inheritance,
 )  # Explicit imports
 
+# Longest generic parameter list of a class header
+MAX_HEADER_LENGTH = 2000
+# Modifiers taken before a class keyword, a match on more starts at a later one
+MAX_MODIFIERS = 8
+
 
 class JavaClassAnalyzer(AbstractAnalyzer):
     def __init__(self) -> None:
@@ -27,17 +34,33 @@ class JavaClassAnalyzer(AbstractAnalyzer):
     def initPatterns(self):
         # Pattern to find class or interface definitions, capturing modifiers, name, generics, extends, implements
         # Make extends/implements capture non-greedy and handle whitespace/newlines better.
-        self.pattern = [
-            r"(?:/\*[^*]*\*/\s*)?"  # Optional comment before class declaration
-            r"^\s*(?:(public|private|protected)\s+)?((?:(?:static|abstract|final|sealed|non-sealed)\s+)*)"  # Modifiers (1, 2)
+        class_pattern_body = (
+            r"(?:(public|private|protected)\s+)?"
+            rf"((?:(?:static|abstract|final|sealed|non-sealed)\s+){{0,{MAX_MODIFIERS}}})"  # Modifiers (1, 2)
             r"(class|interface|enum|record)\s+"  # Type (3)
             r"([a-zA-Z_][a-zA-Z0-9_]*)"  # Name (4)
-            r"(?:\s*(<\s*[^>]+?\s*>))?"  # Generics (5) - Non-greedy
+            rf"(?:\s*(<\s*[^>]{{1,{MAX_HEADER_LENGTH}}}?\s*>))?"  # Generics (5) - Non-greedy
             # Capture group 6: Extends list (non-greedy, stop before implements or {)
             r"(?:\s+extends\s+([\w\.<>,\s]+?))?"
             # Capture group 7: Implements list (non-greedy, stop before {)
             r"(?:\s+implements\s+([\w\.<>,\s]+?))?"
             r"\s*\{"  # Opening brace
+        )
+        # Only the indentation of its own line comes before a header: with any
+        # whitespace there, every line start of a run of blank lines rescanned the
+        # rest of the run
+        self.pattern = [
+            r"(?:/\*[^*]*\*/\s*)?"  # Optional comment before class declaration
+            r"^[ \t]*" + class_pattern_body
+        ]
+        # Variant without the line anchor, tried at the search start where a search
+        # on a slice of the content would have matched '^'
+        self.anchoredPattern = [r"(?:/\*[^*]*\*/\s*^|)\s*" + class_pattern_body]
+        self.compiledPatterns = [
+            PatternRegistry.compile(p, re.MULTILINE) for p in self.pattern
+        ]
+        self.compiledAnchoredPatterns = [
+            PatternRegistry.compile(p, re.MULTILINE) for p in self.anchoredPattern
         ]
         # Simpler patterns kept for reference/fallback if needed, but main pattern is preferred
         self.classNamePattern = (
@@ -52,111 +75,76 @@ class JavaClassAnalyzer(AbstractAnalyzer):
     ):
         if inputStr is None:
             fileReader = FileReader()
-            commentAnalyzer = CommentAnalyzer()
+            commentAnalyzer = CommentAnalyzer.instance()
             # Ensure lang is passed correctly
             fileContent = commentAnalyzer.analyze(filePath, lang)
             package_name = self.extract_package_name(fileContent) or current_package
         else:
             fileContent = inputStr
-            commentAnalyzer = CommentAnalyzer()
+            commentAnalyzer = CommentAnalyzer.instance()
             # Use provided package context for inner classes
             package_name = current_package
 
-        listOfClasses = list()
-        current_search_pos = 0
-
-        while current_search_pos < len(fileContent):
-            match = self.find_class_pattern(
-                self.pattern[0], fileContent[current_search_pos:]
-            )
-            if match is None:
-                break
-
-            abs_match_start = current_search_pos + match.start()
-            abs_match_end = current_search_pos + match.end()
-            class_header = fileContent[abs_match_start:abs_match_end]
-
-            # Find the boundary of the current class definition
-            boundary_helper = AnalyzerHelper()
-            # Start search right after the opening brace matched by the regex
-            boundary_search_start = abs_match_end - 1
-            classBoundary = boundary_helper.findClassBoundary(
-                fileContent[boundary_search_start:]
-            )
+        outline = JavaOutline(
+            self.compiledPatterns[0], self.compiledAnchoredPatterns[0]
+        ).build(fileContent)
+        return [
+            self.analyze_outline_entry(fileContent, entry, lang, package_name)
+            for entry in outline
+        ]
 
-            if classBoundary <= 0:  # Could not find matching '}'
-                # Avoid infinite loop, move past the header
-                current_search_pos = abs_match_end
-                continue
-
-            # Extract content *within* the class braces
-            class_inner_content = fileContent[
-                abs_match_end : boundary_search_start + classBoundary
-            ]
-            classInfo = ClassNode()
-            classInfo.package = package_name
-
-            classInfo.name = match.group(4).strip() if match.group(4) else None
-            if not classInfo.name:
-                current_search_pos = boundary_search_start + classBoundary + 1
-                continue
-
-            # Extract generic parameters if present
-            generic_params_str = match.group(5)
-            if generic_params_str:
-                classInfo.params = self.extract_generic_params(generic_params_str)
-
-            # Extract inheritance (extends/implements)
-            extends_str = match.group(6)
-            implements_str = match.group(7)
-            classInfo.relations.extend(
-                self.extract_class_inheritances(extends_str, implements_str)
-            )
+    def analyze_outline_entry(self, fileContent, entry, lang, package_name):
+        """Builds the ClassNode of an outline entry and, recursively, of its nested classes."""
+        match = entry.match
+        classInfo = ClassNode()
+        classInfo.package = package_name
+        classInfo.name = match.group(4).strip()
+
+        # Extract generic parameters if present
+        generic_params_str = match.group(5)
+        if generic_params_str:
+            classInfo.params = self.extract_generic_params(generic_params_str)
+
+        # Extract inheritance (extends/implements)
+        extends_str = match.group(6)
+        implements_str = match.group(7)
+        classInfo.relations.extend(
+            self.extract_class_inheritances(extends_str, implements_str)
+        )
 
-            classInfo = self.extract_class_spec(match, classInfo)  # Use match groups
+        classInfo = self.extract_class_spec(match, classInfo)  # Use match groups
 
-            # Analyze methods *within* the class boundary
-            methodAnalyzer = JavaMethodAnalyzer()
-            classInfo.methods = methodAnalyzer.analyze(None, lang, class_inner_content)
+        # Members are taken from the class body without its nested classes, which
+        # get their own members below
+        class_own_content = JavaOutline.own_content(fileContent, entry)
 
-            # Analyze variables *within* the class boundary
-            variableAnalyzer = JavaVariableAnalyzer()
-            classInfo.variables = variableAnalyzer.analyze(
-                None, lang, class_inner_content
-            )
+        methodAnalyzer = JavaMethodAnalyzer.instance()
+        classInfo.methods = methodAnalyzer.analyze(None, lang, class_own_content)
 
-            # Extract dependencies from members (variables, method returns, method params)
-            classInfo.relations.extend(
-                self.extract_relations_from_members(
-                    classInfo.methods,
-                    classInfo.variables,
-                    classInfo.relations,
-                    classInfo.params,  # Pass generic params defined for the class
-                )
-            )
+        variableAnalyzer = JavaVariableAnalyzer.instance()
+        classInfo.variables = variableAnalyzer.analyze(None, lang, class_own_content)
 
-            # Analyze inner classes recursively, passing the inner content and package context
-            classAnalyzer = JavaClassAnalyzer()
-            inner_classes = classAnalyzer.analyze(
-                None,
-                lang,
-                inputStr=class_inner_content,
-                current_package=package_name,  # Pass package context
+        # Extract dependencies from members (variables, method returns, method params)
+        classInfo.relations.extend(
+            self.extract_relations_from_members(
+                classInfo.methods,
+                classInfo.variables,
+                classInfo.relations,
+                classInfo.params,  # Pass generic params defined for the class
             )
-            classInfo.classes.extend(inner_classes)
-
-            listOfClasses.append(classInfo)
-
-            # Move search position past the current class definition
-            current_search_pos = boundary_search_start + classBoundary + 1
+        )
 
-        return listOfClasses
+        classInfo.classes.extend(
+            self.analyze_outline_entry(fileContent, child, lang, package_name)
+            for child in entry.children
+        )
+        return classInfo
 
     def find_class_pattern(self, pattern, inputStr):
-        return re.search(pattern, inputStr, re.MULTILINE)
+        return PatternRegistry.search(pattern, inputStr, re.MULTILINE)
 
     def extract_class_name(self, inputStr):
-        match = re.search(self.classNamePattern, inputStr)
+        match = PatternRegistry.search(self.classNamePattern, inputStr)
         if match:
             className = match.group(2).strip()
             return className
@@ -259,7 +247,7 @@ class JavaClassAnalyzer(AbstractAnalyzer):
         return classInfo
 
     def extract_package_name(self, inputStr: str):
-        match = re.search(self.patternPackageName, inputStr, re.MULTILINE)
+        match = PatternRegistry.search(self.patternPackageName, inputStr, re.MULTILINE)
         if match:
             return match.group(1).strip()
         return None
@@ -284,7 +272,8 @@ class JavaClassAnalyzer(AbstractAnalyzer):
             return name
 
         existing_relation_names = {
-            clean_dep_type(re.sub(r"<.*?>", "", rel.name)) for rel in existing_relations
+            clean_dep_type(PatternRegistry.sub(r"<.*?>", "", rel.name))
+            for rel in existing_relations
         }
         template_params_to_ignore = set(class_params)
 
@@ -382,7 +371,7 @@ class JavaClassAnalyzer(AbstractAnalyzer):
             cleaned_full_type = clean_dep_type(type_name)
 
             # --- Step 2: Check for known generic containers ---
-            generic_match = re.match(
+            generic_match = PatternRegistry.match(
                 r"([a-zA-Z_][a-zA-Z0-9_.]+)\s*<(.+)>", cleaned_full_type
             )
             if generic_match:
@@ -417,7 +406,9 @@ class JavaClassAnalyzer(AbstractAnalyzer):
 
             # --- Step 3: If not a container, process the type itself ---
             # Strip generics for the final check and storage
-            cleaned_base_type = re.sub(r"<.*?>", "", cleaned_full_type).strip()
+            cleaned_base_type = PatternRegistry.sub(
+                r"<.*?>", "", cleaned_full_type
+            ).strip()
             simple_base_name = cleaned_base_type.split(".")[
                 -1
             ]  # Use simple name for checks
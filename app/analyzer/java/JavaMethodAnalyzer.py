@@ -6,6 +6,10 @@ from analyzer.AbstractAnalyzer import *
 from analyzer.common.AnalyzerHelper import *
 from analyzer.java.JavaVariableAnalyzer import *
 from utils.FileReader import *
+from analyzer.common.PatternRegistry import PatternRegistry
+
+# Start of a member header: the indentation of its own line only
+LINE_START = r"^[ \t]*"
 
 
 class JavaMethodAnalyzer(AbstractAnalyzer):
@@ -18,11 +22,14 @@ class JavaMethodAnalyzer(AbstractAnalyzer):
         # Group 5: Method name
         # Group 6: Parameters string
         # Group 7: Throws clause (optional)
+        # The return type is matched word by word within its line and a header
+        # starts at LINE_START, so whitespace cannot be split between two parts in
+        # many ways and no line start rescans the lines after it
         self.pattern = (
-            r"^\s*(?:(public|private|protected)\s+)?"  # Access Mod (1)
+            LINE_START + r"(?:(public|private|protected)\s+)?"  # Access Mod (1)
             r"((?:(?:static|abstract|final|synchronized|native|default)\s+)*)"  # Other Mods (2)
             r"(?:(<[^>]+>)\s+)?"  # Method Generics (3)
-            r"([\w<>\[\],\s\.]+)\s+"  # Return Type (4) - Allows generics, arrays, qualified names
+            r"([\w<>\[\],.]+(?:[ \t]+[\w<>\[\],.]+)*)\s+"  # Return Type (4) - Allows generics, arrays, qualified names
             r"([a-zA-Z_][a-zA-Z0-9_]*)\s*"  # Method Name (5)
             r"\(([^)]*)\)\s*"  # Parameters (6)
             r"(?:(throws\s+[\w\s,.<>]+))?\s*"  # Throws (7)
@@ -30,59 +37,80 @@ class JavaMethodAnalyzer(AbstractAnalyzer):
         )
         # Pattern for constructors (no return type)
         self.constructor_pattern = (
-            r"^\s*(?:(public|private|protected)\s+)?"  # Access Mod (1)
+            LINE_START + r"(?:(public|private|protected)\s+)?"  # Access Mod (1)
             r"(?:(<[^>]+>)\s+)?"  # Constructor Generics (2)
             r"([a-zA-Z_][a-zA-Z0-9_]*)\s*"  # Constructor Name (3) - Must match class name
             r"\(([^)]*)\)\s*"  # Parameters (4)
             r"(?:(throws\s+[\w\s,.<>]+))?\s*"  # Throws (5)
             r"\{"  # Opening brace
         )
+        # Both patterns start with LINE_START, the anchored variants take any
+        # whitespace instead so they can be tried at the search position (see
+        # AnalyzerHelper.search_from)
+        self.compiledPattern = PatternRegistry.compile(self.pattern, re.MULTILINE)
+        self.compiledAnchoredPattern = PatternRegistry.compile(
+            r"\s*" + self.pattern[len(LINE_START) :], re.MULTILINE
+        )
+        self.compiledConstructorPattern = PatternRegistry.compile(
+            self.constructor_pattern, re.MULTILINE
+        )
+        self.compiledAnchoredConstructorPattern = PatternRegistry.compile(
+            r"\s*" + self.constructor_pattern[len(LINE_START) :], re.MULTILINE
+        )
 
     def analyze(self, filePath, lang=None, classStr=None):
-        content = classStr if classStr else FileReader().read_file(filePath)
+        content = classStr if classStr is not None else FileReader().read_file(filePath)
         methods = []
         current_pos = 0
+        boundary_helper = AnalyzerHelper()
+        # Matches are reused while they lie ahead of current_pos, so each pattern
+        # scans the content roughly once instead of once per method
+        method_match = constructor_match = None
 
         while current_pos < len(content):
-            method_match = re.search(self.pattern, content[current_pos:], re.MULTILINE)
-            constructor_match = re.search(
-                self.constructor_pattern, content[current_pos:], re.MULTILINE
+            method_match = AnalyzerHelper.search_from(
+                self.compiledPattern,
+                self.compiledAnchoredPattern,
+                content,
+                current_pos,
+                previous=method_match,
+            )
+            constructor_match = AnalyzerHelper.search_from(
+                self.compiledConstructorPattern,
+                self.compiledAnchoredConstructorPattern,
+                content,
+                current_pos,
+                previous=constructor_match,
             )
 
             # Determine which match comes first, if any
             match_to_use = None
             is_constructor = False
-            match_start_offset = -1
 
             if method_match and constructor_match:
                 if method_match.start() < constructor_match.start():
                     match_to_use = method_match
                     is_constructor = False
-                    match_start_offset = method_match.start()
                 else:
                     match_to_use = constructor_match
                     is_constructor = True
-                    match_start_offset = constructor_match.start()
             elif method_match:
                 match_to_use = method_match
                 is_constructor = False
-                match_start_offset = method_match.start()
             elif constructor_match:
                 match_to_use = constructor_match
                 is_constructor = True
-                match_start_offset = constructor_match.start()
 
             if match_to_use:
-                abs_match_start = current_pos + match_start_offset
-                abs_match_end = current_pos + match_to_use.end()
+                abs_match_start = match_to_use.start()
+                abs_match_end = match_to_use.end()
                 header = content[abs_match_start:abs_match_end]
 
                 # Find method body boundary
-                boundary_helper = AnalyzerHelper()
                 # Start search for boundary right after the opening brace matched by the regex
                 boundary_search_start = abs_match_end - 1  # Start at the '{'
                 boundary = boundary_helper.findMethodBoundary(
-                    content[boundary_search_start:]
+                    content, boundary_search_start
                 )
 
                 if boundary > 0:  # Found matching '}'
@@ -95,7 +123,7 @@ class JavaMethodAnalyzer(AbstractAnalyzer):
 
                     if methodInfo:
                         # Analyze variables declared *inside* the method body
-                        variableAnalyzer = JavaVariableAnalyzer()
+                        variableAnalyzer = JavaVariableAnalyzer.instance()
                         methodInfo.variables = variableAnalyzer.analyze(
                             None, lang, method_body_content
                         )
@@ -0,0 +1,98 @@
+import sys
+import re
+from dataclasses import dataclass, field
+from typing import List
+from analyzer.common.AnalyzerHelper import AnalyzerHelper
+
+
+@dataclass
+class OutlineEntry:
+    match: re.Match
+    bodyStart: int = 0  # Offset right after the opening brace
+    bodyEnd: int = 0  # Offset of the closing brace
+    children: List["OutlineEntry"] = field(default_factory=list)
+
+
+class JavaOutline:
+    """Class spans of a source file with their nesting, found in a single scan.
+
+    Each class header is matched once over the whole file, and each class exposes the
+    parts of its body that are not inside a nested class (see own_content), so member
+    extraction reads every byte once regardless of the nesting depth.
+    """
+
+    def __init__(self, pattern, anchoredPattern) -> None:
+        self.pattern = pattern
+        self.anchoredPattern = anchoredPattern
+
+    def build(self, content):
+        """Returns the top level OutlineEntry list of content."""
+        boundary_helper = AnalyzerHelper()
+        roots = []
+        stack = []
+        current_search_pos = 0
+
+        while True:
+            # Nested classes are searched only within the body of the enclosing one
+            endpos = stack[-1].bodyEnd if stack else len(content)
+            match = None
+            if current_search_pos < endpos:
+                match = AnalyzerHelper.search_from(
+                    self.pattern,
+                    self.anchoredPattern,
+                    content,
+                    current_search_pos,
+                    endpos,
+                )
+            if not match:
+                if not stack:
+                    break
+                current_search_pos = stack.pop().bodyEnd + 1
+                continue
+
+            # Start search right after the opening brace matched by the regex
+            boundary_search_start = match.end() - 1
+            classBoundary = boundary_helper.findClassBoundary(
+                content, boundary_search_start
+            )
+            if classBoundary <= 0:  # Could not find matching '}'
+                current_search_pos = match.end()
+                continue
+
+            entry = OutlineEntry(
+                match, match.end(), boundary_search_start + classBoundary
+            )
+            (stack[-1].children if stack else roots).append(entry)
+            stack.append(entry)
+            current_search_pos = entry.bodyStart
+
+        return roots
+
+    @staticmethod
+    def own_content(content, entry):
+        """Returns the body of entry without its nested classes, the remaining pieces joined by newlines."""
+        pieces = []
+        pos = entry.bodyStart
+        for child in entry.children:
+            pieces.append(content[pos : child.match.start()])
+            pos = child.bodyEnd + 1
+        pieces.append(content[pos : entry.bodyEnd])
+        return "\n".join(pieces)
+
+
+if __name__ == "__main__":
+    from analyzer.java.JavaClassAnalyzer import JavaClassAnalyzer
+
+    classAnalyzer = JavaClassAnalyzer()
+    outline = JavaOutline(
+        classAnalyzer.compiledPatterns[0], classAnalyzer.compiledAnchoredPatterns[0]
+    )
+    content = open(sys.argv[1]).read()
+
+    def print_entry(entry, depth=0):
+        print("  " * depth + entry.match.group(4), entry.bodyStart, entry.bodyEnd)
+        for child in entry.children:
+            print_entry(child, depth + 1)
+
+    for entry in outline.build(content):
+        print_entry(entry)
@@ -5,6 +5,7 @@ import re
 from analyzer.AbstractAnalyzer import *
 from model.AnalyzerEntities import *
 from utils.FileReader import *
+from analyzer.common.PatternRegistry import PatternRegistry
 
 
 class JavaVariableAnalyzer(AbstractAnalyzer):
@@ -14,7 +15,9 @@ class JavaVariableAnalyzer(AbstractAnalyzer):
         self.pattern = (
             r"^\s*(?:(public|protected|private)\s+)?"
             r"(?:(static)\s+)?(?:(final)\s+)?"
-            r"([\w<>\[\],\s\.]+)\s+"  # Type (group 4) - allows generics, arrays, qualified names
+            # Word by word, so whitespace is not split between the type and the
+            # spaces around it in many ways
+            r"([\w<>\[\],.]+(?:\s+[\w<>\[\],.]+)*)\s+"  # Type (group 4) - allows generics, arrays, qualified names
             r"([a-zA-Z_][a-zA-Z0-9_]*)\s*"  # Name (group 5)
             r"(?:\[\s*\])*"  # Optional array brackets after name
             r"\s*[=;]"  # End with = or ;
@@ -22,11 +25,11 @@ class JavaVariableAnalyzer(AbstractAnalyzer):
 
     def analyze(self, filePath, lang=None, classStr=None):
         listOfVariables = []
-        content = classStr if classStr else FileReader().read_file(filePath)
+        content = classStr if classStr is not None else FileReader().read_file(filePath)
 
         # Analyze line by line to avoid issues with multi-line declarations (though less common for fields)
         for line in content.splitlines():
-            match = re.search(self.pattern, line)
+            match = PatternRegistry.search(self.pattern, line)
             if match:
                 variableInfo = self.extractVariableInfo(match)
                 if variableInfo:
@@ -7,6 +7,10 @@ from analyzer.common.AnalyzerHelper import *
 from analyzer.common.CommentAnalyzer import *
 from utils.FileReader import *
 from model.AnalyzerEntities import Inheritance, InheritanceEnum
+from analyzer.common.PatternRegistry import PatternRegistry
+
+# Longest text between a class name (or its constructor) and the opening brace
+MAX_HEADER_LENGTH = 2000
 
 
 class KotlinClassAnalyzer(AbstractAnalyzer):
@@ -21,8 +25,14 @@ class KotlinClassAnalyzer(AbstractAnalyzer):
 
     def initPatterns(self):
 
+        # The match starts at the modifier or keyword and no two parts can take the
+        # same whitespace, the supertype list is bounded: a search stays linear in
+        # the input, also on long runs of whitespace
         self.pattern = [
-            r"(?:\r|\n)?\s*(?:@[\w.]+\s*)*(?:open|data|sealed|enum|annotation)?\s*(class|interface|object)\s+([a-zA-Z0-9_]+)\s*(?:\((?:[^()]|\([^()]*\))*\))?\s*(?:\:\s*([^{]+))?\s*\{"
+            r"(?:(?:open|data|sealed|enum|annotation)\s+)?"
+            r"(class|interface|object)\s+([a-zA-Z0-9_]+)"
+            r"\s*(?:\((?:[^()]|\([^()]*\))*\)\s*)?"
+            rf"(?::([^{{]{{1,{MAX_HEADER_LENGTH}}}))?\{{"
         ]
 
         self.classNamePattern = r"(?:data|sealed|enum|annotation)?\s*(class|interface|object)\s+([a-zA-Z0-9_]+)"
@@ -36,7 +46,7 @@ class KotlinClassAnalyzer(AbstractAnalyzer):
     def analyze(self, filePath, lang=None, inputStr=None):
         if inputStr == None:
             fileReader = FileReader()
-            commentAnalyzer = CommentAnalyzer()
+            commentAnalyzer = CommentAnalyzer.instance()
             fileContent = commentAnalyzer.analyze(filePath, FileTypeEnum.KOTLIN)
         else:
             fileContent = inputStr
@@ -78,10 +88,10 @@ class KotlinClassAnalyzer(AbstractAnalyzer):
                 )
 
                 classBoundary = AnalyzerHelper().findClassBoundary(
-                    tempContent[match.start() :]
+                    tempContent, match.start()
                 )
 
-                methods = KotlinMethodAnalyzer().analyze(
+                methods = KotlinMethodAnalyzer.instance().analyze(
                     None,
                     lang,
                     tempContent[match.start() : (match.end() + classBoundary)],
@@ -97,7 +107,7 @@ class KotlinClassAnalyzer(AbstractAnalyzer):
                     for line in raw_class_body.splitlines()
                     if "return" not in line.strip()
                 )
-                variables = KotlinVariableAnalyzer().analyze(
+                variables = KotlinVariableAnalyzer.instance().analyze(
                     None, lang, cleaned_class_body
                 )
 
@@ -111,7 +121,7 @@ class KotlinClassAnalyzer(AbstractAnalyzer):
 
                 classInfo.relations = self.remove_primitive_types(classInfo.relations)
 
-                classAnalyzer = KotlinClassAnalyzer()
+                classAnalyzer = KotlinClassAnalyzer.instance()
 
                 classInfo.classes = classAnalyzer.analyze(
                     None,
@@ -121,21 +131,22 @@ class KotlinClassAnalyzer(AbstractAnalyzer):
 
                 listOfClasses.append(classInfo)
 
-                tempContent = tempContent[match.end() + classBoundary :]
-                match = re.search(pattern, tempContent)
+                match = PatternRegistry.compile(pattern).search(
+                    tempContent, match.end() + classBoundary
+                )
 
         print(listOfClasses)
         return listOfClasses
 
     def find_class_pattern(self, pattern, inputStr):
-        match = re.search(pattern, inputStr)
+        match = PatternRegistry.search(pattern, inputStr)
         if match != None:
             return match
         else:
             return None
 
     def extract_class_name(self, inputStr):
-        match = re.search(self.classNamePattern, inputStr)
+        match = PatternRegistry.search(self.classNamePattern, inputStr)
         if match:
             className = match.group(2).strip()
             return className
@@ -181,7 +192,7 @@ class KotlinClassAnalyzer(AbstractAnalyzer):
         pattern = self.patternPackageName
         if not pattern:
             return None
-        match = re.search(pattern, inputStr)
+        match = PatternRegistry.search(pattern, inputStr)
         if match != None:
             # print("++++++++++++ extract_package_name:   ", inputStr[match.start() : match.end()].strip().split(" ")[1])
             return inputStr[match.start() : match.end()].strip().split(" ")[1]
@@ -209,7 +220,7 @@ class KotlinClassAnalyzer(AbstractAnalyzer):
         return inheritance_list
 
     def extract_class_params(self, inputStr):
-        return KotlinMethodAnalyzer().extractParams(inputStr)
+        return KotlinMethodAnalyzer.instance().extractParams(inputStr)
 
     def remove_primitive_types(self, relations):
         primitives = {
@@ -243,9 +254,9 @@ class KotlinClassAnalyzer(AbstractAnalyzer):
 
         def clean_type(name: str) -> list[str]:
             # Remove generic content like <T>, <String, Int>
-            name = re.sub(r"<.*?>", "", name)
+            name = PatternRegistry.sub(r"<.*?>", "", name)
             # Remove Kotlin array types like Array<T>, IntArray, etc.
-            name = re.sub(r"\b\w+Array\b", "", name)
+            name = PatternRegistry.sub(r"\b\w+Array\b", "", name)
             # Split by space and filter modifiers
             parts = [
                 p.strip() for p in name.split() if p.strip() and p not in modifiers
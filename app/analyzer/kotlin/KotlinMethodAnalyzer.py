@@ -6,25 +6,33 @@ from analyzer.AbstractAnalyzer import *
 from analyzer.common.AnalyzerHelper import *
 from analyzer.kotlin.KotlinVariableAnalyzer import *
 from utils.FileReader import *
+from analyzer.common.PatternRegistry import PatternRegistry
 
 
 class KotlinMethodAnalyzer(AbstractAnalyzer):
     def __init__(self):
         self.pattern = r"\bfun\s+([a-zA-Z_]\w*)\s*\(.*?\)\s*(:\s*[\w<>\[\]?]+)?\s*[{;]"
+        self.compiledPattern = PatternRegistry.compile(self.pattern)
+        # A search on a slice of the content matches '\b' at the slice start
+        self.compiledAnchoredPattern = PatternRegistry.compile(self.pattern[2:])
 
     def analyze(self, filePath, lang=None, classStr=None):
-        content = classStr if classStr else FileReader().read_file(filePath)
+        content = classStr if classStr is not None else FileReader().read_file(filePath)
         methods = []
-        match = re.search(self.pattern, content)
+        match = self.compiledPattern.search(content)
         while match:
             methodInfo = self.extractMethodInfo(match.group(0))
-            boundary = AnalyzerHelper().findMethodBoundary(content[match.start() :])
-            methodInfo.variables = KotlinVariableAnalyzer().analyze(
+            boundary = AnalyzerHelper().findMethodBoundary(content, match.start())
+            methodInfo.variables = KotlinVariableAnalyzer.instance().analyze(
                 None, None, content[match.start() : match.end() + boundary]
             )
             methods.append(methodInfo)
-            content = content[match.end() + boundary :]
-            match = re.search(self.pattern, content)
+            match = AnalyzerHelper.search_from(
+                self.compiledPattern,
+                self.compiledAnchoredPattern,
+                content,
+                match.end() + boundary,
+            )
         return methods
 
     def extractMethodInfo(self, inputString):
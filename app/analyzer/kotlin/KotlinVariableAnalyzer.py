@@ -11,6 +11,7 @@ import re
 from analyzer.AbstractAnalyzer import *
 from model.AnalyzerEntities import *
 from utils.FileReader import *
+from analyzer.common.PatternRegistry import PatternRegistry
 
 
 class KotlinVariableAnalyzer(AbstractAnalyzer):
@@ -22,13 +23,17 @@ class KotlinVariableAnalyzer(AbstractAnalyzer):
 
     def analyze(self, filePath, lang=None, classStr=None):
         listOfVariables = []
-        content = classStr if classStr else FileReader().read_file(filePath)
+        content = classStr if classStr is not None else FileReader().read_file(filePath)
 
-        match = re.search(self.pattern, content, flags=re.MULTILINE | re.DOTALL)
+        match = PatternRegistry.search(
+            self.pattern, content, flags=re.MULTILINE | re.DOTALL
+        )
         while match:
             listOfVariables.append(self.extractVariableInfo(match.groups()))
             content = content[match.end() :]
-            match = re.search(self.pattern, content, flags=re.MULTILINE | re.DOTALL)
+            match = PatternRegistry.search(
+                self.pattern, content, flags=re.MULTILINE | re.DOTALL
+            )
 
         return listOfVariables
 
@@ -6,10 +6,19 @@ from flask import (
     send_from_directory,
     send_file,
     Response,
+    abort,
 )
 import os
+import re
+import mimetypes
 from werkzeug.utils import secure_filename
+from werkzeug.security import safe_join
 from FileAnalyzer import FileAnalyzer
+from jobs.AnalysisJobManager import AnalysisJobManager
+from utils.CompressedFile import CompressedFile
+from results.ResultIndex import ResultIndex, DEFAULT_LIMIT
+from results.SubgraphIndex import SubgraphIndex
+from metrics.RunMetrics import RunMetrics
 import json
 import base64
 from io import BytesIO
@@ -18,11 +27,36 @@ import cairosvg  # You might need to install this: pip install cairosvg
 
 UPLOAD_FOLDER = "uploads"
 RESULT_FOLDER = "static/out"
+# Worker processes used for file analysis, defaults to the CPU count when unset
+ANALYSIS_WORKERS = int(os.environ.get("KUDSIGHT_WORKERS", "0")) or None
+# Analyses that may run at the same time through the /jobs API
+JOB_WORKERS = int(os.environ.get("KUDSIGHT_JOB_WORKERS", "2"))
+# Seconds the analysis of one source file may take before it is skipped, 0 for no limit
+FILE_BUDGET = float(os.environ.get("KUDSIGHT_FILE_BUDGET", "60"))
+# Serve the analysis stage totals at /metrics for Prometheus
+METRICS_ENABLED = os.environ.get("KUDSIGHT_METRICS", "1") != "0"
+# Result files named <path>_<date>_<time>.<ext> by FileAnalyzer, sidecars excluded;
+# the time has milliseconds in results written since they were added
+RESULT_FILE_PATTERN = re.compile(
+    r"_\d{2}-\d{2}-\d{4}_\d{2}-\d{2}-\d{2}(?:-\d{3})?\.(?:json|puml|png|svg)$"
+)
 
 app = Flask(__name__, static_url_path="/static")
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+app.config["ANALYSIS_WORKERS"] = ANALYSIS_WORKERS
+app.config["FILE_BUDGET"] = FILE_BUDGET
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(RESULT_FOLDER, exist_ok=True)
+result_index = ResultIndex(RESULT_FOLDER)
+
+job_manager = AnalysisJobManager(
+    lambda progress: FileAnalyzer(
+        app.config["ANALYSIS_WORKERS"],
+        progress=progress,
+        file_budget=app.config["FILE_BUDGET"],
+    ),
+    JOB_WORKERS,
+)
 
 APP_VERSION = "V0.6.0-beta"
 
@@ -85,26 +119,151 @@ def upload_folder():
 
     try:
         print(f"Analyzing: {folder_path}")
-        fileAnalyzer = FileAnalyzer()
+        fileAnalyzer = FileAnalyzer(
+            app.config["ANALYSIS_WORKERS"], file_budget=app.config["FILE_BUDGET"]
+        )
         fileAnalyzer.analyze(folder_path, None)
-        json_files = [
-            f
-            for f in os.listdir(RESULT_FOLDER)
-            if (f.endswith(".json") and ".pos" not in f)
-        ]
-        json_files.sort(reverse=True)  # Sort newest first
+        # Every result, newest first
+        json_files = [result["filename"] for result in result_index.iter_all()]
         return jsonify({"status": "ok", "files": json_files})
     except Exception as e:
         print(f"Error during analysis: {e}")
         return jsonify({"status": "error", "message": str(e)})
 
 
+@app.route("/jobs", methods=["POST"])
+def create_job():
+    folder_path = request.form.get("folderPath")
+    if not folder_path or not os.path.exists(folder_path):
+        print(f"Path does not exist: {folder_path}")
+        return (
+            jsonify({"status": "error", "message": "Path does not exist."}),
+            400,
+        )
+
+    print(f"Queueing analysis: {folder_path}")
+    return jsonify(job_manager.submit(folder_path)), 202
+
+
+@app.route("/jobs/<job_id>")
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"status": "error", "message": "Unknown job."}), 404
+    return jsonify(job)
+
+
+@app.route("/jobs/<job_id>/events")
+def job_events(job_id):
+    if job_manager.get(job_id) is None:
+        return jsonify({"status": "error", "message": "Unknown job."}), 404
+
+    def stream():
+        job = job_manager.get(job_id)
+        while job is not None:
+            yield f"data: {json.dumps(job)}\n\n"
+            if job["status"] in ("done", "error"):
+                break
+            job = job_manager.wait_for_change(job_id, job["version"])
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def is_hidden(filename):
+    """Tells whether a path below RESULT_FOLDER has a segment starting with "."."""
+    return any(part.startswith(".") for part in re.split(r"[/\\]", filename))
+
+
 @app.route("/out/<path:filename>")
 def serve_output_file(filename):
+    path = safe_join(RESULT_FOLDER, filename)
+    if path is None or is_hidden(filename) or not os.path.isfile(path):
+        abort(404)
+
     # Ensure proper MIME type for puml files
     if filename.endswith(".puml"):
-        return send_from_directory(RESULT_FOLDER, filename, mimetype="text/plain")
-    return send_from_directory(RESULT_FOLDER, filename)
+        mimetype = "text/plain"
+    else:
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    # Send the precompressed sibling when the client accepts its encoding
+    served_path, encoding = CompressedFile.negotiate(
+        path, request.headers.get("Accept-Encoding")
+    )
+    etag = CompressedFile.etag_of(path)
+    if encoding:
+        # Each representation needs its own strong ETag
+        etag = f"{etag}-{encoding}"
+
+    response = send_file(
+        os.path.abspath(served_path),
+        mimetype=mimetype,
+        download_name=os.path.basename(path),
+        etag=etag,
+        conditional=True,
+        max_age=None,
+    )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    if RESULT_FILE_PATTERN.search(filename):
+        # Timestamped results are never rewritten
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    else:
+        # Position files change, clients revalidate them with the ETag
+        response.cache_control.no_cache = True
+    return response
+
+
+@app.route("/graph/<path:filename>/<query>")
+def query_subgraph(filename, query):
+    """Returns a part of a stored result: neighborhood, package, ancestors,
+    descendants, or the ids matching a search."""
+    path = safe_join(RESULT_FOLDER, filename)
+    if (
+        path is None
+        or is_hidden(filename)
+        or not ResultIndex.is_result(filename)
+        or not os.path.isfile(path)
+    ):
+        return jsonify({"status": "error", "message": "Unknown result."}), 404
+
+    args = request.args
+    try:
+        subgraphIndex = SubgraphIndex.of(path)
+        if query == "neighborhood":
+            result = subgraphIndex.neighborhood(
+                args.getlist("id"),
+                args.get("depth", 1, type=int),
+                args.get("direction", "both"),
+                args.getlist("relation") or None,
+            )
+        elif query == "package":
+            result = subgraphIndex.package(
+                args.get("name", ""), args.get("subpackages") in ("1", "true")
+            )
+        elif query == "ancestors":
+            result = subgraphIndex.ancestors(args.get("id"))
+        elif query == "descendants":
+            result = subgraphIndex.descendants(args.get("id"))
+        elif query == "search":
+            result = subgraphIndex.search(
+                args.get("q", ""), min(args.get("limit", 50, type=int), 500)
+            )
+        else:
+            return jsonify({"status": "error", "message": "Unknown query."}), 404
+    except KeyError as e:
+        return jsonify({"status": "error", "message": e.args[0]}), 404
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify(result)
 
 
 @app.route("/upload-files", methods=["POST"])
@@ -120,7 +279,9 @@ def upload_files():
         file.save(file_path)
 
     try:
-        fileAnalyzer = FileAnalyzer()
+        fileAnalyzer = FileAnalyzer(
+            app.config["ANALYSIS_WORKERS"], file_budget=app.config["FILE_BUDGET"]
+        )
         fileAnalyzer.analyze(temp_folder, None)
         return jsonify({"status": "ok"})
     except Exception as e:
@@ -129,13 +290,42 @@ def upload_files():
 
 @app.route("/list-json")
 def list_json():
-    json_files = [
-        f
-        for f in os.listdir(RESULT_FOLDER)
-        if (f.endswith(".json") and ".pos" not in f)
-    ]
-    json_files.sort(reverse=True)  # Sort newest first
-    return jsonify(json_files)
+    # A page of result names, newest first; X-Next-Cursor continues the listing
+    try:
+        results, next_cursor = result_index.list(
+            request.args.get("limit", DEFAULT_LIMIT), request.args.get("cursor")
+        )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    response = jsonify([result["filename"] for result in results])
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+
+@app.route("/results")
+def list_results():
+    try:
+        results, next_cursor = result_index.list(
+            request.args.get("limit", DEFAULT_LIMIT),
+            request.args.get("cursor"),
+            request.args.get("source"),
+            request.args.get("q"),
+        )
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify({"results": results, "next": next_cursor})
+
+
+@app.route("/metrics")
+def metrics():
+    """Stage times and counters of the analyses run by this process."""
+    if not METRICS_ENABLED:
+        abort(404)
+    return Response(
+        RunMetrics.prometheus(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
 
 
 @app.route("/save-pos", methods=["POST"])
@@ -0,0 +1,245 @@
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import contextlib
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from analyzer.common.CommentAnalyzer import CommentAnalyzer
+from analyzer.common.PatternRegistry import PatternRegistry
+from benchmark.CorpusGenerator import CorpusGenerator
+from drawer.DataGenerator import DataGenerator
+from drawer.SymbolResolver import SymbolResolver
+from FileAnalyzer import FileAnalyzer
+from model.AnalyzerEntities import FileTypeEnum
+from utils.SourceFile import SourceFile
+
+# Version of the result document, raised when its fields change meaning
+RESULT_SCHEMA = 1
+
+# Pipeline stages in run order; "classes" includes the comment stripping the class
+# analyzer does itself, "comments" times that pass alone
+STAGES = ("read", "comments", "classes", "resolve", "graph")
+
+
+class AnalyzerBenchmark:
+    """Times each stage of the analysis pipeline on generated corpora.
+
+    For every language a CorpusGenerator tree is written to a temporary folder and
+    run through the stages serially, in one process, the way a one-worker
+    FileAnalyzer does: read, comment stripping, class analysis, relation
+    resolution and JSON graph generation (to memory, static/out is untouched).
+    Each stage reports the best time of repeat runs as files/s and bytes/s of
+    source, and the peak RSS of the process once it finished, so the stage that
+    raises the peak is the first one whose value grows. run() returns a JSON
+    serializable document meant to be kept and compared across releases.
+    """
+
+    def __init__(
+        self,
+        languages=(
+            FileTypeEnum.JAVA,
+            FileTypeEnum.CPP,
+            FileTypeEnum.KOTLIN,
+            FileTypeEnum.CSHARP,
+        ),
+        files=200,
+        classes_per_file=2,
+        nesting=3,
+        literal_density=0.2,
+        repeat=3,
+    ) -> None:
+        self.languages = languages
+        self.files = files
+        self.classes_per_file = classes_per_file
+        self.nesting = nesting
+        self.literal_density = literal_density
+        self.repeat = repeat
+
+    @staticmethod
+    def peak_rss_kb():
+        """Returns the peak resident set size of the process in KB, None if unknown."""
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+    @staticmethod
+    def revision():
+        """Returns the git commit of the benchmarked tree, None outside a checkout."""
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def run_stages(self, language, paths):
+        """Runs the pipeline once; returns {stage: seconds}, {stage: peak RSS} and
+        the number of classes found."""
+        timings = dict()
+        peaks = dict()
+
+        def finish(stage, start):
+            timings[stage] = time.perf_counter() - start
+            peaks[stage] = AnalyzerBenchmark.peak_rss_kb()
+
+        classAnalyzer = FileAnalyzer.get_class_analyzer(language)
+        commentAnalyzer = CommentAnalyzer.instance()
+
+        start = time.perf_counter()
+        sources = [SourceFile.read(path) for path in paths]
+        finish("read", start)
+
+        start = time.perf_counter()
+        for source in sources:
+            commentAnalyzer.analyze(source, language)
+        finish("comments", start)
+
+        start = time.perf_counter()
+        listOfClasses = []
+        for source in sources:
+            listOfClasses.extend(classAnalyzer.analyze(source, language))
+        finish("classes", start)
+
+        start = time.perf_counter()
+        symbolResolver = SymbolResolver.partitioned({language: listOfClasses})
+        finish("resolve", start)
+
+        start = time.perf_counter()
+        dataGenerator = DataGenerator()
+        dataGenerator.graphStore._language_context = language
+        for node in symbolResolver.listOfClassNodes:
+            dataGenerator.dumpClass(node, symbolResolver)
+        dataGenerator.graphStore.add_blank_classes()
+        dataGenerator.graphStore.remove_duplicates()
+        dataGenerator.graphStore.write_json(io.StringIO())
+        finish("graph", start)
+        return timings, peaks, len(listOfClasses)
+
+    def run_case(self, language):
+        corpusGenerator = CorpusGenerator(
+            language,
+            self.files,
+            self.classes_per_file,
+            self.nesting,
+            self.literal_density,
+        )
+        folder = tempfile.mkdtemp(prefix="kudsight-bench-")
+        try:
+            size = corpusGenerator.write(folder)
+            paths = [
+                os.path.join(folder, corpusGenerator.file_name(file_index))
+                for file_index in range(self.files)
+            ]
+            best = dict()
+            for _ in range(self.repeat):
+                # The analyzers print per class, that is not part of the timing
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(
+                    devnull
+                ):
+                    timings, peaks, found = self.run_stages(language, paths)
+                for stage, seconds in timings.items():
+                    best[stage] = min(seconds, best.get(stage, seconds))
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+        return {
+            "language": language.name,
+            "files": self.files,
+            "bytes": size,
+            "classesExpected": corpusGenerator.class_count(),
+            "classesFound": found,
+            "stages": {
+                stage: {
+                    "seconds": round(best[stage], 6),
+                    "filesPerSecond": round(self.files / max(best[stage], 1e-9), 1),
+                    "bytesPerSecond": round(size / max(best[stage], 1e-9)),
+                    "peakRssKb": peaks[stage],
+                }
+                for stage in STAGES
+            },
+        }
+
+    def run(self):
+        return {
+            "schema": RESULT_SCHEMA,
+            "createdAt": datetime.now().isoformat(timespec="seconds"),
+            "revision": AnalyzerBenchmark.revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "patternEngine": PatternRegistry.engine.__name__,
+            "parameters": {
+                "files": self.files,
+                "classesPerFile": self.classes_per_file,
+                "nesting": self.nesting,
+                "literalDensity": self.literal_density,
+                "repeat": self.repeat,
+            },
+            "cases": [self.run_case(language) for language in self.languages],
+        }
+
+    @staticmethod
+    def print_report(result):
+        for case in result["cases"]:
+            print(
+                f"{case['language']:6} files={case['files']} "
+                f"size={case['bytes'] / 1024:.1f}KB "
+                f"classes={case['classesFound']}/{case['classesExpected']}"
+            )
+            for stage, values in case["stages"].items():
+                print(
+                    f"  {stage:8} {values['seconds'] * 1000:10.1f}ms "
+                    f"{values['filesPerSecond']:10.1f} files/s "
+                    f"{values['bytesPerSecond'] / 1024:10.1f} KB/s "
+                    f"peak RSS {values['peakRssKb']}KB"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=AnalyzerBenchmark.__doc__.split("\n")[0]
+    )
+    parser.add_argument(
+        "--languages",
+        default="java,cpp,kotlin,csharp",
+        help="comma separated languages to generate and analyze",
+    )
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--classes-per-file", type=int, default=2)
+    parser.add_argument("--nesting", type=int, default=3)
+    parser.add_argument("--literal-density", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    benchmark = AnalyzerBenchmark(
+        [FileTypeEnum[name.strip().upper()] for name in args.languages.split(",")],
+        args.files,
+        args.classes_per_file,
+        args.nesting,
+        args.literal_density,
+        args.repeat,
+    )
+    result = benchmark.run()
+    AnalyzerBenchmark.print_report(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"Results written to {args.output}")
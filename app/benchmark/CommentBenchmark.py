@@ -0,0 +1,46 @@
+import sys
+import time
+from analyzer.common.CommentAnalyzer import CommentAnalyzer
+from model.AnalyzerEntities import FileTypeEnum
+
+# A resource table: mostly string literals, with a comment every few entries
+LITERAL_TEMPLATE = """    {{"key.{index}", "Value {index} // not a comment", 'x'}}, /* entry {index} */
+    // group {index}
+"""
+
+
+class CommentBenchmark:
+    """Times CommentAnalyzer.remove_comments on literal heavy files of doubling size.
+
+    The time per KB should stay flat; stripping that re-scans the content once per
+    literal shows up as time per KB growing with the file size.
+    """
+
+    def __init__(self, base_entries=1000, steps=5) -> None:
+        self.base_entries = base_entries
+        self.steps = steps
+
+    def generate_content(self, entry_count):
+        return "".join(
+            LITERAL_TEMPLATE.format(index=index) for index in range(entry_count)
+        )
+
+    def run(self):
+        analyzer = CommentAnalyzer()
+        for lang in (FileTypeEnum.JAVA, FileTypeEnum.CPP):
+            for step in range(self.steps):
+                entry_count = self.base_entries * 2**step
+                content = self.generate_content(entry_count)
+                start = time.perf_counter()
+                analyzer.remove_comments(content, lang)
+                elapsed = time.perf_counter() - start
+                size_kb = len(content) / 1024
+                print(
+                    f"{lang.name:6} literals={entry_count * 3:7} size={size_kb:9.1f}KB "
+                    f"time={elapsed:8.3f}s per_kb={elapsed * 1000 / size_kb:7.3f}ms"
+                )
+
+
+if __name__ == "__main__":
+    base_entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    CommentBenchmark(base_entries).run()
@@ -0,0 +1,222 @@
+import os
+import sys
+import random
+from model.AnalyzerEntities import FileTypeEnum
+
+# Files of one package, classes only reference classes of their own package
+FILES_PER_PACKAGE = 10
+
+# Text of the literals; comment markers and braces inside them must be ignored
+LITERAL_TEXT = '{0} {{ // not a comment /* nor this */ }} \\" quoted'
+
+# Per language: file extension, file header, class header, field, method header,
+# local statement and the closing of the file; reference is a field of class type
+SYNTAX = {
+    FileTypeEnum.JAVA: {
+        "extension": ".java",
+        "header": "package {package};\n\nimport java.util.List;\n\n",
+        "class": "{visibility}class {name}{extends} implements Runnable {{\n",
+        "extends": " extends {base}",
+        "field": "    private {type} {name};\n",
+        "literal_field": '    private String {name} = "{text}";\n',
+        "method": "    public int {name}(int value) {{\n",
+        "run": "    public void run() {{\n        counter++;\n    }}\n",
+        "statement": "int local{depth} = value + {depth};",
+        "literal_statement": 'String text{depth} = "{text}";',
+        "return": "return value;",
+        "class_end": "}}\n\n",
+        "footer": "",
+        "int": "int",
+        "reference": "{type}",
+    },
+    FileTypeEnum.CPP: {
+        "extension": ".hpp",
+        "header": "#include <string>\n\nnamespace {package} {{\n\n",
+        "class": "class {name}{extends} {{\npublic:\n",
+        "extends": " : public {base}",
+        "field": "    {type} {name};\n",
+        "literal_field": '    std::string {name} = "{text}";\n',
+        "method": "    int {name}(int value) {{\n",
+        "run": "    virtual void run() {{\n        counter++;\n    }}\n",
+        "statement": "int local{depth} = value + {depth};",
+        "literal_statement": 'std::string text{depth} = "{text}";',
+        "return": "return value;",
+        "class_end": "}};\n\n",
+        "footer": "}}\n",
+        "int": "int",
+        "reference": "{type}*",
+    },
+    FileTypeEnum.KOTLIN: {
+        "extension": ".kt",
+        "header": "package {package}\n\nimport java.util.List\n\n",
+        "class": "open class {name}{extends} {{\n",
+        "extends": " : {base}()",
+        "field": "    private var {name}: {type}? = null\n",
+        "literal_field": '    private val {name}: String = "{text}"\n',
+        "method": "    fun {name}(value: Int): Int {{\n",
+        "run": "    fun run() {{\n        counter++\n    }}\n",
+        "statement": "val local{depth} = value + {depth}",
+        "literal_statement": 'val text{depth} = "{text}"',
+        "return": "return value",
+        "class_end": "}}\n\n",
+        "footer": "",
+        "int": "Int",
+        "reference": "{type}",
+    },
+    FileTypeEnum.CSHARP: {
+        "extension": ".cs",
+        "header": "using System;\n\nnamespace {package} {{\n\n",
+        "class": "public class {name}{extends} {{\n",
+        "extends": " : {base}",
+        "field": "    private {type} {name};\n",
+        "literal_field": '    private string {name} = "{text}";\n',
+        "method": "    public int {name}(int value) {{\n",
+        "run": "    public void Run() {{\n        counter++;\n    }}\n",
+        "statement": "int local{depth} = value + {depth};",
+        "literal_statement": 'string text{depth} = "{text}";',
+        "return": "return value;",
+        "class_end": "}}\n\n",
+        "footer": "}}\n",
+        "int": "int",
+        "reference": "{type}",
+    },
+}
+
+
+class CorpusGenerator:
+    """Deterministic synthetic source trees for the analyzer benchmarks.
+
+    Every file holds classes_per_file classes with fields, methods and a counter.
+    Methods nest blocks nesting levels deep, and literal_density is the share of
+    fields and statements that are string literals holding comment markers and
+    braces, which the comment stripping and brace matching have to skip. Classes
+    extend and reference earlier classes of their package. The same arguments give
+    the same tree, byte for byte.
+    """
+
+    def __init__(
+        self,
+        language=FileTypeEnum.JAVA,
+        files=100,
+        classes_per_file=2,
+        nesting=3,
+        literal_density=0.2,
+        methods=4,
+        seed=0,
+    ) -> None:
+        self.language = language
+        self.syntax = SYNTAX[language]
+        self.files = files
+        self.classes_per_file = classes_per_file
+        self.nesting = nesting
+        self.literal_density = literal_density
+        self.methods = methods
+        self.seed = seed
+
+    def class_count(self):
+        return self.files * self.classes_per_file
+
+    def package_of(self, file_index):
+        return f"bench.module{file_index // FILES_PER_PACKAGE}"
+
+    def file_name(self, file_index):
+        package_path = self.package_of(file_index).replace(".", os.sep)
+        return os.path.join(package_path, f"File{file_index}{self.syntax['extension']}")
+
+    def generate_file(self, file_index):
+        """Returns the content of the file_index-th file of the corpus."""
+        # Seeded per file, a file does not depend on the ones generated before it
+        rng = random.Random(self.seed * 1000003 + file_index)
+        syntax = self.syntax
+        first_of_package = (
+            (file_index // FILES_PER_PACKAGE)
+            * FILES_PER_PACKAGE
+            * self.classes_per_file
+        )
+        parts = [syntax["header"].format(package=self.package_of(file_index))]
+        for class_offset in range(self.classes_per_file):
+            index = file_index * self.classes_per_file + class_offset
+            earlier = range(first_of_package, index)
+            extends = ""
+            if earlier and rng.random() < 0.5:
+                extends = syntax["extends"].format(base=f"Type{rng.choice(earlier)}")
+            parts.append(
+                syntax["class"].format(
+                    visibility="public " if class_offset == 0 else "",
+                    name=f"Type{index}",
+                    extends=extends,
+                )
+            )
+            parts.append(syntax["field"].format(type=syntax["int"], name="counter"))
+            for field_index in range(3):
+                name = f"field{field_index}"
+                if rng.random() < self.literal_density:
+                    parts.append(
+                        syntax["literal_field"].format(
+                            name=name, text=LITERAL_TEXT.format(index)
+                        )
+                    )
+                elif earlier:
+                    parts.append(
+                        syntax["field"].format(
+                            type=syntax["reference"].format(
+                                type=f"Type{rng.choice(earlier)}"
+                            ),
+                            name=name,
+                        )
+                    )
+                else:
+                    parts.append(syntax["field"].format(type=syntax["int"], name=name))
+            parts.append("\n")
+            for method_index in range(self.methods):
+                parts.append(
+                    "    // Computes the value of step {0}\n".format(method_index)
+                )
+                parts.append(syntax["method"].format(name=f"compute{method_index}"))
+                parts.append(self.generate_body(rng, index))
+                parts.append("    }\n\n")
+            parts.append(syntax["run"].format())
+            parts.append(syntax["class_end"].format())
+        parts.append(syntax["footer"].format())
+        return "".join(parts)
+
+    def generate_body(self, rng, index):
+        """Returns a method body with blocks nested self.nesting levels deep."""
+        syntax = self.syntax
+        lines = []
+        for depth in range(self.nesting + 1):
+            indent = "    " * (depth + 2)
+            if rng.random() < self.literal_density:
+                statement = syntax["literal_statement"].format(
+                    depth=depth, text=LITERAL_TEXT.format(index)
+                )
+            else:
+                statement = syntax["statement"].format(depth=depth)
+            lines.append(indent + statement + "\n")
+            if depth < self.nesting:
+                lines.append(indent + f"if (value > {depth}) {{\n")
+        for depth in reversed(range(self.nesting)):
+            lines.append("    " * (depth + 2) + "}\n")
+        lines.append("        " + syntax["return"] + "\n")
+        return "".join(lines)
+
+    def write(self, folder):
+        """Writes the corpus under folder; returns the number of bytes written."""
+        size = 0
+        for file_index in range(self.files):
+            path = os.path.join(folder, self.file_name(file_index))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = self.generate_file(file_index).encode("utf-8")
+            with open(path, "wb") as f:
+                f.write(data)
+            size += len(data)
+        return size
+
+
+if __name__ == "__main__":
+    language = (
+        FileTypeEnum[sys.argv[2].upper()] if len(sys.argv) > 2 else FileTypeEnum.JAVA
+    )
+    files = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    size = CorpusGenerator(language, files).write(sys.argv[1])
+    print(f"Wrote {files} {language.name} files, {size / 1024:.1f}KB to {sys.argv[1]}")
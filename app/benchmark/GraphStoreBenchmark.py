@@ -0,0 +1,60 @@
+import sys
+import time
+import random
+from model.AnalyzerEntities import FileTypeEnum
+from model.DataGeneratorEntities import ClassData, Dependency, GraphData
+from model.GraphStore import GraphStore
+
+RELATIONS = ["extended", "implemented", "depended"]
+
+
+class GraphStoreBenchmark:
+    """Times blank node discovery and link dedup of GraphData and GraphStore.
+
+    Every class references random classes, a tenth of which are never defined, and
+    a part of the links repeat, as they do when several methods use the same type.
+    """
+
+    def __init__(self, links=500000, classes=50000) -> None:
+        generator = random.Random(1)
+        self.ids = [f"com.sample.module{i % 100}.Class{i}" for i in range(classes)]
+        self.defined = self.ids[: classes - classes // 10]
+        self.links = [
+            (
+                generator.choice(self.defined),
+                generator.choice(self.ids),
+                generator.choice(RELATIONS),
+            )
+            for _ in range(links)
+        ]
+
+    def run_graph_data(self):
+        graphData = GraphData()
+        graphData._language_context = FileTypeEnum.JAVA
+        graphData.nodes = [ClassData(id=node_id) for node_id in self.defined]
+        graphData.links = [Dependency(*link) for link in self.links]
+        start = time.perf_counter()
+        graphData.add_blank_classes()
+        graphData.remove_duplicates()
+        return time.perf_counter() - start
+
+    def run_graph_store(self):
+        graphStore = GraphStore(FileTypeEnum.JAVA)
+        for node_id in self.defined:
+            graphStore.add_node(ClassData(id=node_id))
+        for link in self.links:
+            graphStore.add_link(*link)
+        start = time.perf_counter()
+        graphStore.add_blank_classes()
+        graphStore.remove_duplicates()
+        return time.perf_counter() - start
+
+    def run(self):
+        print(f"{len(self.links)} links between {len(self.ids)} classes")
+        print(f"GraphData  {self.run_graph_data() * 1000:8.1f} ms")
+        print(f"GraphStore {self.run_graph_store() * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    links = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    GraphStoreBenchmark(links).run()
@@ -0,0 +1,34 @@
+import sys
+import time
+import numpy as np
+from drawer.GraphLayout import GraphLayout
+
+
+class LayoutBenchmark:
+    """Times GraphLayout on random class graphs with two links per class.
+
+    Links mostly go to nearby ids, like classes of one package using each other,
+    so the graph has structure for the coarsening to find.
+    """
+
+    def __init__(self, sizes=(1000, 5000, 50000)) -> None:
+        self.sizes = sizes
+
+    def run(self):
+        rng = np.random.default_rng(1)
+        for node_count in self.sizes:
+            sources = rng.integers(0, node_count, node_count * 2)
+            targets = (sources + rng.integers(1, 50, node_count * 2)) % node_count
+            start = time.perf_counter()
+            positions = GraphLayout(node_count, sources, targets).layout()
+            elapsed = time.perf_counter() - start
+            linked = np.linalg.norm(positions[sources] - positions[targets], axis=1)
+            print(
+                f"{node_count:6} nodes {elapsed:6.2f}s, "
+                f"median link length {np.median(linked):.0f}"
+            )
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1:]] or (1000, 5000, 50000)
+    LayoutBenchmark(sizes).run()
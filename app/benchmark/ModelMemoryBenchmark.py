@@ -0,0 +1,109 @@
+import sys
+import dataclasses
+import tracemalloc
+from model.AnalyzerEntities import (
+    AccessEnum,
+    ClassNode,
+    Inheritance,
+    InheritanceEnum,
+    MethodNode,
+    VariableNode,
+)
+
+TYPES = ["int", "String", "List<String>", "Map<String, Integer>", "Order", "Customer"]
+
+
+def legacy_model(cls):
+    """The same model with a per-instance __dict__, the layout before __slots__."""
+    return dataclasses.make_dataclass(
+        cls.__name__,
+        [
+            (
+                f.name,
+                f.type,
+                dataclasses.field(default=f.default, default_factory=f.default_factory),
+            )
+            for f in dataclasses.fields(cls)
+        ],
+    )
+
+
+LEGACY_MODELS = {
+    cls: legacy_model(cls) for cls in (ClassNode, MethodNode, VariableNode, Inheritance)
+}
+
+
+class ModelMemoryBenchmark:
+    """Reports the bytes held per analyzed class for each model layout.
+
+    The synthetic classes look like analyzer output: strings are built per class
+    (as slicing the source does) and members are held in lists.
+    """
+
+    def __init__(self, classes=5000, methods=20, variables=10) -> None:
+        self.classes = classes
+        self.methods = methods
+        self.variables = variables
+
+    def build_corpus(self, models):
+        classNode, methodNode, variableNode, inheritance = (
+            models[ClassNode],
+            models[MethodNode],
+            models[VariableNode],
+            models[Inheritance],
+        )
+        corpus = []
+        for index in range(self.classes):
+            # "".join builds a new string object each time, like the analyzers do
+            classInfo = classNode(package="".join(["com.sample.", "module"]))
+            classInfo.name = f"Generated{index}"
+            for method_index in range(self.methods):
+                method = methodNode(
+                    name=f"method{method_index}",
+                    dataType="".join(TYPES[method_index % len(TYPES)]),
+                    accessLevel=AccessEnum.PUBLIC,
+                )
+                method.params = ["".join(TYPES[(method_index + 1) % len(TYPES)])]
+                classInfo.methods.append(method)
+            for variable_index in range(self.variables):
+                classInfo.variables.append(
+                    variableNode(
+                        name=f"field{variable_index}",
+                        dataType="".join(TYPES[variable_index % len(TYPES)]),
+                        accessLevel=AccessEnum.PRIVATE,
+                    )
+                )
+            classInfo.relations.append(
+                inheritance("".join(["Ba", "se"]), InheritanceEnum.EXTENDED)
+            )
+            corpus.append(classInfo)
+        return corpus
+
+    def measure(self, models, compact=False):
+        tracemalloc.start()
+        corpus = self.build_corpus(models)
+        if compact:
+            corpus = [classInfo.compact() for classInfo in corpus]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del corpus
+        return size / self.classes
+
+    def run(self):
+        current = {cls: cls for cls in LEGACY_MODELS}
+        cases = [
+            ("dict dataclasses (before)", LEGACY_MODELS, False),
+            ("slotted, lists", current, False),
+            ("slotted, compact()", current, True),
+        ]
+        print(
+            f"{self.classes} classes, {self.methods} methods and "
+            f"{self.variables} variables each"
+        )
+        for name, models, compact in cases:
+            print(f"{name:26} {self.measure(models, compact):10.0f} bytes/class")
+
+
+if __name__ == "__main__":
+    classes = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    ModelMemoryBenchmark(classes).run()
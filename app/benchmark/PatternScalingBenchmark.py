@@ -0,0 +1,174 @@
+import random
+import re
+import sys
+import time
+from analyzer.common.CommentAnalyzer import CommentAnalyzer
+from analyzer.cpp.CppClassAnalyzer import CppClassAnalyzer
+from analyzer.cpp.CppMethodAnalyzer import CppMethodAnalyzer
+from analyzer.csharp.CSharpClassAnalyzer import CSharpClassAnalyzer
+from analyzer.csharp.CSharpMethodAnalyzer import CSharpMethodAnalyzer
+from analyzer.csharp.CSharpVariableAnalyzer import CSharpVariableAnalyzer
+from analyzer.java.JavaClassAnalyzer import JavaClassAnalyzer
+from analyzer.java.JavaMethodAnalyzer import JavaMethodAnalyzer
+from analyzer.kotlin.KotlinClassAnalyzer import KotlinClassAnalyzer
+from model.AnalyzerEntities import FileTypeEnum
+
+# Repetitions of a fragment in the small input, the large one has SCALE times more
+REPEAT = 300
+SCALE = 8
+# Time ratios of the large to the small input above this are reported: linear gives
+# about SCALE, quadratic SCALE ** 2
+MAX_RATIO = 3 * SCALE
+
+# Inputs known to make such patterns backtrack
+COMMENT_FRAGMENTS = ["a /* b\n", "x ' y \" z\n", 'R"d( (', '@" """ ']
+CLASS_FRAGMENTS = [
+    " \n",
+    "\n    \n",
+    "class A : B\n",
+    "class A<",
+    "public static ",
+    "template <",
+    "class public):< ",
+    "int ( (   ; public ;interfaceint",
+]
+MEMBER_FRAGMENTS = [" ", "\n \n", "a", "int f(", "int a<", "public\n"]
+
+# Tokens the seeded fragments are made of
+PUNCTUATION = [" ", "\n", "<", ">", ",", "{", "}", "(", ")", ";", ":", "="]
+PUNCTUATION += ['"', "'", "/*", "*/", "//"]
+TOKENS = {
+    FileTypeEnum.JAVA: "class interface extends public static A int @Override".split(),
+    FileTypeEnum.CPP: 'class struct template public virtual A int * & :: R"x('.split(),
+    FileTypeEnum.KOTLIN: 'class interface open data fun val A """'.split(),
+    FileTypeEnum.CSHARP: 'class interface public private static A int @"'.split(),
+}
+CLASS_SCANS = {
+    FileTypeEnum.JAVA: "java class",
+    FileTypeEnum.CPP: "cpp class",
+    FileTypeEnum.KOTLIN: "kotlin class",
+    FileTypeEnum.CSHARP: "csharp class",
+}
+
+
+def finditer(pattern, flags=0):
+    compiled = (
+        pattern if isinstance(pattern, re.Pattern) else re.compile(pattern, flags)
+    )
+    return lambda text: sum(1 for _ in compiled.finditer(text))
+
+
+def comment_scans():
+    commentAnalyzer = CommentAnalyzer()
+    return {
+        f"{lang.name} comments": [
+            lambda text, lang=lang: commentAnalyzer.remove_comments(text, lang)
+        ]
+        for lang in TOKENS
+    }
+
+
+def class_scans():
+    return {
+        "java class": [finditer(p) for p in JavaClassAnalyzer().compiledPatterns],
+        "cpp class": [finditer(p) for p in CppClassAnalyzer().compiledPatterns],
+        "kotlin class": [finditer(p) for p in KotlinClassAnalyzer().pattern],
+        "csharp class": [finditer(p) for p in CSharpClassAnalyzer().pattern],
+    }
+
+
+def member_scans():
+    javaMethodAnalyzer = JavaMethodAnalyzer()
+    cppMethodAnalyzer = CppMethodAnalyzer()
+    return {
+        "java method": [
+            finditer(javaMethodAnalyzer.compiledPattern),
+            finditer(javaMethodAnalyzer.compiledConstructorPattern),
+        ],
+        "cpp method": [
+            finditer(cppMethodAnalyzer.compiledPattern),
+            finditer(cppMethodAnalyzer.compiledAccessPattern),
+        ],
+        "csharp method": [finditer(CSharpMethodAnalyzer().pattern)],
+        "csharp variable": [
+            finditer(CSharpVariableAnalyzer().pattern, re.MULTILINE | re.DOTALL)
+        ],
+    }
+
+
+def seeded_fragments(count=4, seed=0):
+    """Returns {language: fragments} of random tokens of each language."""
+    rng = random.Random(seed)
+    fragments = {}
+    for lang, tokens in TOKENS.items():
+        fragments[lang] = [
+            "".join(
+                rng.choice(tokens + PUNCTUATION) + rng.choice(["", " "])
+                for _ in range(rng.randint(3, 10))
+            )
+            for _ in range(count)
+        ]
+    return fragments
+
+
+def cases():
+    """Yields (name, scan, fragment) for every pattern and the inputs it is tried on."""
+    for fragments, scans in [
+        (COMMENT_FRAGMENTS, comment_scans()),
+        (CLASS_FRAGMENTS, class_scans()),
+        (MEMBER_FRAGMENTS, member_scans()),
+    ]:
+        for name, scan_list in scans.items():
+            for scan in scan_list:
+                for fragment in fragments:
+                    yield name, scan, fragment
+    comments = comment_scans()
+    classes = class_scans()
+    for lang, fragments in seeded_fragments().items():
+        scan_list = classes[CLASS_SCANS[lang]] + comments[f"{lang.name} comments"]
+        for scan in scan_list:
+            for fragment in fragments:
+                yield f"{lang.name} fragment", scan, fragment
+
+
+class PatternScalingBenchmark:
+    """Times each analyzer regex on an input and on SCALE times that input.
+
+    Linear patterns take about SCALE times longer on the larger input; one that
+    backtracks takes up to SCALE squared and is reported. Timings are only
+    meaningful on an otherwise idle machine, which is why this is not a unit test.
+    """
+
+    def __init__(self, repeat=REPEAT) -> None:
+        self.repeat = repeat
+
+    @staticmethod
+    def scan_seconds(scan, text):
+        best = None
+        for _ in range(3):
+            start = time.perf_counter()
+            scan(text)
+            seconds = time.perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+        return best
+
+    def run(self):
+        """Prints the ratio of every case; returns the number of reported cases."""
+        reported = 0
+        for name, scan, fragment in cases():
+            small = self.scan_seconds(scan, fragment * self.repeat)
+            large = self.scan_seconds(scan, fragment * (self.repeat * SCALE))
+            ratio = large / max(small, 1e-9)
+            flag = "  <-- superlinear" if ratio >= MAX_RATIO else ""
+            reported += bool(flag)
+            print(
+                f"{name:16} {fragment!r:40} small={small:8.4f}s "
+                f"large={large:8.4f}s ratio={ratio:6.1f}{flag}"
+            )
+        print(f"{reported} superlinear cases")
+        return reported
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else REPEAT
+    sys.exit(1 if PatternScalingBenchmark(repeat).run() else 0)
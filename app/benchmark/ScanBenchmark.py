@@ -0,0 +1,88 @@
+import sys
+import time
+from analyzer.java.JavaClassAnalyzer import JavaClassAnalyzer
+from analyzer.cpp.CppClassAnalyzer import CppClassAnalyzer
+from model.AnalyzerEntities import FileTypeEnum
+
+JAVA_CLASS_TEMPLATE = """
+public class Generated{index} extends Base{index} implements Runnable {{
+    private int counter{index};
+    private String name{index};
+
+    public Generated{index}(int counter) {{
+        this.counter{index} = counter;
+    }}
+
+    public int getCounter() {{
+        if (counter{index} > 0) {{
+            return counter{index};
+        }}
+        return 0;
+    }}
+
+    public void run() {{
+        counter{index}++;
+    }}
+}}
+"""
+
+CPP_CLASS_TEMPLATE = """
+class Generated{index} : public Base{index} {{
+public:
+    Generated{index}(int counter) {{
+        counter{index} = counter;
+    }}
+    int getCounter() const {{
+        if (counter{index} > 0) {{
+            return counter{index};
+        }}
+        return 0;
+    }}
+    virtual void run() = 0;
+private:
+    int counter{index};
+    std::string name{index};
+}};
+"""
+
+
+class ScanBenchmark:
+    """Times the class analyzers on synthetic files of doubling size.
+
+    The time per KB should stay roughly flat as the file grows; a scan loop that
+    re-slices the content shows up as time per KB growing with the file size.
+    """
+
+    def __init__(self, base_classes=50, steps=4) -> None:
+        self.base_classes = base_classes
+        self.steps = steps
+
+    def generate_content(self, template, class_count):
+        return "".join(template.format(index=index) for index in range(class_count))
+
+    def time_analyzer(self, analyzer, lang, content):
+        start = time.perf_counter()
+        listOfClasses = analyzer.analyze(None, lang, content)
+        return time.perf_counter() - start, len(listOfClasses)
+
+    def run(self):
+        cases = [
+            ("java", JavaClassAnalyzer(), FileTypeEnum.JAVA, JAVA_CLASS_TEMPLATE),
+            ("cpp", CppClassAnalyzer(), FileTypeEnum.CPP, CPP_CLASS_TEMPLATE),
+        ]
+        for name, analyzer, lang, template in cases:
+            for step in range(self.steps):
+                class_count = self.base_classes * 2**step
+                content = self.generate_content(template, class_count)
+                elapsed, found = self.time_analyzer(analyzer, lang, content)
+                size_kb = len(content) / 1024
+                print(
+                    f"{name:5} classes={class_count:6} size={size_kb:9.1f}KB "
+                    f"found={found:6} time={elapsed:8.3f}s "
+                    f"per_kb={elapsed * 1000 / size_kb:7.3f}ms"
+                )
+
+
+if __name__ == "__main__":
+    base_classes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    ScanBenchmark(base_classes).run()
@@ -0,0 +1,144 @@
+import hashlib
+import os
+import sys
+import pickle
+import sqlite3
+from pathlib import Path
+from utils.SystemUtility import SystemUtility
+
+# Kept out of static/, everything in there can be downloaded from the app
+CACHE_FOLDER = os.environ.get("KUDSIGHT_CACHE_DIR", ".cache")
+# Bump when the cache layout changes, analyzer changes are picked up by the fingerprint
+CACHE_VERSION = "1"
+# Sources that shape the cached ClassNodes: analyze_file, the analyzers, the models
+# and the utilities reading and decoding the files
+FINGERPRINT_SOURCES = ("FileAnalyzer.py", "analyzer", "model", "utils")
+
+
+def get_analyzer_fingerprint():
+    """Hashes the sources analyze_file depends on so edits to them invalidate cached results."""
+    app_dir = Path(__file__).resolve().parent.parent
+    md5 = hashlib.md5()
+    sources = []
+    for name in FINGERPRINT_SOURCES:
+        path = app_dir / name
+        sources.extend(sorted(path.rglob("*.py")) if path.is_dir() else [path])
+    for source in sources:
+        md5.update(str(source.relative_to(app_dir)).encode())
+        md5.update(source.read_bytes())
+    return md5.hexdigest()
+
+
+class ParseCache:
+    """On-disk cache of per-file analysis results.
+
+    Entries are keyed by path and language and validated with size + mtime; when
+    only the mtime changed, the content md5 decides whether the entry is reused.
+    The database is in WAL mode and every write is committed right away, so runs
+    sharing the cache (parallel jobs) never hold its lock for longer than a write.
+    """
+
+    def __init__(self, cache_folder=CACHE_FOLDER) -> None:
+        os.makedirs(cache_folder, exist_ok=True)
+        self.db_path = os.path.join(cache_folder, "parse_cache.db")
+        self.connection = sqlite3.connect(self.db_path, timeout=30)
+        self.hits = 0
+        self.misses = 0
+        self.init_schema()
+
+    def init_schema(self):
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # Commits without an fsync each; the cache can always be rebuilt
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT, language TEXT, size INTEGER, mtime REAL, md5 TEXT, "
+            "classes BLOB, PRIMARY KEY (path, language))"
+        )
+        version = f"{CACHE_VERSION}-{get_analyzer_fingerprint()}"
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+        if row is None or row[0] != version:
+            self.connection.execute("DELETE FROM files")
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                (version,),
+            )
+        self.connection.commit()
+
+    def lookup(self, filePath, language):
+        """Returns the cached list of ClassNode objects for the file, or None on a miss."""
+        file_info = self._get_file_info(filePath)
+        row = None
+        if file_info is not None:
+            row = self.connection.execute(
+                "SELECT size, mtime, md5, classes FROM files WHERE path = ? AND language = ?",
+                (os.path.abspath(filePath), language.name),
+            ).fetchone()
+
+        if row is None or row[0] != file_info.size:
+            self.misses += 1
+            return None
+
+        size, mtime, md5, classes = row
+        if mtime != file_info.last_modifies:
+            # Touched but possibly unchanged (checkout, copy), compare the content hash
+            if SystemUtility.get_file_md5(filePath) != md5:
+                self.misses += 1
+                return None
+            self.connection.execute(
+                "UPDATE files SET mtime = ? WHERE path = ? AND language = ?",
+                (file_info.last_modifies, os.path.abspath(filePath), language.name),
+            )
+            self.connection.commit()
+
+        self.hits += 1
+        return pickle.loads(classes)
+
+    def store(self, filePath, language, listOfClasses, file_info=None):
+        """Caches listOfClasses.
+
+        file_info holds the size, mtime and md5 of the content that was analyzed
+        (see SourceFile); without it the file is looked at now, which is only right
+        when it cannot have changed since it was analyzed.
+        """
+        if file_info is None:
+            file_info = self._get_file_info(filePath, with_md5=True)
+        if file_info is None:
+            return
+        self.connection.execute(
+            "INSERT OR REPLACE INTO files (path, language, size, mtime, md5, classes) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                os.path.abspath(filePath),
+                language.name,
+                file_info.size,
+                file_info.last_modifies,
+                file_info.md5,
+                pickle.dumps(listOfClasses, protocol=pickle.HIGHEST_PROTOCOL),
+            ),
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
+
+    def _get_file_info(self, filePath, with_md5=False):
+        try:
+            return SystemUtility.get_file_info(filePath, with_md5)
+        except OSError:
+            return None
+
+
+if __name__ == "__main__":
+    parseCache = ParseCache(sys.argv[1] if len(sys.argv) > 1 else CACHE_FOLDER)
+    print(
+        parseCache.db_path,
+        parseCache.connection.execute("SELECT COUNT(*) FROM files").fetchone()[0],
+    )
+    parseCache.close()
@@ -2,17 +2,25 @@ import os, sys
 import re
 from model.AnalyzerEntities import *
 from model.DataGeneratorEntities import *
+from model.GraphStore import GraphStore
+from drawer.GraphLayout import GraphLayout
 from drawer.ClassUmlDrawer import ClassUmlDrawer
+from drawer.SymbolResolver import SymbolResolver
 from utils.FileWriter import *
+from utils.CompressedFile import CompressedFile
+from results.ResultIndex import ResultIndex
+from metrics.RunMetrics import RunMetrics
 from datetime import datetime
 from typing import Dict, List  # Import Dict and List for type hinting
 from model.AnalyzerEntities import FileTypeEnum  # Import FileTypeEnum
 
 
 class DataGenerator:
-    def __init__(self) -> None:
-        self.graphData = GraphData()
-        self._uml_drawer_for_filtering = None  # Initialize later based on context
+    def __init__(self, compact_json=False, metrics=None) -> None:
+        self.graphStore = GraphStore()
+        self.compact_json = compact_json
+        # Stage timings of the run this output belongs to
+        self.metrics = metrics if metrics is not None else RunMetrics()
         self._language_context = (
             FileTypeEnum.UNDEFINED
         )  # Store language context, will be set by FileAnalyzer
@@ -20,61 +28,70 @@ class DataGenerator:
     # Ensure this signature accepts targetPath and base_filename
     # Language context is now set externally before calling this
     def generateData(
-        self, listOfClassNodes: list[ClassNode], targetPath: str, base_filename: str
+        self,
+        listOfClassNodes: list[ClassNode],
+        targetPath: str,
+        base_filename: str,
+        resolver: SymbolResolver = None,
     ):
-        self.graphData.analysisSourcePath = targetPath
-        # Set the language context on the GraphData instance as well
-        self.graphData._language_context = self._language_context
+        self.graphStore.analysisSourcePath = targetPath
+        # Set the language context on the GraphStore instance as well
+        self.graphStore._language_context = self._language_context
 
         # --- Language Context is now set by FileAnalyzer via self._language_context ---
         # Remove the heuristic block that tried to guess the language here.
 
-        # Instantiate filter helper based on the already set context
         if self._language_context != FileTypeEnum.UNDEFINED:
             print(f"DataGenerator using context: {self._language_context.name}")
-            try:
-                self._uml_drawer_for_filtering = ClassUmlDrawer(self._language_context)
-            except Exception as e:
-                print(
-                    f"Warning: Could not instantiate ClassUmlDrawer for filtering: {e}"
-                )
-                self._uml_drawer_for_filtering = None
         else:
             print("Warning: DataGenerator running with UNDEFINED language context.")
-            self._uml_drawer_for_filtering = None
-
-        # --- End Language Context Handling ---
-
-        qualified_name_map: Dict[str, ClassNode] = {}
-        simple_name_map: Dict[str, List[str]] = {}
-
-        # Use the (now deduplicated) listOfClassNodes
-        for node in listOfClassNodes:
-            qualified_name = self._get_qualified_name(node)
-            if qualified_name:
-                qualified_name_map[qualified_name] = node
-                # Use the simple name (last part) for the simple_name_map
-                separator = "." if self._language_context == FileTypeEnum.JAVA else "::"
-                simple_name = qualified_name.split(separator)[-1]
-                # Remove template/generic part for simple name mapping
-                simple_name = simple_name.split("<")[0]
-                if simple_name:
-                    if simple_name not in simple_name_map:
-                        simple_name_map[simple_name] = []
-                    simple_name_map[simple_name].append(qualified_name)
 
-        for node in listOfClassNodes:
-            self.dumpClass(node, qualified_name_map, simple_name_map)
+        # Relation targets are resolved once and shared with the UML drawer
+        if resolver is None:
+            resolver = SymbolResolver(listOfClassNodes, self._language_context)
 
-        self.graphData.add_blank_classes()  # This needs the language context set
-        self.graphData.remove_duplicates()  # Should be redundant now if input list is clean, but safe to keep.
+        with self.metrics.stage("graph.build"):
+            for node in listOfClassNodes:
+                self.dumpClass(node, resolver)
 
-        json_output = self.graphData.to_json()
+            self.graphStore.add_blank_classes()  # This needs the language context set
+            self.graphStore.remove_duplicates()  # Should be redundant now if input list is clean, but safe to keep.
+        node_count = self.graphStore.node_count()
+        self.metrics.count("nodes", node_count)
+        self.metrics.count("links", self.graphStore.link_count())
 
         # Use base_filename for JSON
         filePath = f"static/out/{base_filename}.json"
 
-        self.writeToFile(filePath, json_output)
+        # Stream the graph to the file instead of building the whole document in memory
+        with self.metrics.stage("graph.write"):
+            with open(filePath, "w", encoding="utf-8") as f:
+                self.graphStore.write_json(f, self.compact_json)
+        # Served to clients that accept gzip or brotli without compressing per request
+        with self.metrics.stage("graph.compress"):
+            CompressedFile.precompress(filePath)
+        # Listed from the index instead of scanning the result folder
+        with self.metrics.stage("graph.index"):
+            ResultIndex(os.path.dirname(filePath)).record(
+                filePath,
+                targetPath,
+                node_count,
+                self.graphStore.link_count(),
+            )
+
+    def writeLayout(self, base_filename: str):
+        """Writes precomputed node positions to the .pos.json sidecar of the result.
+
+        The view starts from them instead of running the force simulation. Skipped
+        when NumPy is missing; returns the sidecar path or None.
+        """
+        if not GraphLayout.available():
+            print("NumPy is not installed, skipping the layout precomputation.")
+            return None
+        filePath = f"static/out/{base_filename}.pos.json"
+        graphLayout, ids = GraphLayout.of_store(self.graphStore)
+        GraphLayout.write(filePath, ids, graphLayout.layout())
+        return filePath
 
     def _sanitize_path_for_filename(self, path: str) -> str:
         """Sanitizes a full path string to be suitable for use in a filename."""
@@ -106,123 +123,12 @@ class DataGenerator:
 
     def _get_qualified_name(self, classInfo: ClassNode) -> str:
         """Generates the fully qualified name based on language context, excluding trailing * &."""
-        separator = "." if self._language_context == FileTypeEnum.JAVA else "::"
-        name_part = classInfo.name
-        # Handle Java generics or C++ templates in name
-        if classInfo.params:
-            # Use <> for both Java and C++ for consistency in the graph ID
-            name_part = f'{classInfo.name}<{", ".join(classInfo.params)}>'
-
-        # Strip trailing * or & from the name part if present (for C++)
-        if self._language_context == FileTypeEnum.CPP:
-            while name_part.endswith("*") or name_part.endswith("&"):
-                name_part = name_part[:-1].strip()
-
-        if classInfo.package:
-            return f"{classInfo.package}{separator}{name_part}"
-        else:
-            return name_part
-
-    def _get_qualified_name_from_string(
-        self, name_str: str, current_package: str = None
-    ) -> str:
-        """
-        Attempts to ensure a name string is fully qualified based on language context,
-        returning the base type name (no trailing * or &).
-        """
-        if not isinstance(name_str, str):
-            return ""
-        name_str = name_str.strip()
-        # Clean * and & first
-        base_name_str = name_str.replace("*", " ").replace("&", " ").strip()
-
-        # Use the instance's language context
-        separator = "." if self._language_context == FileTypeEnum.JAVA else "::"
-        alt_separator = "::" if self._language_context == FileTypeEnum.JAVA else "."
+        return SymbolResolver.qualified_name_of(classInfo, self._language_context)
 
-        # If it already contains the expected separator, assume qualified
-        if separator in base_name_str:
-            # Special case: Strip std:: prefix for C++ consistency if present
-            if self._language_context == FileTypeEnum.CPP and base_name_str.startswith(
-                "std::"
-            ):
-                return base_name_str[5:]
-            return base_name_str
-        # If it contains the *other* language's separator, it's likely a mistake or cross-language ref
-        elif alt_separator in base_name_str:
-            return base_name_str  # Treat as already qualified (maybe incorrectly)
-
-        should_ignore = False
-        if self._uml_drawer_for_filtering:
-            # Check ignore list using the base name
-            should_ignore = self._uml_drawer_for_filtering._should_ignore_type(
-                base_name_str
-            )
-        else:
-            # Basic check if filter helper not available (less accurate)
-            common_unqualified_types = {  # Combine some common ones
-                "string",
-                "vector",
-                "map",
-                "set",
-                "list",
-                "deque",
-                "pair",
-                "void",
-                "bool",
-                "char",
-                "wchar_t",
-                "short",
-                "int",
-                "long",
-                "float",
-                "double",
-                "size_t",
-                "auto",
-                "String",
-                "Object",
-                "Integer",
-                "Boolean",
-                "Double",
-                "Float",
-                "Long",
-                "Short",
-                "Byte",
-                "Character",
-                "List",
-                "ArrayList",
-                "Map",
-                "HashMap",
-                "Set",
-                "HashSet",
-            }
-            # Check template param convention on base name
-            is_likely_template_param = (
-                len(base_name_str) == 1 and "A" <= base_name_str <= "Z"
-            )
-            should_ignore = (
-                base_name_str in common_unqualified_types or is_likely_template_param
-            )
-
-        if should_ignore:
-            return base_name_str  # Return base name as is, don't prepend package
-        elif current_package:
-            # Prepend package to base name
-            return f"{current_package}{separator}{base_name_str}"
-        else:
-            # Assume base name is global type or from root namespace/default package
-            return base_name_str
-
-    # Ensure dumpClass signature accepts the maps
-    def dumpClass(
-        self,
-        classInfo: ClassNode,
-        qualified_name_map: Dict[str, ClassNode],
-        simple_name_map: Dict[str, List[str]],
-    ):
-        # Use the BASE qualified name for the ID
-        qualified_name = self._get_qualified_name(classInfo)
-        separator = "." if self._language_context == FileTypeEnum.JAVA else "::"
+    def dumpClass(self, classInfo: ClassNode, resolver: SymbolResolver):
+        # Use the BASE qualified name for the ID, in the language of the class
+        qualified_name = resolver.get_qualified_name(classInfo)
+        language = resolver.language_of(classInfo)
 
         classData = ClassData()
         classData.package = classInfo.package
@@ -240,7 +146,7 @@ class DataGenerator:
             return_type = (
                 method.dataType  # method.dataType includes * &
                 if method.dataType
-                else ("void" if self._language_context == FileTypeEnum.JAVA else "")
+                else ("void" if language == FileTypeEnum.JAVA else "")
             )
             method_sig = f"{method.name}({params_str})"
             if return_type:
@@ -255,53 +161,14 @@ class DataGenerator:
             attr_str += f"{var.dataType} {var.name}"
             classData.attributes.append(attr_str.strip())
 
-        self.graphData.nodes.append(classData)
-
-        # Process relations for links - USE BASE TYPES
-        for relation in classInfo.relations:
-            try:
-                # relation.name should already be the BASE type from CppClassAnalyzer
-                target_name_original_base = relation.name
-                if not target_name_original_base:
-                    continue
-
-                # Attempt to qualify the BASE target name
-                target_name_full_base = self._get_qualified_name_from_string(
-                    target_name_original_base, classInfo.package
-                )
+        self.graphStore.add_node(classData, language)
 
-                # Resolve BASE target against known BASE classes
-                resolved_target_base = target_name_full_base
-                if target_name_full_base not in qualified_name_map:
-                    simple_target_name_base = target_name_full_base.split(separator)[
-                        -1
-                    ].split("<")[0]
-                    possible_matches = simple_name_map.get(simple_target_name_base, [])
-                    if len(possible_matches) == 1:
-                        resolved_target_base = possible_matches[
-                            0
-                        ]  # This is a base qualified name
-
-                # Check if the resolved BASE target should be ignored
-                should_ignore = False
-                if self._uml_drawer_for_filtering:
-                    # Check ignore using the BASE name
-                    should_ignore = self._uml_drawer_for_filtering._should_ignore_type(
-                        resolved_target_base
-                    )
-
-                if not should_ignore:
-                    dependency = Dependency()
-                    dependency.source = classData.id  # Source is BASE qualified name
-                    dependency.target = (
-                        resolved_target_base  # Target is BASE qualified name
-                    )
-                    dependency.relation = relation.relationship.name.lower()
-                    self.graphData.links.append(dependency)
-            except AttributeError as e:
-                print(
-                    f"    - Error processing relation {relation} for node {classData.id}: {e}"
-                )
+        # Links use the BASE targets resolved by the SymbolResolver
+        # and are stored as indices into the node id table
+        for relation, target in resolver.relations_of(classInfo):
+            self.graphStore.add_link(
+                classData.id, target, relation.relationship.name.lower()
+            )
 
     def writeToFile(self, fileName, json_output):
         with open(fileName, "w") as f:
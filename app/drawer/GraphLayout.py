@@ -0,0 +1,209 @@
+import json
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Rest length of a link, the one the 3D view uses, so the camera frames the layout
+LINK_DISTANCE = 30.0
+# Levels are coarsened down to this many nodes, which are laid out from scratch
+COARSEST_NODES = 64
+# Repulsion is exact up to this many nodes and sampled above it
+EXACT_REPULSION_NODES = 1000
+REPULSION_SAMPLE = 256
+# Rows of the pairwise distance matrix computed at once
+CHUNK_ROWS = 1024
+# Rounds of link matching per coarsening step, later rounds find few links
+MATCHING_ROUNDS = 8
+
+
+class GraphLayout:
+    """Multilevel force-directed 3D layout of a graph, computed with NumPy.
+
+    The graph is coarsened by collapsing matched link endpoints until it is small,
+    the coarsest graph is laid out from a random start, and each finer level starts
+    from the positions of its coarse nodes and is only refined for a few
+    iterations. Forces are Fruchterman-Reingold ones; repulsion is exact on small
+    levels and estimated from a random sample of nodes on large ones, so a level
+    costs O(n * REPULSION_SAMPLE + links) per iteration. The result is deterministic
+    for a seed.
+    """
+
+    def __init__(self, node_count, sources, targets, seed=0) -> None:
+        self.node_count = node_count
+        self.sources = np.asarray(sources, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int64)
+        self.rng = np.random.default_rng(seed)
+
+    @staticmethod
+    def available():
+        return np is not None
+
+    @staticmethod
+    def of_store(graphStore, seed=0):
+        """Returns the layout of the nodes a GraphStore writes, and their ids."""
+        keep = [i for i, data in enumerate(graphStore.nodeData) if data is not None]
+        position = np.full(len(graphStore.ids), -1, dtype=np.int64)
+        position[keep] = np.arange(len(keep))
+        sources = position[np.frombuffer(graphStore.sources, dtype=np.int64)]
+        targets = position[np.frombuffer(graphStore.targets, dtype=np.int64)]
+        # The view drops links to nodes that are not written
+        written = (sources >= 0) & (targets >= 0)
+        layout = GraphLayout(len(keep), sources[written], targets[written], seed)
+        return layout, [graphStore.ids[i] for i in keep]
+
+    @staticmethod
+    def simple_edges(node_count, sources, targets):
+        """Returns the links without self loops, duplicates and direction."""
+        low = np.minimum(sources, targets)
+        high = np.maximum(sources, targets)
+        keys = np.unique(low[low != high] * node_count + high[low != high])
+        return keys // max(node_count, 1), keys % max(node_count, 1)
+
+    def coarsen(self, node_count, sources, targets):
+        """Matches link endpoints pairwise; returns the coarse node of each node.
+
+        Links get random priorities and the matching is built in rounds over all of
+        them at once: a link whose endpoints are both unmatched is taken when no
+        other such link at either endpoint has a higher priority.
+        """
+        parent = np.full(node_count, -1, dtype=np.int64)
+        coarse_count = 0
+        priority = self.rng.permutation(len(sources))
+        edges = np.arange(len(sources))
+        for _ in range(MATCHING_ROUNDS):
+            edges = edges[(parent[sources[edges]] < 0) & (parent[targets[edges]] < 0)]
+            if not len(edges):
+                break
+            edge_sources, edge_targets = sources[edges], targets[edges]
+            best = np.full(node_count, -1, dtype=np.int64)
+            np.maximum.at(best, edge_sources, priority[edges])
+            np.maximum.at(best, edge_targets, priority[edges])
+            taken = (best[edge_sources] == priority[edges]) & (
+                best[edge_targets] == priority[edges]
+            )
+            coarse = np.arange(coarse_count, coarse_count + taken.sum())
+            parent[edge_sources[taken]] = coarse
+            parent[edge_targets[taken]] = coarse
+            coarse_count += len(coarse)
+        # Unmatched nodes join a matched neighbour, leaves collapse into their hub
+        for source, target in ((sources, targets), (targets, sources)):
+            joins = (parent[source] < 0) & (parent[target] >= 0)
+            parent[source[joins]] = parent[target[joins]]
+        unmatched = parent < 0
+        parent[unmatched] = np.arange(coarse_count, coarse_count + unmatched.sum())
+        return parent
+
+    def layout(self):
+        """Returns an (n, 3) array of node positions centered on the origin."""
+        if self.node_count == 0:
+            return np.zeros((0, 3))
+        sources, targets = GraphLayout.simple_edges(
+            self.node_count, self.sources, self.targets
+        )
+        levels = [(self.node_count, sources, targets)]
+        parents = []
+        while levels[-1][0] > COARSEST_NODES:
+            node_count, sources, targets = levels[-1]
+            parent = self.coarsen(node_count, sources, targets)
+            coarse_count = int(parent.max()) + 1
+            # Nothing left to collapse, e.g. mostly unconnected nodes
+            if coarse_count > node_count * 0.9:
+                break
+            parents.append(parent)
+            levels.append(
+                (
+                    coarse_count,
+                    *GraphLayout.simple_edges(
+                        coarse_count, parent[sources], parent[targets]
+                    ),
+                )
+            )
+
+        node_count, sources, targets = levels[-1]
+        radius = LINK_DISTANCE * max(node_count, 1) ** (1 / 3)
+        positions = self.rng.uniform(-radius, radius, (node_count, 3))
+        positions = self.refine(positions, sources, targets, 200)
+        for parent, (node_count, sources, targets) in zip(
+            reversed(parents), reversed(levels[:-1])
+        ):
+            # Nodes start around their coarse node and spread out from there
+            jitter = self.rng.normal(0, LINK_DISTANCE / 4, (node_count, 3))
+            iterations = 40 if node_count <= EXACT_REPULSION_NODES else 20
+            positions = self.refine(
+                positions[parent] + jitter, sources, targets, iterations
+            )
+        return positions - positions.mean(axis=0)
+
+    def refine(self, positions, sources, targets, iterations):
+        node_count = len(positions)
+        k = LINK_DISTANCE
+        temperature = k * 2
+        cooling = (0.05) ** (1 / max(iterations, 1))
+        for _ in range(iterations):
+            displacement = self.repulsion(positions, k)
+
+            if len(sources):
+                delta = positions[sources] - positions[targets]
+                distance = np.sqrt((delta**2).sum(axis=1)) + 1e-9
+                # Attraction d^2 / k along the link
+                pull = delta * (distance / k)[:, None]
+                for axis in range(3):
+                    displacement[:, axis] -= np.bincount(
+                        sources, pull[:, axis], node_count
+                    )
+                    displacement[:, axis] += np.bincount(
+                        targets, pull[:, axis], node_count
+                    )
+
+            length = np.sqrt((displacement**2).sum(axis=1)) + 1e-9
+            step = np.minimum(length, temperature) / length
+            positions = positions + displacement * step[:, None]
+            temperature *= cooling
+        return positions
+
+    def repulsion(self, positions, k):
+        """Returns the k^2 / d repulsion on every node."""
+        node_count = len(positions)
+        if node_count <= EXACT_REPULSION_NODES:
+            others = positions
+            scale = 1.0
+        else:
+            others = positions[
+                self.rng.choice(node_count, REPULSION_SAMPLE, replace=False)
+            ]
+            scale = node_count / REPULSION_SAMPLE
+        # sum_j (p_i - p_j) w_ij = p_i sum_j w_ij - (W @ P)_i, as matrix products
+        # in float32, precise enough for forces and half the memory traffic
+        positions = positions.astype(np.float32)
+        others = others.astype(np.float32)
+        others_norm = (others**2).sum(axis=1)
+        displacement = np.empty(positions.shape)
+        for start in range(0, node_count, CHUNK_ROWS):
+            rows = positions[start : start + CHUNK_ROWS]
+            distance2 = (
+                (rows**2).sum(axis=1)[:, None]
+                + others_norm[None, :]
+                - 2 * rows @ others.T
+            )
+            # A node does not push itself, nor a sample lying on it
+            weight = k * k / np.maximum(distance2, 1e-6)
+            weight[distance2 < 1e-2] = 0
+            displacement[start : start + CHUNK_ROWS] = (
+                rows * weight.sum(axis=1)[:, None] - weight @ others
+            ) * scale
+        return displacement
+
+    @staticmethod
+    def write(path, ids, positions):
+        """Writes positions in the .pos.json format the view saves: {id: {x, y, z}}."""
+        data = {
+            node_id: {"x": round(x, 2), "y": round(y, 2), "z": round(z, 2)}
+            for node_id, (x, y, z) in zip(ids, positions.tolist())
+        }
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(temp_path, path)
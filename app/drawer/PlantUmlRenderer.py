@@ -0,0 +1,203 @@
+import os, sys
+import atexit
+import queue
+import select
+import subprocess
+import threading
+import uuid
+from concurrent.futures import Future
+from pathlib import Path
+
+# Seconds to wait for the image of a single diagram before restarting PlantUML
+RENDER_TIMEOUT = 120
+# Seconds the diagram being rendered gets when the interpreter exits
+EXIT_TIMEOUT = 5
+
+
+class PlantUmlRenderer:
+    """Renders PlantUML files through one long-lived PlantUML process.
+
+    PlantUML runs in -pipe mode: each diagram is written to its stdin and the
+    image is read back from stdout up to a delimiter line, so the JVM starts once
+    instead of once per diagram. Diagrams are queued and rendered in order by a
+    worker thread; render() returns a Future. When the pipe fails, the diagram is
+    rendered with a one-off PlantUML run instead.
+    """
+
+    renderers = dict()
+    lock = threading.Lock()
+
+    def __init__(self, command, image_format="png", timeout=RENDER_TIMEOUT) -> None:
+        self.command = list(command)
+        self.image_format = image_format
+        self.timeout = timeout
+        self.delimiter = ("--kudsight-" + uuid.uuid4().hex).encode()
+        self.process = None
+        self.buffer = b""
+        self.jobs = queue.Queue()
+        # Set when queued diagrams are cancelled, failures are not retried then
+        self.closing = False
+        self.thread = threading.Thread(
+            target=self.run, name=f"plantuml-{image_format}", daemon=True
+        )
+        self.thread.start()
+
+    @staticmethod
+    def get(jar_path, image_format="png"):
+        """Returns the shared renderer for a jar and image format."""
+        key = (str(jar_path), image_format)
+        with PlantUmlRenderer.lock:
+            renderer = PlantUmlRenderer.renderers.get(key)
+            if renderer is None:
+                renderer = PlantUmlRenderer(
+                    ["java", "-Djava.awt.headless=true", "-jar", str(jar_path)],
+                    image_format,
+                )
+                PlantUmlRenderer.renderers[key] = renderer
+            return renderer
+
+    @staticmethod
+    def shutdown_all(cancel_futures=False, timeout=None):
+        with PlantUmlRenderer.lock:
+            renderers = list(PlantUmlRenderer.renderers.values())
+            PlantUmlRenderer.renderers.clear()
+        for renderer in renderers:
+            renderer.shutdown(cancel_futures, timeout)
+
+    @staticmethod
+    def shutdown_at_exit():
+        """Cancels the queued diagrams and stops PlantUML without waiting for them."""
+        PlantUmlRenderer.shutdown_all(cancel_futures=True, timeout=EXIT_TIMEOUT)
+
+    def render(self, puml_path, output_path=None):
+        """Queues puml_path for rendering; the Future resolves to the image path."""
+        puml_path = Path(puml_path)
+        if output_path is None:
+            output_path = puml_path.with_suffix("." + self.image_format)
+        future = Future()
+        self.jobs.put((puml_path, Path(output_path), future))
+        return future
+
+    def shutdown(self, cancel_futures=False, timeout=None):
+        """Stops the worker thread and PlantUML once the queued diagrams are rendered.
+
+        With cancel_futures the diagrams not started yet are cancelled instead. The
+        thread is waited for at most timeout seconds, the render timeout by default.
+        """
+        if cancel_futures:
+            self.closing = True
+            while True:
+                try:
+                    job = self.jobs.get_nowait()
+                except queue.Empty:
+                    break
+                if job is not None:
+                    job[2].cancel()
+        self.jobs.put(None)
+        self.thread.join(timeout=self.timeout if timeout is None else timeout)
+        self.stop_process()
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            puml_path, output_path, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                self.render_job(puml_path, output_path)
+                future.set_result(output_path)
+            except Exception as e:
+                print(f"Exception generating {self.image_format} for {puml_path}: {e}")
+                future.set_exception(e)
+
+    def render_job(self, puml_path, output_path):
+        source = puml_path.read_bytes()
+        try:
+            if os.name == "nt":
+                # select() does not work on pipes on Windows
+                raise OSError("pipe mode is not supported on Windows")
+            image = self.render_with_pipe(source)
+        except (OSError, TimeoutError) as e:
+            if self.closing:
+                raise
+            print(f"PlantUML pipe failed ({e}), rendering {puml_path} directly")
+            self.stop_process()
+            image = self.render_with_process(puml_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "wb") as f:
+            f.write(image)
+        print(f"Successfully generated {self.image_format.upper()}: {output_path}")
+
+    def start_process(self):
+        self.process = subprocess.Popen(
+            self.command
+            + [
+                "-pipe",
+                "-t" + self.image_format,
+                "-pipedelimitor",
+                self.delimiter.decode(),
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self.buffer = b""
+
+    def stop_process(self):
+        # Also called by shutdown() while the worker thread may still use it
+        process, self.process = self.process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+            process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+
+    def render_with_pipe(self, source):
+        if self.process is None or self.process.poll() is not None:
+            self.start_process()
+        if not source.endswith(b"\n"):
+            source += b"\n"
+        self.process.stdin.write(source)
+        self.process.stdin.flush()
+
+        marker = self.delimiter + b"\n"
+        stdout = self.process.stdout.fileno()
+        while marker not in self.buffer:
+            ready, _, _ = select.select([stdout], [], [], self.timeout)
+            if not ready:
+                raise TimeoutError(f"no image after {self.timeout}s")
+            chunk = os.read(stdout, 65536)
+            if not chunk:
+                raise OSError("PlantUML exited")
+            self.buffer += chunk
+        image, _, self.buffer = self.buffer.partition(marker)
+        return image
+
+    def render_with_process(self, puml_path):
+        process = subprocess.run(
+            self.command + ["-pipe", "-t" + self.image_format],
+            input=puml_path.read_bytes(),
+            capture_output=True,
+            timeout=self.timeout,
+        )
+        if process.returncode != 0:
+            raise RuntimeError(
+                f"PlantUML exit code {process.returncode}: "
+                + process.stderr.decode(errors="replace")
+            )
+        return process.stdout
+
+
+atexit.register(PlantUmlRenderer.shutdown_at_exit)
+
+
+if __name__ == "__main__":
+    renderer = PlantUmlRenderer.get(
+        sys.argv[1], sys.argv[3] if len(sys.argv) > 3 else "png"
+    )
+    print(renderer.render(sys.argv[2]).result())
+    PlantUmlRenderer.shutdown_all()
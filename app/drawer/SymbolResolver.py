@@ -0,0 +1,196 @@
+import sys
+from collections import defaultdict
+from typing import Dict, List
+from model.AnalyzerEntities import *
+from drawer.TypeFilter import TypeFilter
+
+
+def separator_of(language: FileTypeEnum) -> str:
+    return "." if language == FileTypeEnum.JAVA else "::"
+
+
+class SymbolResolver:
+    """Resolves relation targets of a set of classes to their qualified class names.
+
+    Classes are partitioned by source language: each class is named, qualified and
+    filtered in the context of its own language (see partitioned), and targets not
+    found in that language are looked up in the others, so cross-language edges
+    survive. The name maps are built once, each (type, package, language) is
+    resolved once, and the resolved relations of each class are kept, so the JSON
+    and PlantUML outputs share a single resolution pass.
+    """
+
+    def __init__(
+        self,
+        listOfClassNodes: list[ClassNode],
+        language: FileTypeEnum,
+        languages: dict = None,
+    ):
+        # Language of the classes not listed in languages (id(node) -> language)
+        self.language = language
+        self.languages = languages or {}
+        self.listOfClassNodes = listOfClassNodes
+        self.qualified_name_maps: Dict[FileTypeEnum, Dict[str, ClassNode]] = (
+            defaultdict(dict)
+        )
+        self.simple_name_maps: Dict[FileTypeEnum, Dict[str, List[str]]] = defaultdict(
+            dict
+        )
+        self.resolved_targets = dict()
+        self.resolved_relations = dict()
+
+        for node in listOfClassNodes:
+            language = self.language_of(node)
+            qualified_name = self.get_qualified_name(node)
+            if qualified_name:
+                self.qualified_name_maps[language][qualified_name] = node
+                # Remove template/generic part for simple name mapping
+                simple_name = qualified_name.split(separator_of(language))[-1]
+                simple_name = simple_name.split("<")[0]
+                if simple_name:
+                    self.simple_name_maps[language].setdefault(simple_name, []).append(
+                        qualified_name
+                    )
+
+    @staticmethod
+    def partitioned(partitions: dict):
+        """Builds a resolver over {language: [ClassNode]} partitions.
+
+        The language with the most classes becomes the primary language, which is
+        used where the output needs a single context.
+        """
+        languages = dict()
+        listOfClassNodes = []
+        for language, nodes in partitions.items():
+            for node in nodes:
+                languages[id(node)] = language
+            listOfClassNodes.extend(nodes)
+        primary_language = FileTypeEnum.JAVA
+        if partitions:
+            primary_language = max(partitions, key=lambda lang: len(partitions[lang]))
+        return SymbolResolver(listOfClassNodes, primary_language, languages)
+
+    @staticmethod
+    def qualified_name_of(classInfo: ClassNode, language: FileTypeEnum) -> str:
+        """Gets the BASE qualified name (no trailing * &) for identification."""
+        name_part = classInfo.name
+        # Use <> for both Java generics and C++ templates in the graph ID
+        if classInfo.params:
+            name_part = f'{classInfo.name}<{", ".join(classInfo.params)}>'
+
+        # Strip trailing * or & from the name part if present (for C++)
+        if language == FileTypeEnum.CPP:
+            while name_part.endswith("*") or name_part.endswith("&"):
+                name_part = name_part[:-1].strip()
+
+        if classInfo.package:
+            return f"{classInfo.package}{separator_of(language)}{name_part}"
+        else:
+            return name_part
+
+    def language_of(self, classInfo: ClassNode) -> FileTypeEnum:
+        return self.languages.get(id(classInfo), self.language)
+
+    def get_qualified_name(self, classInfo: ClassNode) -> str:
+        return SymbolResolver.qualified_name_of(classInfo, self.language_of(classInfo))
+
+    def qualify(
+        self, name_str: str, current_package: str = None, language: FileTypeEnum = None
+    ) -> str:
+        """Prefixes an unqualified BASE type name (no * &) with current_package."""
+        if not isinstance(name_str, str):
+            return ""
+        language = language or self.language
+        separator = separator_of(language)
+        alt_separator = "::" if separator == "." else "."
+        base_name_str = name_str.strip().replace("*", " ").replace("&", " ").strip()
+
+        # If it already contains the expected separator, assume qualified
+        if separator in base_name_str:
+            # Strip std:: prefix for C++ consistency
+            if language == FileTypeEnum.CPP and base_name_str.startswith("std::"):
+                return base_name_str[5:]
+            return base_name_str
+        # The other separator, likely a cross-language reference
+        elif alt_separator in base_name_str:
+            return base_name_str
+
+        if TypeFilter.of(language).should_ignore(base_name_str):
+            return base_name_str
+        elif current_package:
+            return f"{current_package}{separator}{base_name_str}"
+        else:
+            return base_name_str
+
+    def resolve(
+        self, name_str: str, current_package: str = None, language: FileTypeEnum = None
+    ):
+        """Returns the qualified target of a type name, or None when it is ignored."""
+        language = language or self.language
+        key = (name_str, current_package, language)
+        if key in self.resolved_targets:
+            return self.resolved_targets[key]
+
+        target = self.qualify(name_str, current_package, language)
+        # Resolve against the known classes by simple name when unambiguous
+        simple_name = target.split(separator_of(language))[-1].split("<")[0]
+        if target not in self.qualified_name_maps[language]:
+            possible_matches = self.simple_name_maps[language].get(simple_name, [])
+            if len(possible_matches) == 1:
+                target = possible_matches[0]
+            elif not possible_matches:
+                target = self.resolve_in_other_languages(target, simple_name, language)
+
+        if TypeFilter.of(language).should_ignore(target):
+            target = None
+        self.resolved_targets[key] = target
+        return target
+
+    def resolve_in_other_languages(self, target, simple_name, language):
+        """Returns the class of another language that target refers to, or target."""
+        other_languages = [lang for lang in self.simple_name_maps if lang != language]
+        if not other_languages or TypeFilter.of(language).should_ignore(target):
+            return target
+        if any(target in self.qualified_name_maps[lang] for lang in other_languages):
+            return target
+        possible_matches = [
+            qualified_name
+            for lang in other_languages
+            for qualified_name in self.simple_name_maps[lang].get(simple_name, [])
+        ]
+        return possible_matches[0] if len(possible_matches) == 1 else target
+
+    def relations_of(self, classInfo: ClassNode) -> list:
+        """Returns the (Inheritance, resolved target) pairs of a class, ignored types left out."""
+        entry = self.resolved_relations.get(id(classInfo))
+        if entry is not None:
+            return entry[1]
+
+        language = self.language_of(classInfo)
+        relations = []
+        for relation in classInfo.relations:
+            try:
+                if not relation.name:
+                    continue
+                target = self.resolve(relation.name, classInfo.package, language)
+                if target is not None:
+                    relations.append((relation, target))
+            except Exception as e:
+                print(
+                    f"    - Error resolving relation {relation} of {self.get_qualified_name(classInfo)}: {e}"
+                )
+        # Keyed by identity, the class is kept alive along with its entry
+        self.resolved_relations[id(classInfo)] = (classInfo, relations)
+        return relations
+
+
+if __name__ == "__main__":
+    classInfo = ClassNode(package="com.sample", name="Order")
+    classInfo.relations.append(Inheritance("Customer", InheritanceEnum.DEPENDED))
+    classInfo.relations.append(Inheritance("String", InheritanceEnum.DEPENDED))
+    customer = ClassNode(package="com.sample.model", name="Customer")
+    resolver = SymbolResolver.partitioned(
+        {FileTypeEnum.JAVA: [classInfo], FileTypeEnum.KOTLIN: [customer]}
+    )
+    for relation, target in resolver.relations_of(classInfo):
+        print(relation.relationship.name, target)
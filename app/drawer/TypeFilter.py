@@ -0,0 +1,292 @@
+import sys
+from functools import lru_cache
+from pathlib import Path
+from model.AnalyzerEntities import FileTypeEnum
+from analyzer.common.PatternRegistry import PatternRegistry
+
+DEFAULT_VALUE_PATTERN = PatternRegistry.compile(r"\s*=[^,]+")
+ARRAY_PATTERN = PatternRegistry.compile(r"\[.*?\]")
+
+
+class TypeFilter:
+    """Type names ignored for relationships in one language, and the display cleaner.
+
+    Built once per language and process (see TypeFilter.of) from the keyword file,
+    the common library types and the primitives. The sets are frozen, so one filter
+    is shared by every drawer and generator, and should_ignore results are memoized.
+    """
+
+    def __init__(self, file_type: FileTypeEnum) -> None:
+        self.file_type = file_type
+
+        loaded_keywords = self.load_keywords(file_type)
+        common_types_to_ignore = set()
+        basic_primitives = set()
+        if file_type == FileTypeEnum.JAVA:
+            basic_primitives = {
+                "void",
+                "boolean",
+                "byte",
+                "char",
+                "short",
+                "int",
+                "long",
+                "float",
+                "double",
+            }
+            common_types_to_ignore = {
+                "Object",
+                "String",
+                "CharSequence",
+                "Number",
+                "Boolean",
+                "Byte",
+                "Character",
+                "Short",
+                "Integer",
+                "Long",
+                "Float",
+                "Double",
+                "Void",
+                "Math",
+                "System",
+                "Thread",
+                "Runnable",
+                "Exception",
+                "RuntimeException",
+                "Error",
+                "Throwable",
+                "Class",
+                "ClassLoader",
+                "Package",
+                "Process",
+                "Runtime",
+                "Enum",
+                "List",
+                "ArrayList",
+                "LinkedList",
+                "Map",
+                "HashMap",
+                "Set",
+                "HashSet",
+                "Collection",
+                "Collections",
+                "Iterator",
+                "Optional",
+                "Date",
+                "Calendar",
+                "UUID",
+                "Arrays",
+                "Objects",
+                "Properties",
+                "Random",
+                "Scanner",
+                "File",
+                "InputStream",
+                "OutputStream",
+                "Reader",
+                "Writer",
+                "Serializable",
+                "Override",
+                "Deprecated",
+                "SuppressWarnings",
+            }
+        elif file_type == FileTypeEnum.CPP:
+            basic_primitives = {
+                "void",
+                "bool",
+                "char",
+                "wchar_t",
+                "char8_t",
+                "char16_t",
+                "char32_t",
+                "short",
+                "int",
+                "long",
+                "float",
+                "double",
+                "size_t",
+                "ptrdiff_t",
+                "nullptr_t",
+                "auto",
+            }
+            common_types_to_ignore = {
+                "string",
+                "wstring",
+                "vector",
+                "map",
+                "set",
+                "list",
+                "deque",
+                "pair",
+                "tuple",
+                "shared_ptr",
+                "unique_ptr",
+                "weak_ptr",
+                "istream",
+                "ostream",
+                "iostream",
+                "fstream",
+                "sstream",
+                "function",
+                "optional",
+                "variant",
+                "any",
+            }
+
+        self.ignoredTypes = frozenset(
+            set(loaded_keywords) | common_types_to_ignore | basic_primitives
+        )
+
+        modifiers = set()
+        namespaces_to_strip = set()
+        if self.file_type == FileTypeEnum.JAVA:
+            modifiers = {
+                "public",
+                "protected",
+                "private",
+                "static",
+                "final",
+                "abstract",
+                "synchronized",
+                "volatile",
+                "transient",
+                "native",
+                "strictfp",
+                "default",
+                "sealed",
+                "non-sealed",
+            }
+        elif self.file_type == FileTypeEnum.CPP:
+            modifiers = {
+                "const",
+                "volatile",
+                "static",
+                "mutable",
+                "register",
+                "inline",
+                "extern",
+                "typename",
+                "using",
+                "struct",
+                "class",
+                "virtual",
+                "explicit",
+                "friend",
+            }
+            namespaces_to_strip = {"std::"}
+        self.modifiers = frozenset(modifiers)
+        self.namespaces_to_strip = tuple(namespaces_to_strip)
+        self.should_ignore = lru_cache(maxsize=65536)(self._should_ignore)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def of(file_type: FileTypeEnum):
+        """Returns the shared filter of a language."""
+        return TypeFilter(file_type)
+
+    @staticmethod
+    def load_keywords(file_type: FileTypeEnum) -> list[str]:
+        if file_type == FileTypeEnum.UNDEFINED:
+            print("Warning: Undefined file type, cannot load keywords.")
+            return []
+        try:
+            current_script_dir = Path(__file__).resolve().parent
+            app_dir = current_script_dir.parent
+            data_dir = app_dir.parent / "data"
+            if not data_dir.exists():
+                print(f"Warning: Calculated data directory does not exist: {data_dir}")
+                data_dir = Path("data")
+                if not data_dir.exists():
+                    print(
+                        f"Warning: Fallback data directory does not exist: {data_dir.resolve()}"
+                    )
+                    return []
+            file_name = f"{file_type.name}.txt"
+            file_path = data_dir / file_name
+        except Exception as e:
+            print(f"Error calculating keyword file path: {e}")
+            return []
+
+        print(f"Attempting to load keywords from: {file_path.resolve()}")
+        keywords = []
+        if not file_path.is_file():
+            print(f"Warning: Keyword file not found at {file_path.resolve()}")
+            return []
+        try:
+            with open(file_path, "r") as f:
+                keywords = [line.strip() for line in f if line.strip()]
+                print(f"Loaded {len(keywords)} keywords from {file_path.resolve()}")
+        except Exception as e:
+            print(f"Error loading keywords from {file_path.resolve()}: {e}")
+        return keywords
+
+    def clean_type(self, name: str) -> str:
+        """Cleans a type name for DISPLAY purposes (keeps * &)."""
+        if not isinstance(name, str):
+            return ""
+        # Don't strip * & for display
+        name = DEFAULT_VALUE_PATTERN.sub("", name)
+        name = ARRAY_PATTERN.sub("", name)
+
+        parts = name.split()
+        core_parts = [p for p in parts if p and p not in self.modifiers]
+        if not core_parts:
+            return ""
+
+        cleaned_name = " ".join(core_parts)
+
+        for ns in self.namespaces_to_strip:
+            if cleaned_name.startswith(ns):
+                cleaned_name = cleaned_name[len(ns) :]
+
+        if self.file_type == FileTypeEnum.CPP and cleaned_name.startswith("::"):
+            cleaned_name = cleaned_name[2:]
+
+        if self.file_type == FileTypeEnum.JAVA:
+            cleaned_name = cleaned_name.replace("...", "").strip()
+
+        # Consolidate pointer/ref spacing for display
+        if self.file_type == FileTypeEnum.CPP:
+            cleaned_name = cleaned_name.replace(" *", "*").replace(" &", "&")
+
+        return cleaned_name.strip()
+
+    def _should_ignore(self, type_name: str) -> bool:
+        """Checks if a type should be ignored for relationships, using BASE type."""
+        if not type_name:
+            return True
+        # Clean * & for the check against ignore list
+        base_type_name = type_name.replace("*", " ").replace("&", " ").strip()
+        # Use the display cleaner just to remove keywords/namespaces before checking ignore list
+        cleaned_base_name = self.clean_type(base_type_name)
+        if not cleaned_base_name:
+            return True
+
+        # Check the cleaned base name against the ignore list
+        if cleaned_base_name in self.ignoredTypes:
+            return True
+
+        separator = "." if self.file_type == FileTypeEnum.JAVA else "::"
+        simple_base_name = cleaned_base_name.split(separator)[-1]
+        if simple_base_name in self.ignoredTypes:
+            return True
+
+        # Special check for template/generic parameters (single uppercase letters) - Apply to all languages
+        if len(cleaned_base_name) == 1 and "A" <= cleaned_base_name <= "Z":
+            return True
+
+        return False
+
+
+if __name__ == "__main__":
+    typeFilter = TypeFilter.of(
+        FileTypeEnum[sys.argv[1]] if len(sys.argv) > 1 else FileTypeEnum.JAVA
+    )
+    print(len(typeFilter.ignoredTypes), "ignored types")
+    for type_name in sys.argv[2:]:
+        print(
+            type_name,
+            typeFilter.clean_type(type_name),
+            typeFilter.should_ignore(type_name),
+        )
@@ -0,0 +1,131 @@
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, field
+from typing import Optional
+
+# Finished jobs kept around for clients that poll late
+MAX_FINISHED_JOBS = 100
+
+
+@dataclass
+class AnalysisJob:
+    id: str = ""
+    targetPath: str = ""
+    status: str = "queued"  # queued, running, done or error
+    phase: str = "queued"  # queued, analyzing, generating, layout, done
+    processed: int = 0
+    total: int = 0
+    createdAt: float = field(default_factory=time.time)
+    startedAt: Optional[float] = None
+    finishedAt: Optional[float] = None
+    resultFile: Optional[str] = None
+    message: Optional[str] = None
+    version: int = 0  # Bumped on every change, used by the event stream
+
+    def eta_seconds(self):
+        if self.phase != "analyzing" or not self.processed or not self.startedAt:
+            return None
+        elapsed = time.time() - self.startedAt
+        return round(elapsed / self.processed * (self.total - self.processed), 1)
+
+    def to_dict(self):
+        job_dict = asdict(self)
+        job_dict["eta"] = self.eta_seconds()
+        return job_dict
+
+
+class AnalysisJobManager:
+    """Runs FileAnalyzer.analyze calls on a thread pool and tracks their progress.
+
+    analyzer_factory is called with the progress callback of a job and returns the
+    object whose analyze(targetPath) runs it.
+    """
+
+    def __init__(self, analyzer_factory, workers=2) -> None:
+        self.analyzer_factory = analyzer_factory
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="analysis-job"
+        )
+        self.jobs = dict()
+        self.condition = threading.Condition()
+
+    def submit(self, targetPath):
+        job = AnalysisJob(id=uuid.uuid4().hex, targetPath=targetPath)
+        with self.condition:
+            self.jobs[job.id] = job
+            self.prune_finished_jobs()
+        self.executor.submit(self.run_job, job.id)
+        return job.to_dict()
+
+    def get(self, job_id):
+        """Returns a snapshot dict of the job, or None for an unknown id."""
+        with self.condition:
+            job = self.jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def wait_for_change(self, job_id, version, timeout=15):
+        """Blocks until the job changes past version or timeout passes; returns get()."""
+        with self.condition:
+            self.condition.wait_for(
+                lambda: job_id not in self.jobs or self.jobs[job_id].version != version,
+                timeout,
+            )
+            job = self.jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def update(self, job_id, **changes):
+        with self.condition:
+            job = self.jobs[job_id]
+            for key, value in changes.items():
+                setattr(job, key, value)
+            job.version += 1
+            self.condition.notify_all()
+
+    def run_job(self, job_id):
+        self.update(job_id, status="running", phase="analyzing", startedAt=time.time())
+
+        def progress(phase, processed, total):
+            self.update(job_id, phase=phase, processed=processed, total=total)
+
+        try:
+            targetPath = self.jobs[job_id].targetPath
+            base_filename = self.analyzer_factory(progress).analyze(targetPath)
+            self.update(
+                job_id,
+                status="done",
+                phase="done",
+                finishedAt=time.time(),
+                resultFile=f"{base_filename}.json" if base_filename else None,
+            )
+        except Exception as e:
+            print(f"Error during analysis job {job_id}: {e}")
+            self.update(
+                job_id,
+                status="error",
+                phase="done",
+                finishedAt=time.time(),
+                message=str(e),
+            )
+
+    def prune_finished_jobs(self):
+        finished = [job for job in self.jobs.values() if job.finishedAt is not None]
+        finished.sort(key=lambda job: job.finishedAt)
+        for job in finished[: max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self.jobs[job.id]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    from FileAnalyzer import FileAnalyzer
+
+    manager = AnalysisJobManager(lambda progress: FileAnalyzer(progress=progress))
+    job = manager.submit(sys.argv[1])
+    while job["status"] in ("queued", "running"):
+        job = manager.wait_for_change(job["id"], job["version"])
+        print(job)
+    manager.shutdown()
@@ -0,0 +1,213 @@
+import os
+import sys
+import json
+import time
+import heapq
+import threading
+from contextlib import contextmanager
+
+# Slowest files listed in the run summary
+SLOWEST_FILES = 10
+
+
+class RunMetrics:
+    """Stage timers and counters of one analysis run.
+
+    stage(name) times a block of the run (wall clock), count(name) adds to a
+    counter. Per-file work runs in worker processes, so it is timed there with
+    file_stage(name), which collects into the current file's timings; they come
+    back with the file's result and are added by record_file(), which also keeps
+    the slowest files; skip_file() lists the files left out and why. Nested file stages are counted exclusively: the time of
+    "comments" inside "classes" is not counted again in "classes".
+
+    publish() adds a finished run to the process-wide totals served by
+    prometheus() in the Prometheus text format.
+    """
+
+    # Process-wide totals of the published runs, read by /metrics
+    lock = threading.Lock()
+    totals = {"runs": 0, "stages": {}, "fileStages": {}, "counters": {}}
+    last_run = {}
+    # Per-file timings of the file the current thread analyzes, see begin_file()
+    local = threading.local()
+
+    def __init__(self, slowest=SLOWEST_FILES) -> None:
+        self.started = time.time()
+        self.stages = dict()  # name -> seconds
+        self.fileStages = dict()  # name -> seconds summed over files
+        self.counters = dict()
+        self.slowest = slowest
+        self.slowestFiles = []  # min-heap of (seconds, path, stages)
+        self.skippedFiles = []  # {"path", "reason"} of the files left out
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    @staticmethod
+    def begin_file():
+        """Starts collecting the file stages of the current thread."""
+        RunMetrics.local.timings = dict()
+        RunMetrics.local.open_stages = []
+
+    @staticmethod
+    def end_file():
+        """Returns the file stages collected since begin_file() as {name: seconds}."""
+        timings = getattr(RunMetrics.local, "timings", None) or dict()
+        RunMetrics.local.timings = None
+        return timings
+
+    @staticmethod
+    @contextmanager
+    def file_stage(name):
+        """Times a stage of the file being analyzed; a no-op outside begin_file()."""
+        timings = getattr(RunMetrics.local, "timings", None)
+        if timings is None:
+            yield
+            return
+        open_stages = RunMetrics.local.open_stages
+        # [time spent in nested stages]
+        nested = [0.0]
+        open_stages.append(nested)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            open_stages.pop()
+            if open_stages:
+                open_stages[-1][0] += elapsed
+            timings[name] = timings.get(name, 0.0) + elapsed - nested[0]
+
+    def record_file(self, path, timings):
+        """Adds the file stages of one analyzed file and keeps the slowest files."""
+        for name, seconds in timings.items():
+            self.fileStages[name] = self.fileStages.get(name, 0.0) + seconds
+        entry = (sum(timings.values()), path, timings)
+        if len(self.slowestFiles) < self.slowest:
+            heapq.heappush(self.slowestFiles, entry)
+        elif entry[0] > self.slowestFiles[0][0]:
+            heapq.heapreplace(self.slowestFiles, entry)
+
+    def skip_file(self, path, reason):
+        """Records a file left out of the result, e.g. one over its time budget."""
+        self.skippedFiles.append({"path": path, "reason": reason})
+        self.count("skippedFiles")
+
+    def summary(self):
+        return {
+            "startedAt": self.started,
+            "seconds": round(time.time() - self.started, 6),
+            "stages": {name: round(value, 6) for name, value in self.stages.items()},
+            "fileStages": {
+                name: round(value, 6) for name, value in self.fileStages.items()
+            },
+            "counters": dict(self.counters),
+            "slowestFiles": [
+                {
+                    "path": path,
+                    "seconds": round(seconds, 6),
+                    "stages": {name: round(value, 6) for name, value in stages.items()},
+                }
+                for seconds, path, stages in sorted(
+                    self.slowestFiles, key=lambda entry: -entry[0]
+                )
+            ],
+            "skippedFiles": list(self.skippedFiles),
+        }
+
+    def write(self, path):
+        """Writes the run summary as JSON to path."""
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=4)
+        os.replace(temp_path, path)
+
+    def publish(self):
+        """Adds this run to the process-wide totals."""
+        summary = self.summary()
+        with RunMetrics.lock:
+            totals = RunMetrics.totals
+            totals["runs"] += 1
+            for key in ("stages", "fileStages", "counters"):
+                for name, value in summary[key].items():
+                    totals[key][name] = totals[key].get(name, 0) + value
+            RunMetrics.last_run.clear()
+            RunMetrics.last_run.update(
+                {"seconds": summary["seconds"], "finishedAt": time.time()}
+            )
+
+    @staticmethod
+    def prometheus():
+        """Returns the published totals in the Prometheus text exposition format."""
+        with RunMetrics.lock:
+            totals = json.loads(json.dumps(RunMetrics.totals))
+            last_run = dict(RunMetrics.last_run)
+        lines = [
+            "# HELP kudsight_analysis_runs_total Finished analysis runs.",
+            "# TYPE kudsight_analysis_runs_total counter",
+            f"kudsight_analysis_runs_total {totals['runs']}",
+        ]
+        families = (
+            (
+                "kudsight_stage_seconds_total",
+                "Wall clock seconds spent in each stage of the analysis runs.",
+                "stages",
+                "stage",
+            ),
+            (
+                "kudsight_file_stage_seconds_total",
+                "Seconds spent in each per-file stage, summed over files and workers.",
+                "fileStages",
+                "stage",
+            ),
+            (
+                "kudsight_analysis_items_total",
+                "Items counted by the analysis runs.",
+                "counters",
+                "item",
+            ),
+        )
+        for metric, help_text, key, label in families:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, value in sorted(totals[key].items()):
+                lines.append(f'{metric}{{{label}="{name}"}} {value:g}')
+        if last_run:
+            lines.extend(
+                [
+                    "# HELP kudsight_last_run_seconds Duration of the last analysis run.",
+                    "# TYPE kudsight_last_run_seconds gauge",
+                    f"kudsight_last_run_seconds {last_run['seconds']:g}",
+                    "# HELP kudsight_last_run_timestamp_seconds End of the last analysis run.",
+                    "# TYPE kudsight_last_run_timestamp_seconds gauge",
+                    f"kudsight_last_run_timestamp_seconds {last_run['finishedAt']:.3f}",
+                ]
+            )
+        return "\n".join(lines) + "\n"
+
+
+if __name__ == "__main__":
+    runMetrics = RunMetrics()
+    with runMetrics.stage("sleep"):
+        time.sleep(0.01)
+    for path in sys.argv[1:]:
+        RunMetrics.begin_file()
+        with RunMetrics.file_stage("read"):
+            with open(path, "rb") as f:
+                f.read()
+        runMetrics.record_file(path, RunMetrics.end_file())
+        runMetrics.count("files")
+    runMetrics.publish()
+    print(json.dumps(runMetrics.summary(), indent=4))
+    print(RunMetrics.prometheus())
@@ -1,8 +1,14 @@
+import sys
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Tuple
 from enum import Enum
 
 
+def intern_str(value):
+    """Interns repeated names and types so equal strings share one object."""
+    return sys.intern(value) if type(value) is str else value
+
+
 class InheritanceEnum(Enum):
     EXTENDED = 1
     IMPLEMENTED = 2
@@ -15,7 +21,11 @@ class AccessEnum(Enum):
     PROTECTED = 3
 
 
-@dataclass
+# The models are slotted: analysis of large trees keeps millions of them alive, and
+# compact() turns finished ones into interned strings and tuples
+
+
+@dataclass(slots=True)
 class VariableNode:
     name: str = ""
     dataType: str = ""
@@ -23,24 +33,40 @@ class VariableNode:
     isStatic: bool = False
     isFinal: bool = False
 
+    def compact(self):
+        self.name = intern_str(self.name)
+        self.dataType = intern_str(self.dataType)
+        return self
 
-@dataclass
+
+@dataclass(slots=True)
 class MethodNode:
     name: str = ""
     dataType: str = ""
     accessLevel: AccessEnum = AccessEnum.PUBLIC
-    params: List[str] = field(default_factory=list)
+    params: Tuple[str, ...] = ()
     isStatic: bool = False
     isOverridden: bool = False
     isAbstract: bool = False
     variables: List[VariableNode] = field(default_factory=list)
 
+    def compact(self):
+        self.name = intern_str(self.name)
+        self.dataType = intern_str(self.dataType)
+        self.params = tuple(intern_str(param) for param in self.params)
+        self.variables = tuple(variable.compact() for variable in self.variables)
+        return self
 
-@dataclass
+
+@dataclass(slots=True)
 class Inheritance:
     name: str
     relationship: InheritanceEnum
 
+    def compact(self):
+        self.name = intern_str(self.name)
+        return self
+
 
 @dataclass
 class UmlRelationMap:
@@ -48,7 +74,7 @@ class UmlRelationMap:
     relationship: InheritanceEnum = InheritanceEnum.DEPENDED
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassNode:
     package: str = ""
     name: str = ""
@@ -61,7 +87,27 @@ class ClassNode:
     methods: List[MethodNode] = field(default_factory=list)
     relations: List[Inheritance] = field(default_factory=list)
     classes: List["ClassNode"] = field(default_factory=list)
-    params: List[str] = field(default_factory=list)
+    params: Tuple[str, ...] = ()
+    # Kotlin class kinds
+    isEnum: bool = False
+    isData: bool = False
+    isSealed: bool = False
+    isAnnotation: bool = False
+    isObject: bool = False
+
+    def compact(self):
+        """Interns the strings of the class tree and freezes its lists into tuples.
+
+        Called once a class is fully analyzed; nothing is appended to it afterwards.
+        """
+        self.package = intern_str(self.package)
+        self.name = intern_str(self.name)
+        self.params = tuple(intern_str(param) for param in self.params)
+        self.variables = tuple(variable.compact() for variable in self.variables)
+        self.methods = tuple(method.compact() for method in self.methods)
+        self.relations = tuple(relation.compact() for relation in self.relations)
+        self.classes = tuple(classNode.compact() for classNode in self.classes)
+        return self
 
 
 class FileTypeEnum(Enum):
@@ -1,6 +1,13 @@
 import json
+import textwrap
+from collections.abc import Iterator
 from typing import List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add FileTypeEnum import
 from model.AnalyzerEntities import FileTypeEnum
 from dataclasses import dataclass, field, asdict, fields
@@ -127,3 +134,63 @@ class GraphData:
 
         # Now serialize the dictionary which contains only JSON-compatible types
         return json.dumps(data_dict, indent=4)
+
+    def write_json(self, fp, compact=False):
+        """Writes the to_json() document to fp one node and link at a time.
+
+        Only a single node is converted to a dict at any time, so memory does not
+        grow with the graph. With compact the output has no whitespace and uses
+        orjson when it is installed; otherwise it is identical to to_json().
+        """
+        self.nodes.sort(key=lambda x: x.id)
+        self.links.sort(key=lambda x: (x.source, x.target, x.relation))
+
+        members = []
+        for f in fields(self):
+            if f.name.startswith("_"):
+                continue
+            value = getattr(self, f.name)
+            members.append(
+                (f.name, map(asdict, value) if isinstance(value, list) else value)
+            )
+        write_document(fp, members, compact)
+
+
+def write_document(fp, members, compact=False):
+    """Writes the (key, value) members to fp as a JSON object, like to_json().
+
+    Values that are iterators are written as arrays of the dicts they yield, one at
+    a time, so the items are never held in memory together.
+    """
+    fp.write("{" if compact else "{\n")
+    for key_index, (key, value) in enumerate(members):
+        if key_index:
+            fp.write("," if compact else ",\n")
+        if compact:
+            fp.write(json.dumps(key) + ":")
+        else:
+            fp.write("    " + json.dumps(key) + ": ")
+
+        if not isinstance(value, Iterator):
+            fp.write(json.dumps(value))
+        elif compact:
+            fp.write("[")
+            for index, item in enumerate(value):
+                if index:
+                    fp.write(",")
+                fp.write(dump_compact(item))
+            fp.write("]")
+        else:
+            empty = True
+            for item in value:
+                fp.write(",\n" if not empty else "[\n")
+                fp.write(textwrap.indent(json.dumps(item, indent=4), " " * 8))
+                empty = False
+            fp.write("[]" if empty else "\n    ]")
+    fp.write("}" if compact else "\n}")
+
+
+def dump_compact(value):
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, separators=(",", ":"))
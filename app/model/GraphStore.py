@@ -0,0 +1,268 @@
+import sys
+from array import array
+from dataclasses import asdict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from model.AnalyzerEntities import FileTypeEnum
+from model.DataGeneratorEntities import ClassData, Dependency, GraphData, write_document
+
+
+class GraphStore:
+    """Array-backed graph with the output schema of GraphData.
+
+    Node ids are interned once into a table (id -> index), links are kept as three
+    integer arrays (source, target and relation index), so looking up a node is a
+    dict access and dedup and blank node discovery work on whole arrays, with NumPy
+    when it is installed. Nodes and links are converted to the JSON schema only
+    while write_json streams them; the output is identical to GraphData.write_json.
+    """
+
+    def __init__(self, language: FileTypeEnum = FileTypeEnum.UNDEFINED) -> None:
+        self.analysisSourcePath = None
+        # Language of the nodes added without one
+        self._language_context = language
+        self.ids = []  # index -> node id
+        self.index = dict()  # node id -> index
+        self.nodeData = []  # index -> ClassData, None for ids only referenced by links
+        self.nodeLanguages = []  # index -> language of the class that defined the node
+        self.relationNames = []  # relation index -> relation name
+        self.relationIndex = dict()
+        self.sources = array("q")
+        self.targets = array("q")
+        self.relations = array("q")
+
+    def __len__(self):
+        return len(self.ids)
+
+    def intern(self, node_id: str) -> int:
+        """Returns the index of node_id, adding it to the id table when it is new."""
+        index = self.index.get(node_id)
+        if index is None:
+            index = self.index[node_id] = len(self.ids)
+            self.ids.append(node_id)
+            self.nodeData.append(None)
+            self.nodeLanguages.append(None)
+        return index
+
+    def add_node(self, classData: ClassData, language: FileTypeEnum = None) -> int:
+        """Adds a node; like GraphData.remove_duplicates, the first one of an id is kept.
+
+        language is the one of the class the node comes from, it defaults to the
+        language context of the store.
+        """
+        index = self.intern(classData.id)
+        if self.nodeData[index] is None:
+            self.nodeData[index] = classData
+            self.nodeLanguages[index] = language
+        return index
+
+    def add_link(self, source: str, target: str, relation: str):
+        relation_index = self.relationIndex.get(relation)
+        if relation_index is None:
+            relation_index = self.relationIndex[relation] = len(self.relationNames)
+            self.relationNames.append(relation)
+        self.sources.append(self.intern(source))
+        self.targets.append(self.intern(target))
+        self.relations.append(relation_index)
+
+    def get_node(self, node_id: str):
+        index = self.index.get(node_id)
+        return self.nodeData[index] if index is not None else None
+
+    def node_count(self):
+        return sum(1 for data in self.nodeData if data is not None)
+
+    def link_count(self):
+        return len(self.sources)
+
+    def undefined_nodes(self) -> list:
+        """Returns the indices of the ids referenced by links but not defined."""
+        if np is not None:
+            referenced = np.zeros(len(self.ids), dtype=bool)
+            referenced[np.frombuffer(self.sources, dtype=np.int64)] = True
+            referenced[np.frombuffer(self.targets, dtype=np.int64)] = True
+            defined = np.fromiter(
+                (data is not None for data in self.nodeData), bool, len(self.ids)
+            )
+            return np.flatnonzero(referenced & ~defined).tolist()
+        referenced = set(self.sources)
+        referenced.update(self.targets)
+        return sorted(i for i in referenced if self.nodeData[i] is None)
+
+    def referencing_nodes(self, indices) -> dict:
+        """Returns {index: index of the source of the first link to it} for indices."""
+        if np is not None:
+            targets = self.link_array(self.targets)
+            wanted = np.zeros(len(self.ids), dtype=bool)
+            wanted[indices] = True
+            positions = np.flatnonzero(wanted[targets])
+            # return_index gives the first link of each target
+            _, first = np.unique(targets[positions], return_index=True)
+            positions = positions[first]
+            return dict(
+                zip(
+                    targets[positions].tolist(),
+                    self.link_array(self.sources)[positions].tolist(),
+                )
+            )
+        wanted = set(indices)
+        referencing = dict()
+        for source, target in zip(self.sources, self.targets):
+            if target in wanted and target not in referencing:
+                referencing[target] = source
+        return referencing
+
+    def add_blank_classes(self):
+        """Adds a node for every id that links reference but no class defines.
+
+        The package is guessed from the id with the separator of the language of
+        the class that references it, so blank nodes of a mixed-language graph are
+        split like the targets the resolver qualified in that language.
+        """
+        undefined = self.undefined_nodes()
+        referencing = self.referencing_nodes(undefined)
+        for index in undefined:
+            node_id = self.ids[index]
+            if not node_id:
+                continue
+            source = referencing.get(index)
+            language = self.nodeLanguages[source] if source is not None else None
+            language = language or self._language_context
+            separator = "." if language == FileTypeEnum.JAVA else "::"
+            package_guess = ""
+            if separator in node_id:
+                package_guess = node_id.rsplit(separator, 1)[0]
+            self.nodeData[index] = ClassData(
+                id=node_id, package=package_guess, attributes=[], methods=[]
+            )
+
+    def remove_duplicates(self):
+        """Drops repeated (source, target, relation) links, keeping the first one."""
+        if not self.sources:
+            return
+        if np is not None:
+            keys = self.link_keys()
+            # An unstable sort groups equal keys, the smallest index of a group is
+            # the first occurrence (np.unique with return_index sorts stably, slower)
+            order = np.argsort(keys)
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(
+                np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+            )
+            if len(starts) == len(keys):
+                return
+            first = np.sort(np.minimum.reduceat(order, starts))
+            self.sources = self.take_links(self.sources, first)
+            self.targets = self.take_links(self.targets, first)
+            self.relations = self.take_links(self.relations, first)
+            return
+        unique_links = dict.fromkeys(zip(self.sources, self.targets, self.relations))
+        if len(unique_links) == len(self.sources):
+            return
+        self.sources = array("q", (link[0] for link in unique_links))
+        self.targets = array("q", (link[1] for link in unique_links))
+        self.relations = array("q", (link[2] for link in unique_links))
+
+    @staticmethod
+    def link_array(values):
+        return np.frombuffer(values, dtype=np.int64)
+
+    @staticmethod
+    def take_links(values, indices):
+        taken = array("q")
+        taken.frombytes(GraphStore.link_array(values)[indices].tobytes())
+        return taken
+
+    def link_keys(self):
+        """Returns one int64 key per link, equal for links with equal endpoints and relation."""
+        node_count = len(self.ids)
+        relation_count = max(len(self.relationNames), 1)
+        return (
+            self.link_array(self.sources) * node_count + self.link_array(self.targets)
+        ) * relation_count + self.link_array(self.relations)
+
+    def node_order(self) -> list:
+        """Returns the node indices ordered by id, the order of the JSON output."""
+        return sorted(range(len(self.ids)), key=self.ids.__getitem__)
+
+    def link_order(self, node_order) -> list:
+        """Returns the link indices ordered by (source, target, relation) names."""
+        rank = [0] * len(self.ids)
+        for position, index in enumerate(node_order):
+            rank[index] = position
+        relation_order = sorted(
+            range(len(self.relationNames)), key=self.relationNames.__getitem__
+        )
+        relation_rank = [0] * len(self.relationNames)
+        for position, index in enumerate(relation_order):
+            relation_rank[index] = position
+
+        if np is not None:
+            rank = np.array(rank, dtype=np.int64)
+            relation_rank = np.array(relation_rank, dtype=np.int64)
+            return np.lexsort(
+                (
+                    relation_rank[self.link_array(self.relations)],
+                    rank[self.link_array(self.targets)],
+                    rank[self.link_array(self.sources)],
+                )
+            ).tolist()
+        return sorted(
+            range(len(self.sources)),
+            key=lambda i: (
+                rank[self.sources[i]],
+                rank[self.targets[i]],
+                relation_rank[self.relations[i]],
+            ),
+        )
+
+    def iter_nodes(self, node_order=None):
+        for index in node_order if node_order is not None else self.node_order():
+            if self.nodeData[index] is not None:
+                yield self.nodeData[index]
+
+    def iter_links(self, link_order):
+        for i in link_order:
+            yield {
+                "source": self.ids[self.sources[i]],
+                "target": self.ids[self.targets[i]],
+                "relation": self.relationNames[self.relations[i]],
+            }
+
+    def write_json(self, fp, compact=False):
+        """Writes the graph in the GraphData schema, converting one item at a time."""
+        node_order = self.node_order()
+        members = [
+            ("nodes", map(asdict, self.iter_nodes(node_order))),
+            ("links", self.iter_links(self.link_order(node_order))),
+            ("analysisSourcePath", self.analysisSourcePath),
+        ]
+        write_document(fp, members, compact)
+
+    def to_graph_data(self) -> GraphData:
+        """Returns the graph as a sorted GraphData."""
+        node_order = self.node_order()
+        graphData = GraphData(
+            nodes=list(self.iter_nodes(node_order)),
+            links=[
+                Dependency(**link)
+                for link in self.iter_links(self.link_order(node_order))
+            ],
+            analysisSourcePath=self.analysisSourcePath,
+        )
+        graphData._language_context = self._language_context
+        return graphData
+
+
+if __name__ == "__main__":
+    graphStore = GraphStore(FileTypeEnum.JAVA)
+    graphStore.add_node(ClassData(package="com.sample", id="com.sample.Order"))
+    graphStore.add_link("com.sample.Order", "com.sample.Customer", "depended")
+    graphStore.add_link("com.sample.Order", "com.sample.Customer", "depended")
+    graphStore.add_blank_classes()
+    graphStore.remove_duplicates()
+    graphStore.write_json(sys.stdout)
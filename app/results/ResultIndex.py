@@ -0,0 +1,196 @@
+import json
+import os
+import sys
+import sqlite3
+import time
+from contextlib import closing
+from cache.ParseCache import CACHE_FOLDER
+
+RESULT_FOLDER = "static/out"
+# Page size of list() when none is given, and the largest one accepted
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+# JSON files written next to a result: the 3D layout and the run summary
+SIDECAR_SUFFIXES = (".pos.json", ".run.json")
+
+
+class ResultIndex:
+    """SQLite manifest of the analysis results in the result folder.
+
+    DataGenerator records each result when its JSON is written, so listing them
+    never walks the folder. Pages are read along the (createdAt, filename) index and
+    continue from a cursor instead of an offset, which keeps every page as cheap as
+    the first however many results exist. Entries whose file was deleted behind the
+    index's back are dropped when a page would show them. Each call opens its own
+    connection, so an instance can be shared by request threads.
+    """
+
+    def __init__(self, result_folder=RESULT_FOLDER, cache_folder=CACHE_FOLDER) -> None:
+        self.result_folder = result_folder
+        # Next to the parse cache, outside the folder the app serves
+        os.makedirs(cache_folder, exist_ok=True)
+        self.db_path = os.path.join(cache_folder, "results.db")
+        with closing(self.connect()) as connection:
+            created = self.init_schema(connection)
+        if created:
+            # Results written before the index existed
+            self.rebuild()
+
+    def connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def init_schema(self, connection):
+        """Creates the tables; returns True when the index did not exist yet."""
+        exists = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'results'"
+        ).fetchone()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "filename TEXT PRIMARY KEY, sourcePath TEXT, createdAt REAL, "
+            "nodes INTEGER, links INTEGER, size INTEGER)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_by_time ON results (createdAt, filename)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS results_by_source "
+            "ON results (sourcePath, createdAt, filename)"
+        )
+        connection.commit()
+        return exists is None
+
+    def record(self, filePath, sourcePath, nodes=None, links=None, createdAt=None):
+        """Adds or replaces the entry of the result file at filePath."""
+        stat = os.stat(filePath)
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results "
+                "(filename, sourcePath, createdAt, nodes, links, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    os.path.basename(filePath),
+                    sourcePath,
+                    createdAt if createdAt is not None else time.time(),
+                    nodes,
+                    links,
+                    stat.st_size,
+                ),
+            )
+
+    def remove(self, filename):
+        with closing(self.connect()) as connection, connection:
+            connection.execute("DELETE FROM results WHERE filename = ?", (filename,))
+
+    def rebuild(self):
+        """Indexes the result files found in the folder; returns how many there are."""
+        entries = []
+        for filename in os.listdir(self.result_folder):
+            if not ResultIndex.is_result(filename):
+                continue
+            filePath = os.path.join(self.result_folder, filename)
+            try:
+                stat = os.stat(filePath)
+                with open(filePath, encoding="utf-8") as f:
+                    graph = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Skipping result {filename} in the index: {e}")
+                continue
+            entries.append(
+                (
+                    filename,
+                    graph.get("analysisSourcePath"),
+                    stat.st_mtime,
+                    len(graph.get("nodes") or []),
+                    len(graph.get("links") or []),
+                    stat.st_size,
+                )
+            )
+        with closing(self.connect()) as connection, connection:
+            connection.execute("DELETE FROM results")
+            connection.executemany(
+                "INSERT OR REPLACE INTO results "
+                "(filename, sourcePath, createdAt, nodes, links, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                entries,
+            )
+        return len(entries)
+
+    def list(self, limit=DEFAULT_LIMIT, cursor=None, source=None, query=None):
+        """Returns a page of results, newest first, and the cursor of the next page.
+
+        source keeps the results of one analyzed path, query the ones whose file
+        name or source path contains it. The cursor is None on the last page.
+        """
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        conditions = []
+        params = []
+        if source:
+            conditions.append("sourcePath = ?")
+            params.append(source)
+        if query:
+            conditions.append(
+                "(instr(filename, ?) > 0 OR instr(coalesce(sourcePath, ''), ?) > 0)"
+            )
+            params.extend([query, query])
+        if cursor:
+            createdAt, filename = ResultIndex.parse_cursor(cursor)
+            conditions.append("(createdAt, filename) < (?, ?)")
+            params.extend([createdAt, filename])
+
+        sql = "SELECT filename, sourcePath, createdAt, nodes, links, size FROM results"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY createdAt DESC, filename DESC LIMIT ?"
+        # One row more than the page tells whether there is a next page
+        params.append(limit + 1)
+
+        with closing(self.connect()) as connection, connection:
+            while True:
+                rows = connection.execute(sql, params).fetchall()
+                missing = [
+                    (row[0],)
+                    for row in rows
+                    if not os.path.isfile(os.path.join(self.result_folder, row[0]))
+                ]
+                if not missing:
+                    break
+                # Results deleted from the folder; read the page again without them
+                connection.executemany(
+                    "DELETE FROM results WHERE filename = ?", missing
+                )
+        keys = ("filename", "sourcePath", "createdAt", "nodes", "links", "size")
+        results = [dict(zip(keys, row)) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = results[-1]
+            next_cursor = f"{last['createdAt']!r}|{last['filename']}"
+        return results, next_cursor
+
+    def iter_all(self, source=None, query=None):
+        """Yields every result, newest first, reading the index page by page."""
+        cursor = None
+        while True:
+            results, cursor = self.list(MAX_LIMIT, cursor, source, query)
+            yield from results
+            if cursor is None:
+                return
+
+    @staticmethod
+    def is_result(filename):
+        """Tells whether filename is a result graph and not one of its sidecars."""
+        return filename.endswith(".json") and not filename.endswith(SIDECAR_SUFFIXES)
+
+    @staticmethod
+    def parse_cursor(cursor):
+        createdAt, separator, filename = cursor.partition("|")
+        try:
+            if not separator:
+                raise ValueError
+            return float(createdAt), filename
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {cursor}")
+
+
+if __name__ == "__main__":
+    resultIndex = ResultIndex(*sys.argv[1:3])
+    print(f"Indexed {resultIndex.rebuild()} results in {resultIndex.db_path}")
@@ -0,0 +1,165 @@
+import json
+import os
+import sys
+from collections import deque
+from functools import lru_cache
+
+# Result files whose index is kept in memory, least recently used ones are dropped
+CACHED_INDEXES = 8
+# Largest subgraph returned by one query, the rest is reported as truncated
+MAX_SUBGRAPH_NODES = 5000
+# Relations that form the type hierarchy
+HIERARCHY_RELATIONS = ("extended", "implemented")
+
+
+class SubgraphIndex:
+    """Adjacency index of one analysis result for subgraph queries.
+
+    The result JSON is read once; nodes are numbered, links are kept as outgoing
+    and incoming adjacency lists and nodes are grouped by package. Every query
+    walks only the part of the graph it returns and answers in the schema of the
+    result file, so the view renders it like a full graph. Indexes are shared
+    through of(), which keeps the most recently used ones in memory.
+    """
+
+    def __init__(self, graph: dict) -> None:
+        self.analysisSourcePath = graph.get("analysisSourcePath")
+        self.nodes = graph.get("nodes") or []
+        self.index = {node["id"]: i for i, node in enumerate(self.nodes)}
+        self.outgoing = [[] for _ in self.nodes]  # node -> [(target, link)]
+        self.incoming = [[] for _ in self.nodes]  # node -> [(source, link)]
+        self.links = []
+        for link in graph.get("links") or []:
+            source = self.index.get(link.get("source"))
+            target = self.index.get(link.get("target"))
+            # The view drops links to nodes that are not in the result as well
+            if source is None or target is None:
+                continue
+            self.outgoing[source].append((target, len(self.links)))
+            self.incoming[target].append((source, len(self.links)))
+            self.links.append(link)
+        self.packages = dict()
+        for i, node in enumerate(self.nodes):
+            self.packages.setdefault(node.get("package") or "", []).append(i)
+
+    @staticmethod
+    def of(path):
+        """Returns the index of the result file at path, built once per file version."""
+        stat = os.stat(path)
+        return SubgraphIndex.load(os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    @staticmethod
+    @lru_cache(maxsize=CACHED_INDEXES)
+    def load(path, size, mtime_ns):
+        # size and mtime are part of the key so a rewritten file is indexed again
+        with open(path, encoding="utf-8") as f:
+            return SubgraphIndex(json.load(f))
+
+    def node_index(self, node_id):
+        if node_id not in self.index:
+            raise KeyError(f"Unknown class: {node_id}")
+        return self.index[node_id]
+
+    def neighborhood(self, node_ids, depth=1, direction="both", relations=None):
+        """Returns the classes within depth links of node_ids.
+
+        direction is "out" (used types), "in" (users) or "both"; relations limits
+        the links that are followed, all of them by default.
+        """
+        if not node_ids:
+            raise ValueError("No class given")
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"Unknown direction: {direction}")
+        adjacency = []
+        if direction in ("out", "both"):
+            adjacency.append(self.outgoing)
+        if direction in ("in", "both"):
+            adjacency.append(self.incoming)
+        seeds = [self.node_index(node_id) for node_id in node_ids]
+        return self.subgraph(self.walk(seeds, adjacency, depth, relations))
+
+    def ancestors(self, node_id):
+        """Returns the class and the types it extends or implements, transitively."""
+        seeds = [self.node_index(node_id)]
+        return self.subgraph(
+            self.walk(seeds, [self.outgoing], None, HIERARCHY_RELATIONS)
+        )
+
+    def descendants(self, node_id):
+        """Returns the class and the types extending or implementing it, transitively."""
+        seeds = [self.node_index(node_id)]
+        return self.subgraph(
+            self.walk(seeds, [self.incoming], None, HIERARCHY_RELATIONS)
+        )
+
+    def package(self, name, subpackages=False):
+        """Returns the classes of a package, and of its subpackages when asked."""
+        selected = list(self.packages.get(name, []))
+        if subpackages:
+            for package, members in self.packages.items():
+                if package != name and SubgraphIndex.is_subpackage(package, name):
+                    selected.extend(members)
+        if not selected and not any(
+            SubgraphIndex.is_subpackage(package, name) for package in self.packages
+        ):
+            raise KeyError(f"Unknown package: {name}")
+        return self.subgraph(selected)
+
+    @staticmethod
+    def is_subpackage(package, name):
+        return package.startswith(name + ".") or package.startswith(name + "::")
+
+    def search(self, query, limit=50):
+        """Returns the ids of up to limit classes whose id contains query."""
+        query = query.lower()
+        matches = []
+        for node in self.nodes:
+            if query in node["id"].lower():
+                matches.append(node["id"])
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def walk(self, seeds, adjacency, depth, relations):
+        """Breadth-first walk from seeds; returns the reached nodes in visit order."""
+        visited = dict.fromkeys(seeds)
+        queue = deque((seed, 0) for seed in visited)
+        while queue and len(visited) < MAX_SUBGRAPH_NODES + 1:
+            node, distance = queue.popleft()
+            if depth is not None and distance >= depth:
+                continue
+            for edges in adjacency:
+                for neighbor, link in edges[node]:
+                    if neighbor in visited:
+                        continue
+                    if relations and self.links[link].get("relation") not in relations:
+                        continue
+                    visited[neighbor] = None
+                    queue.append((neighbor, distance + 1))
+        return list(visited)
+
+    def subgraph(self, selected):
+        """Returns the selected nodes and the links between them as a result dict."""
+        truncated = len(selected) > MAX_SUBGRAPH_NODES
+        selected = selected[:MAX_SUBGRAPH_NODES]
+        members = set(selected)
+        links = [
+            self.links[link]
+            for node in selected
+            for target, link in self.outgoing[node]
+            if target in members
+        ]
+        return {
+            "nodes": [self.nodes[node] for node in selected],
+            "links": links,
+            "analysisSourcePath": self.analysisSourcePath,
+            "truncated": truncated,
+        }
+
+
+if __name__ == "__main__":
+    subgraphIndex = SubgraphIndex.of(sys.argv[1])
+    result = subgraphIndex.neighborhood(
+        [sys.argv[2]], int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    )
+    print(json.dumps(result, indent=4))
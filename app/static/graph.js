@@ -3,6 +3,7 @@ import * as THREE from 'https://esm.sh/three';
 import { setupPanel } from './panel.js';
 import { autoSavePositions, setCurrentGraphFile } from './ui.js';
 import { getNodeColorScheme, THEMES } from './theme-manager.js';
+import { NodeLod } from './node-lod.js';
 
 // Export the Graph object to make it accessible to other modules
 export let Graph;
@@ -10,89 +11,8 @@ export let Graph;
 // Add variable to store original data
 export let originalGraphData = null;
 
-// Update the createUMLNode function for better contrast in both themes
-function createUMLNode(node) {
-  const canvas = document.createElement('canvas');
-  canvas.width = 480;
-  canvas.height = 280;
-  const ctx = canvas.getContext('2d');
-  const marginLeft = 20;
-  
-  // Get color scheme based on current theme
-  const isDarkTheme = document.documentElement.classList.contains('dark');
-  const colors = getNodeColorScheme(isDarkTheme);
-
-  // Set a shadow for better visibility against background
-  ctx.shadowColor = colors.shadowColor;
-  ctx.shadowBlur = colors.shadowBlur;
-  ctx.shadowOffsetX = 0;
-  ctx.shadowOffsetY = 0;
-  
-  // Fill white background and add contrast border
-  ctx.fillStyle = colors.background;
-  ctx.fillRect(0, 0, canvas.width, canvas.height);
-  
-  // Turn off shadow for the stroke
-  ctx.shadowBlur = 0;
-  ctx.strokeStyle = colors.stroke;
-  ctx.lineWidth = 4;
-  ctx.strokeRect(0, 0, canvas.width, canvas.height);
-
-  ctx.font = 'bold 24px Arial';
-  ctx.fillStyle = colors.title;
-  ctx.textAlign = 'center';
-  ctx.fillText(node.id, canvas.width / 2, 30);
-
-  ctx.beginPath();
-  ctx.moveTo(0, 40);
-  ctx.lineTo(canvas.width, 40);
-  ctx.stroke();
-
-  let y = 60;
-  ctx.textAlign = 'left';
-
-  if (node.type === 'module') {
-    ctx.font = '20px Arial';
-    ctx.fillStyle = colors.attribute;
-    ctx.fillText(`Version: ${node.version || 'N/A'}`, marginLeft, y);
-    y += 26;
-    ctx.fillText(`Classes: ${(node.classes || []).length}`, marginLeft, y);
-  }
-
-  if (node.type === 'class') {
-    ctx.font = '20px Arial';
-    ctx.fillStyle = colors.attribute;
-    if (node.attributes) {
-      node.attributes.forEach(attr => {
-        ctx.fillText(attr, marginLeft, y);
-        y += 26;
-      });
-    }
-
-    ctx.fillStyle = colors.method;
-    if (node.methods) {
-      y += 10;
-      node.methods.forEach(method => {
-        ctx.fillText(method, marginLeft, y);
-        y += 26;
-      });
-    }
-  }
-
-  const texture = new THREE.CanvasTexture(canvas);
-  const material = new THREE.MeshBasicMaterial({
-    map: texture,
-    side: THREE.DoubleSide,
-    transparent: true // Enable transparency
-  });
-  
-  // Use theme-specific size for nodes
-  const nodeSize = colors.nodeSize;
-  const aspectRatio = canvas.height / canvas.width;
-  const geometry = new THREE.PlaneGeometry(nodeSize, nodeSize * aspectRatio);
-  
-  return new THREE.Mesh(geometry, material);
-}
+// Sphere or card node objects, depending on the distance to the camera
+let nodeLod = null;
 
 // Update the initGraph function to ensure renderer is accessible
 function initGraph() {
@@ -110,7 +30,7 @@ function initGraph() {
     alpha: true,
     preserveDrawingBuffer: true // Important for screenshots
   })(document.getElementById('3d-graph'))
-    .nodeThreeObject(createUMLNode)
+    .nodeThreeObject(node => nodeLod.createNodeObject(node))
     .nodeLabel(getNodeLabel)
     .linkLabel(getLinkLabel)
     .linkDirectionalArrowLength(ARROW_SIZE)
@@ -126,12 +46,48 @@ function initGraph() {
       autoSavePositions();
     });
 
+  nodeLod = new NodeLod(Graph);
+
   // Make Graph globally available for other modules
   window.Graph = Graph;
   
   return Graph;
 }
 
+// Result files never change once written; their text is kept so switching views
+// does not download and decode them again. Each caller gets its own parsed copy,
+// as the graph adds positions to the node objects.
+const resultTextCache = new Map();
+const RESULT_CACHE_SIZE = 4;
+
+export function fetchResultJson(filename) {
+  if (!resultTextCache.has(filename)) {
+    const text = fetch('/out/' + filename).then(res => {
+      if (!res.ok) throw new Error(`${res.status} ${res.statusText}`);
+      return res.text();
+    });
+    text.catch(() => resultTextCache.delete(filename));
+    resultTextCache.set(filename, text);
+    if (resultTextCache.size > RESULT_CACHE_SIZE) {
+      resultTextCache.delete(resultTextCache.keys().next().value);
+    }
+  }
+  return resultTextCache.get(filename).then(text => JSON.parse(text));
+}
+
+// Asks the server for a part of a result (neighborhood, package, ancestors,
+// descendants), so a focused view of a huge graph does not need all of it
+export function fetchSubgraph(filename, query, params = {}) {
+  const search = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    (Array.isArray(value) ? value : [value]).forEach(item => search.append(key, item));
+  });
+  return fetch(`/graph/${encodeURIComponent(filename)}/${query}?${search}`).then(res => {
+    if (!res.ok) throw new Error(`${res.status} ${res.statusText}`);
+    return res.json();
+  });
+}
+
 export function loadGraphData(filename = 'data.json') {
   // Initialize Graph if not already done
   if (!Graph) {
@@ -140,19 +96,22 @@ export function loadGraphData(filename = 'data.json') {
   
   setCurrentGraphFile(filename);
   originalGraphData = null; // Reset original data on new load
+  // Free the cards of the previous graph
+  nodeLod.reset();
 
-  fetch('/out/' + filename)
-    .then(res => res.json())
+  fetchResultJson(filename)
     .then(data => {
       const baseName = filename.replace(/\.json$/, '');
       const posFile = baseName + '.pos.json';
 
-      // First check if the position file exists to avoid 404 errors
-      fetch('/out/' + posFile, { method: 'HEAD' })
-        .then(headRes => {
-          if (headRes.ok) {
-            // Position file exists, fetch it
-            return fetch('/out/' + posFile).then(res => res.json());
+      // Filled by the server-side layout of the analysis, or saved by the user
+      let placedNodes = 0;
+
+      // Position files are optional, a 404 means there are none yet
+      fetch('/out/' + posFile)
+        .then(res => {
+          if (res.ok) {
+            return res.json();
           } else {
             // Position file doesn't exist, continue without it
             throw new Error('No position file');
@@ -163,6 +122,7 @@ export function loadGraphData(filename = 'data.json') {
           data.nodes.forEach(node => {
             const saved = posData[node.id];
             if (saved) {
+              placedNodes++;
               node.x = saved.x;
               node.y = saved.y;
               node.z = saved.z;
@@ -179,16 +139,24 @@ export function loadGraphData(filename = 'data.json') {
         })
         .finally(() => {
           // Clean up data and prepare graph
+          const nodeIds = new Set(data.nodes.map(n => n.id));
           data.links = (data.links || []).filter(link =>
             link &&
             link.source && link.target && link.relation &&
-            data.nodes.find(n => n.id === link.source) &&
-            data.nodes.find(n => n.id === link.target)
+            nodeIds.has(link.source) &&
+            nodeIds.has(link.target)
           );
+
+          // A fully laid out graph is shown as is, without running the simulation
+          const preLaidOut = data.nodes.length > 0 && placedNodes === data.nodes.length;
+          Graph.cooldownTicks(preLaidOut ? 0 : Infinity);
           
           // Store original data
           originalGraphData = data;
           Graph.graphData(data);
+          if (preLaidOut) {
+            setTimeout(() => Graph.zoomToFit(400), 100);
+          }
           setupPanel(data);
           const categorySelect = document.getElementById('categorySelect');
           if (categorySelect) {
@@ -0,0 +1,329 @@
+// === node-lod.js ===
+// Level-of-detail node objects for the 3D graph. Nodes far from the camera are
+// drawn as small spheres sharing one geometry and material; the nodes closest to
+// the camera get a UML card. Cards are rasterized on demand into shared atlas
+// pages instead of one canvas and texture per node, so texture memory stays
+// bounded however many classes the graph has.
+import * as THREE from 'https://esm.sh/three';
+import { getNodeColorScheme } from './theme-manager.js';
+
+// Layout size of a card; it is rasterized at CELL_SCALE into the atlas
+const CARD_WIDTH = 480;
+const CARD_HEIGHT = 280;
+const CELL_SCALE = 0.5;
+const CELL_WIDTH = CARD_WIDTH * CELL_SCALE;
+const CELL_HEIGHT = CARD_HEIGHT * CELL_SCALE;
+// 8 x 14 cards per 2048px page, 16 MB of texture each
+const ATLAS_SIZE = 2048;
+const ATLAS_COLUMNS = Math.floor(ATLAS_SIZE / CELL_WIDTH);
+const ATLAS_ROWS = Math.floor(ATLAS_SIZE / CELL_HEIGHT);
+const MAX_ATLAS_PAGES = 4;
+// Cards are shown within this distance of the camera, nearest first
+const NEAR_DISTANCE = 700;
+const LOD_INTERVAL_MS = 200;
+
+function isDarkTheme() {
+  return document.documentElement.classList.contains('dark');
+}
+
+// Draws the UML card of a node at (0, 0), in card layout units
+function drawCard(ctx, node, colors) {
+  const marginLeft = 20;
+
+  // Set a shadow for better visibility against background
+  ctx.shadowColor = colors.shadowColor;
+  ctx.shadowBlur = colors.shadowBlur;
+  ctx.shadowOffsetX = 0;
+  ctx.shadowOffsetY = 0;
+
+  // Fill white background and add contrast border
+  ctx.fillStyle = colors.background;
+  ctx.fillRect(0, 0, CARD_WIDTH, CARD_HEIGHT);
+
+  // Turn off shadow for the stroke
+  ctx.shadowBlur = 0;
+  ctx.strokeStyle = colors.stroke;
+  ctx.lineWidth = 4;
+  ctx.strokeRect(0, 0, CARD_WIDTH, CARD_HEIGHT);
+
+  ctx.font = 'bold 24px Arial';
+  ctx.fillStyle = colors.title;
+  ctx.textAlign = 'center';
+  ctx.fillText(node.id, CARD_WIDTH / 2, 30);
+
+  ctx.beginPath();
+  ctx.moveTo(0, 40);
+  ctx.lineTo(CARD_WIDTH, 40);
+  ctx.stroke();
+
+  let y = 60;
+  ctx.textAlign = 'left';
+
+  if (node.type === 'module') {
+    ctx.font = '20px Arial';
+    ctx.fillStyle = colors.attribute;
+    ctx.fillText(`Version: ${node.version || 'N/A'}`, marginLeft, y);
+    y += 26;
+    ctx.fillText(`Classes: ${(node.classes || []).length}`, marginLeft, y);
+  }
+
+  if (node.type === 'class') {
+    ctx.font = '20px Arial';
+    ctx.fillStyle = colors.attribute;
+    if (node.attributes) {
+      node.attributes.forEach(attr => {
+        ctx.fillText(attr, marginLeft, y);
+        y += 26;
+      });
+    }
+
+    ctx.fillStyle = colors.method;
+    if (node.methods) {
+      y += 10;
+      node.methods.forEach(method => {
+        ctx.fillText(method, marginLeft, y);
+        y += 26;
+      });
+    }
+  }
+}
+
+// Shared pages of rasterized cards, cells are reused least recently used first
+class CardAtlas {
+  constructor() {
+    this.pages = [];
+    this.cards = new Map(); // node id -> { page, column, row, inUse, lastUsed }
+    this.freeCells = [];
+    this.dark = isDarkTheme();
+  }
+
+  addPage() {
+    const canvas = document.createElement('canvas');
+    canvas.width = ATLAS_SIZE;
+    canvas.height = ATLAS_SIZE;
+    const texture = new THREE.CanvasTexture(canvas);
+    // Mipmaps would blend neighbouring cards, cards are only shown up close
+    texture.generateMipmaps = false;
+    texture.minFilter = THREE.LinearFilter;
+    const material = new THREE.MeshBasicMaterial({
+      map: texture,
+      side: THREE.DoubleSide,
+      transparent: true // Enable transparency
+    });
+    const page = { canvas, ctx: canvas.getContext('2d'), texture, material, dirty: false };
+    this.pages.push(page);
+    for (let row = 0; row < ATLAS_ROWS; row++) {
+      for (let column = 0; column < ATLAS_COLUMNS; column++) {
+        this.freeCells.push({ page, column, row });
+      }
+    }
+  }
+
+  // Returns the card of node, rasterizing it when needed; null when the atlas is full
+  acquire(node) {
+    let card = this.cards.get(node.id);
+    if (!card) {
+      const cell = this.allocate();
+      if (!cell) return null;
+      card = { ...cell, inUse: false, lastUsed: 0 };
+      this.draw(node, card);
+      this.cards.set(node.id, card);
+    }
+    card.inUse = true;
+    card.lastUsed = performance.now();
+    return card;
+  }
+
+  release(nodeId) {
+    const card = this.cards.get(nodeId);
+    if (card) card.inUse = false;
+  }
+
+  allocate() {
+    if (!this.freeCells.length && this.pages.length < MAX_ATLAS_PAGES) this.addPage();
+    if (this.freeCells.length) return this.freeCells.pop();
+
+    // Evict the least recently used card that is not on screen
+    let evictId = null;
+    let evictCard = null;
+    this.cards.forEach((card, nodeId) => {
+      if (!card.inUse && (!evictCard || card.lastUsed < evictCard.lastUsed)) {
+        evictId = nodeId;
+        evictCard = card;
+      }
+    });
+    if (!evictCard) return null;
+    this.cards.delete(evictId);
+    return { page: evictCard.page, column: evictCard.column, row: evictCard.row };
+  }
+
+  draw(node, card) {
+    const { ctx } = card.page;
+    const x = card.column * CELL_WIDTH;
+    const y = card.row * CELL_HEIGHT;
+    ctx.save();
+    ctx.beginPath();
+    ctx.rect(x, y, CELL_WIDTH, CELL_HEIGHT);
+    ctx.clip();
+    ctx.clearRect(x, y, CELL_WIDTH, CELL_HEIGHT);
+    ctx.translate(x, y);
+    ctx.scale(CELL_SCALE, CELL_SCALE);
+    drawCard(ctx, node, getNodeColorScheme(this.dark));
+    ctx.restore();
+    card.page.dirty = true;
+  }
+
+  // Plane geometry showing the cell of card
+  createGeometry(card, nodeSize) {
+    const geometry = new THREE.PlaneGeometry(nodeSize, nodeSize * CARD_HEIGHT / CARD_WIDTH);
+    const uv = geometry.attributes.uv;
+    const left = card.column * CELL_WIDTH;
+    const top = card.row * CELL_HEIGHT;
+    for (let i = 0; i < uv.count; i++) {
+      const u = (left + uv.getX(i) * CELL_WIDTH) / ATLAS_SIZE;
+      const v = 1 - (top + (1 - uv.getY(i)) * CELL_HEIGHT) / ATLAS_SIZE;
+      uv.setXY(i, u, v);
+    }
+    return geometry;
+  }
+
+  // Uploads the pages that got new cards, once per update instead of per card
+  flush() {
+    this.pages.forEach(page => {
+      if (page.dirty) {
+        page.texture.needsUpdate = true;
+        page.dirty = false;
+      }
+    });
+  }
+
+  clear() {
+    this.cards.clear();
+    this.freeCells = [];
+    const pages = this.pages;
+    this.pages = [];
+    pages.forEach(page => {
+      page.texture.dispose();
+      page.material.dispose();
+    });
+    this.dark = isDarkTheme();
+  }
+}
+
+export class NodeLod {
+  constructor(graph) {
+    this.graph = graph;
+    this.atlas = new CardAtlas();
+    this.objects = new Set();
+    this.sphereGeometry = null;
+    this.sphereMaterials = null;
+    this.lastUpdate = 0;
+    this.createNodeObject = this.createNodeObject.bind(this);
+    this.tick = this.tick.bind(this);
+    requestAnimationFrame(this.tick);
+  }
+
+  sphereFor(node) {
+    const dark = isDarkTheme();
+    if (!this.sphereMaterials || this.sphereMaterials.dark !== dark) {
+      const colors = getNodeColorScheme(dark);
+      this.sphereGeometry = this.sphereGeometry || new THREE.SphereGeometry(1, 8, 6);
+      this.sphereMaterials = {
+        dark,
+        nodeSize: colors.nodeSize,
+        class: new THREE.MeshLambertMaterial({ color: colors.attribute }),
+        other: new THREE.MeshLambertMaterial({ color: colors.method })
+      };
+    }
+    const material = node.type === 'class' ? this.sphereMaterials.class : this.sphereMaterials.other;
+    const sphere = new THREE.Mesh(this.sphereGeometry, material);
+    sphere.scale.setScalar(this.sphereMaterials.nodeSize / 8);
+    return sphere;
+  }
+
+  // nodeThreeObject callback: a group showing the sphere until the node comes near
+  createNodeObject(node) {
+    const group = new THREE.Group();
+    group.add(this.sphereFor(node));
+    group.userData = { node, card: null, attached: false };
+    this.objects.add(group);
+    return group;
+  }
+
+  showCard(group) {
+    const { node } = group.userData;
+    const card = this.atlas.acquire(node);
+    if (!card) return false;
+    const nodeSize = getNodeColorScheme(this.atlas.dark).nodeSize;
+    const mesh = new THREE.Mesh(this.atlas.createGeometry(card, nodeSize), card.page.material);
+    group.children[0].visible = false;
+    group.add(mesh);
+    group.userData.card = mesh;
+    return true;
+  }
+
+  hideCard(group) {
+    const mesh = group.userData.card;
+    if (!mesh) return;
+    group.remove(mesh);
+    mesh.geometry.dispose();
+    group.children[0].visible = true;
+    group.userData.card = null;
+    this.atlas.release(group.userData.node.id);
+  }
+
+  tick(now) {
+    if (now - this.lastUpdate >= LOD_INTERVAL_MS) {
+      this.lastUpdate = now;
+      this.update();
+    }
+    requestAnimationFrame(this.tick);
+  }
+
+  // Gives cards to the nearest nodes within NEAR_DISTANCE and spheres to the rest
+  update() {
+    if (!this.objects.size) return;
+    if (this.atlas.dark !== isDarkTheme()) {
+      // Cards of the old theme are redrawn
+      this.objects.forEach(group => this.hideCard(group));
+      this.atlas.clear();
+    }
+    const camera = this.graph.camera();
+    const near = [];
+    this.objects.forEach(group => {
+      if (!group.parent) {
+        // Removed by a reload or a filter, drop its card
+        if (group.userData.attached) {
+          this.hideCard(group);
+          this.objects.delete(group);
+        }
+        return;
+      }
+      group.userData.attached = true;
+      const distance = camera.position.distanceTo(group.position);
+      if (distance < NEAR_DISTANCE) {
+        near.push({ group, distance });
+      } else {
+        this.hideCard(group);
+      }
+    });
+
+    near.sort((a, b) => a.distance - b.distance);
+    const maxCards = MAX_ATLAS_PAGES * ATLAS_COLUMNS * ATLAS_ROWS;
+    near.forEach(({ group }, index) => {
+      if (index >= maxCards) {
+        this.hideCard(group);
+      } else if (!group.userData.card) {
+        this.showCard(group);
+      }
+    });
+    this.atlas.flush();
+  }
+
+  // Frees the cards and textures before a new graph is loaded
+  reset() {
+    this.objects.forEach(group => this.hideCard(group));
+    this.objects.clear();
+    this.atlas.clear();
+  }
+}
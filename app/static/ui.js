@@ -1,6 +1,6 @@
 // === ui.js ===
 import * as THREE from 'https://esm.sh/three';
-import { loadGraphData, Graph, originalGraphData } from './graph.js';
+import { loadGraphData, fetchResultJson, fetchSubgraph, Graph, originalGraphData } from './graph.js';
 import { getSelectedNodeIds, clearSelection } from './panel.js';
 import { styleFormElements } from './tailwind-helpers.js';
 import { initTheme, toggleTheme, THEMES, updateUiForTheme, getNodeColorScheme } from './theme-manager.js';
@@ -50,17 +50,29 @@ export function autoSavePositions() {
   }, 1000);
 }
 
-// --- Function to update dropdown ---
+// --- Functions to update dropdown ---
+function appendFileOptions(graphDataFileSelect, files) {
+  // Keep the "load more" entry last
+  graphDataFileSelect.querySelector(`option[value="${LOAD_MORE_VALUE}"]`)?.remove();
+  files.forEach(file => {
+    const option = document.createElement('option');
+    option.value = file;
+    option.textContent = file;
+    graphDataFileSelect.appendChild(option);
+  });
+  if (nextResultCursor) {
+    const option = document.createElement('option');
+    option.value = LOAD_MORE_VALUE;
+    option.textContent = 'Load more results...';
+    graphDataFileSelect.appendChild(option);
+  }
+}
+
 function updateGraphDataDropdown(files) {
   const graphDataFileSelect = document.getElementById('graphDataFile');
   graphDataFileSelect.innerHTML = ''; // Clear existing options
   if (files && files.length > 0) {
-    files.forEach(file => {
-      const option = document.createElement('option');
-      option.value = file;
-      option.textContent = file;
-      graphDataFileSelect.appendChild(option);
-    });
+    appendFileOptions(graphDataFileSelect, files);
   } else {
     // Handle case with no files
     const option = document.createElement('option');
@@ -120,36 +132,111 @@ function loadContentForFile(filename) {
         const pngFilename = baseName + '.png'; // Assumes .png is generated alongside .puml
         const pngPath = '/out/' + pngFilename;
 
-        // Check if image exists before setting src to avoid 404 console errors (optional but cleaner)
-        fetch(pngPath, { method: 'HEAD' })
-            .then(res => {
-                if (res.ok) {
-                    umlImage.src = pngPath;
-                    umlImage.alt = `UML Diagram for ${filename}`;
-                } else {
-                    umlImage.src = '';
-                    umlImage.alt = `UML Diagram PNG not found for ${filename} (Expected: ${pngFilename})`;
-                }
-            })
-            .catch(err => {
-                console.error("Error checking/loading UML image:", err);
-                umlImage.src = '';
-                umlImage.alt = 'Error loading UML diagram.';
-            });
+        // Load the image directly, the browser cache serves it on later switches
+        umlImage.onerror = () => {
+            umlImage.onerror = null;
+            umlImage.removeAttribute('src');
+            umlImage.alt = `UML Diagram PNG not found for ${filename} (Expected: ${pngFilename})`;
+        };
+        umlImage.alt = `UML Diagram for ${filename}`;
+        umlImage.src = pngPath;
         // Also ensure the panel is updated with metadata from the JSON
-        // Fetch JSON just for panel setup if needed, but avoid full graph load
-        fetch('/out/' + filename)
-            .then(res => res.json())
+        // The JSON text is cached, the full graph is not loaded
+        fetchResultJson(filename)
             .then(data => {
                 if (data) setupPanel(data); // Update panel even in UML mode
             }).catch(err => console.error("Error loading JSON for panel in UML mode:", err));
     }
 }
 
+// --- Analysis job progress ---
+function formatJobProgress(job) {
+  if (job.status === 'queued') return 'Waiting for a free worker...';
+  if (job.phase === 'generating') return 'Generating diagrams...';
+  if (job.phase === 'layout') return 'Computing the graph layout...';
+  if (!job.total) return 'Analyzing...';
+  let text = `Analyzing ${job.processed}/${job.total} files`;
+  if (job.eta !== null && job.eta !== undefined) {
+    text += `, ETA ${Math.ceil(job.eta)}s`;
+  }
+  return text;
+}
+
+// Resolves with the finished job, following its event stream or polling when
+// server-sent events are not available
+function waitForJob(job, onProgress) {
+  const finished = j => j.status === 'done' || j.status === 'error';
+  onProgress(formatJobProgress(job));
+
+  return new Promise((resolve, reject) => {
+    const poll = () => {
+      fetch(`/jobs/${job.id}`)
+        .then(res => res.json())
+        .then(current => {
+          if (current.status === 'error' && !current.id) throw new Error(current.message);
+          onProgress(formatJobProgress(current));
+          if (finished(current)) resolve(current);
+          else setTimeout(poll, 1000);
+        })
+        .catch(reject);
+    };
+
+    if (!window.EventSource) {
+      poll();
+      return;
+    }
+    const events = new EventSource(`/jobs/${job.id}/events`);
+    events.onmessage = event => {
+      const current = JSON.parse(event.data);
+      onProgress(formatJobProgress(current));
+      if (finished(current)) {
+        events.close();
+        resolve(current);
+      }
+    };
+    events.onerror = () => {
+      // The stream dropped (proxy, server restart); keep going by polling
+      events.close();
+      poll();
+    };
+  });
+}
+
+// --- Functions to fetch the result file names, newest first ---
+// The dropdown starts with the newest page of the result index; its last entry
+// loads the next page from the cursor the server returned
+const RESULT_LIST_LIMIT = 200;
+const LOAD_MORE_VALUE = '__load_more__';
+let nextResultCursor = null;
+
+function fetchResultFiles(cursor = null) {
+  let url = `/results?limit=${RESULT_LIST_LIMIT}`;
+  if (cursor) {
+    url += `&cursor=${encodeURIComponent(cursor)}`;
+  }
+  return fetch(url)
+    .then(response => response.json())
+    .then(page => {
+      nextResultCursor = page.next;
+      return page.results.map(result => result.filename);
+    });
+}
+
+function loadMoreResultFiles() {
+  const jsonSelect = document.getElementById('graphDataFile');
+  // Keep showing the open result while the next page loads
+  jsonSelect.value = currentGraphFile || '';
+  return fetchResultFiles(nextResultCursor)
+    .then(files => appendFileOptions(jsonSelect, files))
+    .catch(err => {
+      console.error('Error fetching more result files:', err);
+      showToast('Failed to load more analysis results', 'error');
+    });
+}
+
 // --- Function to fetch and update file list ---
 function loadJsonFileList() {
-  return fetch('/list-json')
-    .then(response => response.json())
+  return fetchResultFiles()
     .then(files => {
       updateGraphDataDropdown(files);
       const jsonSelect = document.getElementById('graphDataFile');
@@ -211,6 +298,7 @@ document.addEventListener('DOMContentLoaded', () => {
   const refreshBtn = document.getElementById('refreshButton'); // Use new ID
   const jsonSelect = document.getElementById('graphDataFile'); // Use new ID
   const focusSelectedBtn = document.getElementById('focusSelectedBtn');
+  const showNeighborhoodBtn = document.getElementById('showNeighborhoodBtn');
   const showAllBtn = document.getElementById('showAllBtn');
   const clearSelectionBtn = document.getElementById('clearSelectionBtn');
 
@@ -231,34 +319,41 @@ document.addEventListener('DOMContentLoaded', () => {
     const formData = new FormData();
     formData.append('folderPath', folderPath);
 
-    fetch('/upload', {
+    fetch('/jobs', {
       method: 'POST',
       body: formData // Send FormData object
     })
       .then(res => res.json())
-      .then(res => {
-        if (res.status === 'ok') {
-          removeSpinner(); // Remove the spinner
-          status.textContent = 'Analysis complete.';
-          showToast('Analysis completed successfully!', 'success');
-          updateGraphDataDropdown(res.files);
-          // Automatically load the newest file (first in the sorted list)
-          if (res.files && res.files.length > 0) {
-            loadContentForFile(res.files[0]);
-          }
-          setTimeout(() => {
-            status.textContent = ''; // Clear status after a delay
-          }, 2000);
-        } else {
-          removeSpinner();
-          status.textContent = `Error: ${res.message}`;
-          showToast(`Error: ${res.message}`, 'error');
-        }
+      .then(job => {
+        if (job.status === 'error') throw new Error(job.message);
+        return waitForJob(job, text => {
+          const label = status.querySelector('#loading-spinner span');
+          if (label) label.textContent = text;
+        });
+      })
+      .then(job => {
+        if (job.status !== 'done') throw new Error(job.message || 'Analysis failed.');
+        return fetchResultFiles()
+          .then(files => {
+            removeSpinner(); // Remove the spinner
+            status.textContent = 'Analysis complete.';
+            showToast('Analysis completed successfully!', 'success');
+            updateGraphDataDropdown(files);
+            // Load the result of this job, or the newest file
+            const file = files.includes(job.resultFile) ? job.resultFile : files[0];
+            if (file) {
+              document.getElementById('graphDataFile').value = file;
+              loadContentForFile(file);
+            }
+            setTimeout(() => {
+              status.textContent = ''; // Clear status after a delay
+            }, 2000);
+          });
       })
       .catch(err => {
         removeSpinner();
-        status.textContent = 'Request failed.';
-        showToast('Network request failed.', 'error');
+        status.textContent = `Error: ${err.message}`;
+        showToast(`Error: ${err.message}`, 'error');
         console.error(err);
       })
       .finally(() => {
@@ -316,7 +411,9 @@ document.addEventListener('DOMContentLoaded', () => {
   // --- Dropdown Change Listener ---
   jsonSelect.addEventListener('change', () => {
     const selectedFile = jsonSelect.value;
-    if (selectedFile) {
+    if (selectedFile === LOAD_MORE_VALUE) {
+      loadMoreResultFiles();
+    } else if (selectedFile) {
       loadContentForFile(selectedFile);
     }
   });
@@ -360,6 +457,40 @@ document.addEventListener('DOMContentLoaded', () => {
     Graph.graphData(filteredData); // Update graph with the filtered data
   });
 
+  showNeighborhoodBtn.addEventListener('click', () => {
+    if (currentViewMode !== '3d') return; // Only works in 3D mode
+    const selectedIds = getSelectedNodeIds();
+
+    if (selectedIds.length === 0 || !currentGraphFile) {
+        alert("Please select one or more items from the list first, or ensure graph data is loaded.");
+        return;
+    }
+
+    // The selected classes and the ones they use or are used by, walked on the server
+    fetchSubgraph(currentGraphFile, 'neighborhood', { id: selectedIds, depth: 1 })
+      .then(data => {
+        if (data.truncated) {
+          showToast('Neighborhood is too large, showing part of it.', 'warning');
+        }
+        // Classes keep the place they have in the full view
+        const placed = new Map((originalGraphData ? originalGraphData.nodes : []).map(node => [node.id, node]));
+        data.nodes.forEach(node => {
+          const known = placed.get(node.id);
+          if (known && known.x !== undefined) {
+            node.fx = node.x = known.x;
+            node.fy = node.y = known.y;
+            node.fz = node.z = known.z;
+          }
+        });
+        Graph.cooldownTicks(Infinity);
+        Graph.graphData(data);
+      })
+      .catch(err => {
+        console.error('Error loading neighborhood:', err);
+        showToast('Could not load the neighborhood.', 'error');
+      });
+  });
+
   showAllBtn.addEventListener('click', () => {
     if (currentViewMode !== '3d') return; // Only works in 3D mode
     if (originalGraphData) {
@@ -486,35 +617,28 @@ document.addEventListener('DOMContentLoaded', () => {
       const pngFilename = `${baseName}.png`;
       const pngPath = `/out/${pngFilename}`;
       
-      // First check if the file exists
-      fetch(pngPath, { method: 'HEAD' })
+      // A single request, a missing file answers 404
+      fetch(pngPath)
         .then(response => {
-          if (response.ok) {
-            // File exists, download it
-            fetch(pngPath)
-              .then(response => response.blob())
-              .then(blob => {
-                const url = URL.createObjectURL(blob);
-                const link = document.createElement('a');
-                link.href = url;
-                link.download = pngFilename;
-                document.body.appendChild(link);
-                link.click();
-                document.body.removeChild(link);
-                URL.revokeObjectURL(url);
-                showToast(`Downloaded ${pngFilename}`, 'success');
-              })
-              .catch(error => {
-                console.error('Error downloading PNG:', error);
-                showToast('Error downloading PNG file', 'error');
-              });
-          } else {
+          if (!response.ok) {
             showToast(`PNG file not found for ${baseName}`, 'error');
+            return;
           }
+          return response.blob().then(blob => {
+            const url = URL.createObjectURL(blob);
+            const link = document.createElement('a');
+            link.href = url;
+            link.download = pngFilename;
+            document.body.appendChild(link);
+            link.click();
+            document.body.removeChild(link);
+            URL.revokeObjectURL(url);
+            showToast(`Downloaded ${pngFilename}`, 'success');
+          });
         })
         .catch(error => {
-          console.error('Error checking PNG file:', error);
-          showToast('Error checking PNG file', 'error');
+          console.error('Error downloading PNG:', error);
+          showToast('Error downloading PNG file', 'error');
         });
     });
   }
@@ -532,27 +656,20 @@ document.addEventListener('DOMContentLoaded', () => {
       const pumlFilename = `${baseName}.puml`;
       const pumlPath = `/out/${pumlFilename}`;
       
-      // First check if the file exists
-      fetch(pumlPath, { method: 'HEAD' })
+      // A single request, a missing file answers 404
+      fetch(pumlPath)
         .then(response => {
-          if (response.ok) {
-            // File exists, download it
-            fetch(pumlPath)
-              .then(response => response.text())
-              .then(text => {
-                downloadFile(text, pumlFilename);
-              })
-              .catch(error => {
-                console.error('Error downloading PUML:', error);
-                showToast('Error downloading PUML file', 'error');
-              });
-          } else {
+          if (!response.ok) {
             showToast(`PUML file not found for ${baseName}`, 'error');
+            return;
           }
+          return response.text().then(text => {
+            downloadFile(text, pumlFilename);
+          });
         })
         .catch(error => {
-          console.error('Error checking PUML file:', error);
-          showToast('Error checking PUML file', 'error');
+          console.error('Error downloading PUML:', error);
+          showToast('Error downloading PUML file', 'error');
         });
     });
   }
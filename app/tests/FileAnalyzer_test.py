@@ -0,0 +1,82 @@
+import unittest
+import os
+import time
+from unittest import mock
+from FileAnalyzer import FileAnalyzer, analyze_file, POOL_CONTEXT
+from model.AnalyzerEntities import FileTypeEnum
+
+
+class TestFileAnalyzer(unittest.TestCase):
+    def setUp(self):
+        test_files_path = os.path.join(os.path.dirname(__file__), "test_files")
+        self.tasks = []
+        for lang_dir in sorted(os.listdir(test_files_path)):
+            lang_path = os.path.join(test_files_path, lang_dir)
+            for file_name in sorted(os.listdir(lang_path)):
+                file_path = os.path.join(lang_path, file_name)
+                language = FileAnalyzer.detectLang(None, file_path)
+                if language != FileTypeEnum.UNDEFINED:
+                    self.tasks.append((file_path, language))
+
+    def test_parallel_matches_serial(self):
+        # Parallel analysis must return the same classes, in the same order, as a serial run
+        serial_results = FileAnalyzer(workers=1, use_cache=False).analyze_files(
+            self.tasks
+        )
+        parallel_results = FileAnalyzer(workers=2, use_cache=False).analyze_files(
+            self.tasks
+        )
+        self.assertEqual(len(serial_results), len(self.tasks))
+        self.assertEqual(serial_results, parallel_results)
+
+    def test_analyze_files_accepts_lazy_tasks(self):
+        fileAnalyzer = FileAnalyzer(workers=2, use_cache=False)
+        eager_results = fileAnalyzer.analyze_files(self.tasks)
+        lazy_results = fileAnalyzer.analyze_files(task for task in self.tasks)
+        self.assertEqual(eager_results, lazy_results)
+
+    def test_iter_source_files(self):
+        test_files_path = os.path.join(os.path.dirname(__file__), "test_files")
+        source_files = list(FileAnalyzer(workers=1).iter_source_files(test_files_path))
+        self.assertEqual(source_files, self.tasks)
+
+    def test_workers_are_not_forked(self):
+        # Jobs run on threads, a forked worker could inherit their locks held
+        self.assertNotEqual(POOL_CONTEXT.get_start_method(), "fork")
+
+    def test_analyze_files_empty(self):
+        self.assertEqual(FileAnalyzer(workers=2, use_cache=False).analyze_files([]), [])
+
+    def test_file_over_budget_is_skipped(self):
+        filePath, language = self.tasks[0]
+        classAnalyzer = FileAnalyzer.get_class_analyzer(language)
+        with mock.patch.object(
+            classAnalyzer, "analyze", side_effect=lambda *args: time.sleep(5)
+        ):
+            start = time.perf_counter()
+            listOfClasses, _, _, skip_reason = analyze_file(filePath, language, 0.2)
+            self.assertLess(time.perf_counter() - start, 2)
+            self.assertIsNone(listOfClasses)
+            self.assertEqual(skip_reason, "timed out after 0.2s")
+
+            fileAnalyzer = FileAnalyzer(workers=1, use_cache=False, file_budget=0.2)
+            results = fileAnalyzer.analyze_files([(filePath, language)])
+        self.assertEqual(results, [[]])
+        self.assertEqual(
+            fileAnalyzer.metrics.summary()["skippedFiles"],
+            [{"path": filePath, "reason": "timed out after 0.2s"}],
+        )
+
+    def test_failing_file_is_skipped_with_reason(self):
+        filePath, language = self.tasks[0]
+        classAnalyzer = FileAnalyzer.get_class_analyzer(language)
+        with mock.patch.object(
+            classAnalyzer, "analyze", side_effect=ValueError("broken")
+        ):
+            listOfClasses, _, _, skip_reason = analyze_file(filePath, language, 1)
+        self.assertIsNone(listOfClasses)
+        self.assertEqual(skip_reason, "error: broken")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import random
+import unittest
+from analyzer.common.AnalyzerHelper import AnalyzerHelper
+from analyzer.common.BraceIndex import BraceIndex
+
+
+class TestBraceIndex(unittest.TestCase):
+    def test_nested_blocks(self):
+        text = "class A { void f() { if (x) { y(); } } }"
+        braceIndex = BraceIndex(text)
+        self.assertEqual(braceIndex.closing(text.index("{")), len(text) - 1)
+        self.assertEqual(braceIndex.block_end(text.index("void")), text.rindex("} }"))
+        self.assertIsNone(braceIndex.closing(0))
+
+    def test_braces_in_literals_are_ignored(self):
+        text = (
+            'class A { String s = "}"; char c = \'{\'; String t = """\n}}\n""";\n'
+            "// }\n/* { */ }"
+        )
+        self.assertEqual(BraceIndex(text).block_end(0), len(text) - 1)
+
+    def test_cpp_raw_and_csharp_verbatim_strings(self):
+        text = 'struct A { auto s = R"x(})x"; }'
+        self.assertEqual(BraceIndex(text).block_end(0), len(text) - 1)
+        text = 'class A { string p = @"C:\\"; }'
+        self.assertEqual(BraceIndex(text).block_end(0), len(text) - 1)
+
+    def test_unclosed_block(self):
+        text = "class A { void f() {"
+        self.assertIsNone(BraceIndex(text).block_end(0))
+        self.assertEqual(AnalyzerHelper().findClassBoundary(text), len(text) - 1)
+
+    def test_start_inside_block_stays_at_its_level(self):
+        text = "{ a } { { c } }"
+        self.assertEqual(BraceIndex(text).block_end(2), text.index("} }"))
+        self.assertIsNone(BraceIndex("{ a } } { b }").block_end(2))
+
+    def test_start_climbs_back_over_several_levels(self):
+        text = "{ { a } } { { { c } } }"
+        self.assertEqual(BraceIndex(text).block_end(4), text.index("} } }"))
+
+    def test_block_end_matches_a_brace_count(self):
+        def counted_block_end(text, start):
+            # The character walk the index replaces
+            count = 0
+            for index in range(start, len(text)):
+                if text[index] == "}":
+                    count -= 1
+                    if count == 0:
+                        return index
+                elif text[index] == "{":
+                    count += 1
+            return None
+
+        rng = random.Random(0)
+        for _ in range(200):
+            text = "".join(rng.choice("{{}} x") for _ in range(rng.randint(0, 40)))
+            braceIndex = BraceIndex(text)
+            for start in range(len(text) + 1):
+                self.assertEqual(
+                    braceIndex.block_end(start),
+                    counted_block_end(text, start),
+                    f"{text!r} from {start}",
+                )
+
+    def test_find_class_boundary_offset(self):
+        text = "x = 1; class A { int b; }"
+        start = text.index("class")
+        self.assertEqual(
+            AnalyzerHelper().findClassBoundary(text, start), len(text) - 1 - start
+        )
+
+    def test_index_is_shared(self):
+        text = "class A { }"
+        self.assertIs(BraceIndex.of(text), BraceIndex.of(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from analyzer.common.CommentAnalyzer import CommentAnalyzer
+from model.AnalyzerEntities import FileTypeEnum
+
+
+class TestCommentAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = CommentAnalyzer()
+
+    def clean(self, content, lang=FileTypeEnum.JAVA):
+        return self.analyzer.remove_comments(content, lang)
+
+    def test_removes_line_and_block_comments(self):
+        content = "int a; // trailing\n/* block\n comment */int b;"
+        self.assertEqual(self.clean(content), "int a; \nint b;")
+
+    def test_keeps_comment_markers_inside_strings(self):
+        content = 'String url = "http://host/*path*/"; // comment'
+        self.assertEqual(self.clean(content), 'String url = "http://host/*path*/"; ')
+
+    def test_quotes_inside_comments_do_not_shift_strings(self):
+        content = '// say "hi"\nString a = "a";\nString b = "b";'
+        self.assertEqual(self.clean(content), '\nString a = "a";\nString b = "b";')
+
+    def test_char_literal_quote(self):
+        content = 'char q = \'"\'; // "\nString s = "//";'
+        self.assertEqual(self.clean(content), 'char q = \'"\'; \nString s = "//";')
+
+    def test_placeholder_text_in_source_is_kept(self):
+        content = 'String a = "x"; String ___STRING___ = "y"; // z'
+        self.assertEqual(
+            self.clean(content), 'String a = "x"; String ___STRING___ = "y"; '
+        )
+
+    def test_unclosed_block_comment_runs_to_end_of_file(self):
+        self.assertEqual(self.clean("int a; /* open\nint b;"), "int a; ")
+
+    def test_unclosed_string_runs_to_end_of_line(self):
+        content = 'String a = "open // kept\nint b; // removed'
+        self.assertEqual(self.clean(content), 'String a = "open // kept\nint b; ')
+
+    def test_java_text_block(self):
+        content = 'String s = """\n  // not a comment\n  """; // comment'
+        self.assertEqual(
+            self.clean(content), 'String s = """\n  // not a comment\n  """; '
+        )
+
+    def test_kotlin_nested_block_comment(self):
+        content = "/* outer /* inner */ still outer */ val x = 1"
+        self.assertEqual(self.clean(content, FileTypeEnum.KOTLIN), " val x = 1")
+
+    def test_csharp_verbatim_string(self):
+        content = 'var path = @"C:\\dir\\""quoted"" // no"; // comment'
+        self.assertEqual(
+            self.clean(content, FileTypeEnum.CSHARP),
+            'var path = @"C:\\dir\\""quoted"" // no"; ',
+        )
+
+    def test_cpp_raw_string_and_digit_separators(self):
+        content = "auto s = R\"sql(/* keep */)sql\"; int n = 1'000'000; // c"
+        self.assertEqual(
+            self.clean(content, FileTypeEnum.CPP),
+            "auto s = R\"sql(/* keep */)sql\"; int n = 1'000'000; ",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
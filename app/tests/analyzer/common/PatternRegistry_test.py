@@ -0,0 +1,35 @@
+import unittest
+import re
+from analyzer.common.PatternRegistry import PatternRegistry
+from analyzer.java.JavaClassAnalyzer import JavaClassAnalyzer
+from analyzer.java.JavaMethodAnalyzer import JavaMethodAnalyzer
+
+
+class TestPatternRegistry(unittest.TestCase):
+    def test_compile_is_shared(self):
+        first = PatternRegistry.compile(r"class\s+(\w+)", re.MULTILINE)
+        second = PatternRegistry.compile(r"class\s+(\w+)", re.MULTILINE)
+        self.assertIs(first, second)
+        self.assertIsNot(first, PatternRegistry.compile(r"class\s+(\w+)"))
+        self.assertIs(PatternRegistry.compile(first), first)
+
+    def test_helpers_match_re(self):
+        text = "class A {}\nclass B {}"
+        self.assertEqual(
+            PatternRegistry.search(r"^class (\w)", text, re.MULTILINE).group(1), "A"
+        )
+        self.assertEqual(PatternRegistry.findall(r"class (\w)", text), ["A", "B"])
+        self.assertEqual(
+            PatternRegistry.sub(r"class", "struct", text, count=1),
+            "struct A {}\nclass B {}",
+        )
+        self.assertIsNone(PatternRegistry.match(r"B", text))
+
+    def test_analyzer_instances_are_shared(self):
+        self.assertIs(JavaClassAnalyzer.instance(), JavaClassAnalyzer.instance())
+        self.assertIsInstance(JavaMethodAnalyzer.instance(), JavaMethodAnalyzer)
+        self.assertIsNot(JavaClassAnalyzer.instance(), JavaMethodAnalyzer.instance())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+from benchmark.PatternScalingBenchmark import cases
+from utils.TimeBudget import TimeBudget, AnalysisTimeout
+
+# Repetitions of each fragment: a linear scan of the input takes well under a second,
+# a quadratic one minutes
+REPEAT = 3000
+# Seconds each scan may take, far above what a linear scan needs on a loaded machine
+SCAN_BUDGET = 20
+
+
+class TestPatternScaling(unittest.TestCase):
+    """The analyzer regexes must finish on inputs known to make such patterns
+    backtrack, and on seeded random fragments.
+
+    Only the budget is asserted, not timings; benchmark/PatternScalingBenchmark.py
+    measures how the time grows with the input.
+    """
+
+    @unittest.skipUnless(TimeBudget.available(), "SIGALRM timers are not available")
+    def test_patterns_finish_on_large_inputs(self):
+        for name, scan, fragment in cases():
+            with self.subTest(name=name, fragment=fragment):
+                try:
+                    with TimeBudget(SCAN_BUDGET):
+                        scan(fragment * REPEAT)
+                except AnalysisTimeout:
+                    self.fail(
+                        f"{name} on {fragment!r} * {REPEAT} did not finish "
+                        f"within {SCAN_BUDGET}s"
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
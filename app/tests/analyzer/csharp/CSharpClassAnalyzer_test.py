@@ -0,0 +1,80 @@
+import unittest
+from analyzer.csharp.CSharpClassAnalyzer import *
+from model.AnalyzerEntities import FileTypeEnum
+
+MULTI_CLASS_FILE = """
+namespace Shop.Orders
+{
+    public class Order : IEntity
+    {
+        private int id;
+    }
+
+    internal sealed class OrderLine
+    {
+        public Order Owner;
+    }
+
+    public interface IOrderRepository
+    {
+        Order Find(int id);
+    }
+
+    class OrderService
+    {
+        private IOrderRepository repository;
+
+        private class Cache
+        {
+            private int size;
+        }
+    }
+}
+"""
+
+
+class TestCSharpClassAnalyzer(unittest.TestCase):
+    def analyze(self, inputStr):
+        return CSharpClassAnalyzer().analyze(None, FileTypeEnum.CSHARP, inputStr)
+
+    def test_find_class_pattern_csharp(self):
+        # Check if the class pattern is found correctly in a C# input string
+        classAnalyzer = CSharpClassAnalyzer()
+        inputStr = "internal sealed class TestClass : Base {"
+        for pattern in classAnalyzer.pattern:
+            match = classAnalyzer.find_class_pattern(pattern, inputStr)
+            self.assertEqual(inputStr[match.start() : match.end()], inputStr)
+
+    def test_every_class_of_a_file_is_found(self):
+        # Each class of a file with several ones is a node of its own, a class
+        # right after the end of another one is not skipped
+        listOfClasses = self.analyze(MULTI_CLASS_FILE)
+        self.assertEqual(
+            [classInfo.name for classInfo in listOfClasses],
+            ["Order", "OrderLine", "IOrderRepository", "OrderService"],
+        )
+        self.assertEqual(
+            [classInfo.isInterface for classInfo in listOfClasses],
+            [False, False, True, False],
+        )
+        # Each body ends at its own closing brace
+        self.assertEqual(
+            [[v.name for v in classInfo.variables] for classInfo in listOfClasses[:3]],
+            [["id"], ["Owner"], []],
+        )
+
+    def test_nested_classes_stay_in_their_class(self):
+        listOfClasses = self.analyze(MULTI_CLASS_FILE)
+        self.assertEqual(
+            {c.name: [n.name for n in c.classes] for c in listOfClasses},
+            {
+                "Order": [],
+                "OrderLine": [],
+                "IOrderRepository": [],
+                "OrderService": ["Cache"],
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -61,3 +61,40 @@ class TestJavaClassAnalyzer(unittest.TestCase):
         inputStr = "public class TestClass extends AbstractTestClass2 implements SuperTestClass{"
         className = classAnalyzer.extract_class_name(inputStr)
         self.assertEqual(className, "TestClass")
+
+    def test_nested_class_members_belong_to_innermost_class(self):
+        # Members of nested classes are not reported on the enclosing classes
+        classAnalyzer = JavaClassAnalyzer()
+        inputStr = """public class Outer {
+    private int a;
+    public void f() {
+    }
+    static class Inner {
+        private String b;
+        public void g() {
+        }
+        class Deep {
+            private long c;
+        }
+    }
+    private int z;
+}
+"""
+        outer = classAnalyzer.analyze(None, FileTypeEnum.JAVA, inputStr)[0]
+        inner = outer.classes[0]
+        deep = inner.classes[0]
+        self.assertEqual([m.name for m in outer.methods], ["f"])
+        self.assertEqual([v.name for v in outer.variables], ["a", "z"])
+        self.assertEqual([m.name for m in inner.methods], ["g"])
+        self.assertEqual([v.name for v in inner.variables], ["b"])
+        self.assertEqual(deep.name, "Deep")
+        self.assertEqual([v.name for v in deep.variables], ["c"])
+
+    def test_empty_class_body(self):
+        # An empty body is analyzed as is instead of falling back to reading a file
+        classAnalyzer = JavaClassAnalyzer()
+        classes = classAnalyzer.analyze(
+            None, FileTypeEnum.JAVA, "public class Empty {}"
+        )
+        self.assertEqual(classes[0].name, "Empty")
+        self.assertEqual(classes[0].methods, [])
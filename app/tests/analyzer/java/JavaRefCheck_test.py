@@ -6,6 +6,7 @@ import tempfile
 import shutil
 from drawer.DataGenerator import DataGenerator
 from drawer.ClassUmlDrawer import ClassUmlDrawer
+from results.ResultIndex import ResultIndex
 import importlib
 
 
@@ -74,14 +75,16 @@ class TestJavaRefCheck(unittest.TestCase):
         file_analyzer.analyze(self.test_java_path)
 
         # Find the most recently generated files
-        json_files = [f for f in os.listdir(self.temp_dir) if f.endswith(".json")]
+        json_files = [f for f in os.listdir(self.temp_dir) if ResultIndex.is_result(f)]
         puml_files = [f for f in os.listdir(self.temp_dir) if f.endswith(".puml")]
 
         # If no files were found in temp dir, check the default output directory
         if not json_files or not puml_files:
             output_dir = os.path.join(os.getcwd(), "static", "out")
             if os.path.exists(output_dir):
-                json_files = [f for f in os.listdir(output_dir) if f.endswith(".json")]
+                json_files = [
+                    f for f in os.listdir(output_dir) if ResultIndex.is_result(f)
+                ]
                 puml_files = [f for f in os.listdir(output_dir) if f.endswith(".puml")]
 
                 # Use most recent files
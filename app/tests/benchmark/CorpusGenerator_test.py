@@ -0,0 +1,53 @@
+import unittest
+import os
+import shutil
+import tempfile
+from benchmark.CorpusGenerator import CorpusGenerator
+from FileAnalyzer import FileAnalyzer
+from model.AnalyzerEntities import FileTypeEnum
+from utils.SourceFile import SourceFile
+
+
+class TestCorpusGenerator(unittest.TestCase):
+    def test_same_arguments_give_same_files(self):
+        first = CorpusGenerator(FileTypeEnum.JAVA, files=3, seed=4)
+        second = CorpusGenerator(FileTypeEnum.JAVA, files=3, seed=4)
+        other = CorpusGenerator(FileTypeEnum.JAVA, files=3, seed=5)
+        self.assertEqual(first.generate_file(2), second.generate_file(2))
+        self.assertNotEqual(first.generate_file(2), other.generate_file(2))
+
+    def test_nesting_and_literal_density(self):
+        flat = CorpusGenerator(FileTypeEnum.CPP, nesting=0, literal_density=0)
+        nested = CorpusGenerator(FileTypeEnum.CPP, nesting=5, literal_density=1)
+        self.assertNotIn("if (", flat.generate_file(0))
+        self.assertNotIn("not a comment", flat.generate_file(0))
+        content = nested.generate_file(0)
+        self.assertIn(" " * 4 * 6 + "if (value > 4) {", content)
+        self.assertIn("not a comment", content)
+
+    def test_analyzers_find_generated_classes(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            for language in (FileTypeEnum.JAVA, FileTypeEnum.CPP):
+                corpusGenerator = CorpusGenerator(
+                    language, files=12, classes_per_file=2, literal_density=0.5
+                )
+                folder = os.path.join(temp_dir, language.name)
+                self.assertGreater(corpusGenerator.write(folder), 0)
+                names = []
+                for file_index in range(corpusGenerator.files):
+                    path = os.path.join(folder, corpusGenerator.file_name(file_index))
+                    listOfClasses = FileAnalyzer.get_class_analyzer(language).analyze(
+                        SourceFile.read(path), language
+                    )
+                    names.extend(node.name for node in listOfClasses)
+                self.assertEqual(
+                    sorted(names),
+                    sorted(f"Type{i}" for i in range(corpusGenerator.class_count())),
+                )
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
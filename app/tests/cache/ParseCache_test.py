@@ -0,0 +1,113 @@
+import unittest
+import os
+import shutil
+import tempfile
+import cache.ParseCache as ParseCacheModule
+from cache.ParseCache import ParseCache
+from model.AnalyzerEntities import ClassNode, FileTypeEnum
+from utils.SourceFile import SourceFile
+from utils.SystemUtility import FileInfo
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_folder = os.path.join(self.temp_dir, ".cache")
+        self.source_path = os.path.join(self.temp_dir, "Sample.java")
+        with open(self.source_path, "w") as f:
+            f.write("public class Sample {}\n")
+        self.classes = [ClassNode(package="com.sample", name="Sample")]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def store_sample(self):
+        parseCache = ParseCache(self.cache_folder)
+        parseCache.store(self.source_path, FileTypeEnum.JAVA, self.classes)
+        parseCache.close()
+
+    def test_lookup_miss_then_hit(self):
+        parseCache = ParseCache(self.cache_folder)
+        self.assertIsNone(parseCache.lookup(self.source_path, FileTypeEnum.JAVA))
+        parseCache.close()
+
+        self.store_sample()
+        parseCache = ParseCache(self.cache_folder)
+        self.assertEqual(
+            parseCache.lookup(self.source_path, FileTypeEnum.JAVA), self.classes
+        )
+        self.assertEqual((parseCache.hits, parseCache.misses), (1, 0))
+        parseCache.close()
+
+    def test_language_is_part_of_key(self):
+        self.store_sample()
+        parseCache = ParseCache(self.cache_folder)
+        self.assertIsNone(parseCache.lookup(self.source_path, FileTypeEnum.KOTLIN))
+        parseCache.close()
+
+    def test_touched_file_with_same_content_is_reused(self):
+        self.store_sample()
+        stat = os.stat(self.source_path)
+        os.utime(self.source_path, (stat.st_atime, stat.st_mtime + 10))
+        parseCache = ParseCache(self.cache_folder)
+        self.assertEqual(
+            parseCache.lookup(self.source_path, FileTypeEnum.JAVA), self.classes
+        )
+        parseCache.close()
+
+    def test_changed_file_is_a_miss(self):
+        self.store_sample()
+        stat = os.stat(self.source_path)
+        with open(self.source_path, "w") as f:
+            f.write("public class Other {}\n")
+        os.utime(self.source_path, (stat.st_atime, stat.st_mtime + 10))
+        parseCache = ParseCache(self.cache_folder)
+        self.assertIsNone(parseCache.lookup(self.source_path, FileTypeEnum.JAVA))
+        parseCache.close()
+
+    def test_open_caches_do_not_lock_each_other(self):
+        first = ParseCache(self.cache_folder)
+        second = ParseCache(self.cache_folder)
+        try:
+            first.store(self.source_path, FileTypeEnum.JAVA, self.classes)
+            # A second run stores while the first one is still open
+            second.connection.execute("PRAGMA busy_timeout = 0")
+            second.store(self.source_path, FileTypeEnum.KOTLIN, self.classes)
+            self.assertEqual(
+                second.lookup(self.source_path, FileTypeEnum.JAVA), self.classes
+            )
+        finally:
+            first.close()
+            second.close()
+
+    def test_file_changed_after_reading_is_analyzed_again(self):
+        source = SourceFile.read(self.source_path)
+        with open(self.source_path, "w") as f:
+            f.write("public class Changed { int value; }\n")
+        stat = os.stat(self.source_path)
+        os.utime(self.source_path, (stat.st_atime, source.mtime + 10))
+        parseCache = ParseCache(self.cache_folder)
+        file_info = FileInfo(
+            name=self.source_path,
+            size=source.size,
+            last_modifies=source.mtime,
+            md5=source.md5,
+        )
+        parseCache.store(self.source_path, FileTypeEnum.JAVA, self.classes, file_info)
+        self.assertIsNone(parseCache.lookup(self.source_path, FileTypeEnum.JAVA))
+        parseCache.close()
+
+    def test_version_change_clears_cache(self):
+        self.store_sample()
+        original_version = ParseCacheModule.CACHE_VERSION
+        ParseCacheModule.CACHE_VERSION = original_version + "-next"
+        try:
+            parseCache = ParseCache(self.cache_folder)
+            self.assertIsNone(parseCache.lookup(self.source_path, FileTypeEnum.JAVA))
+            parseCache.close()
+        finally:
+            ParseCacheModule.CACHE_VERSION = original_version
+
+
+if __name__ == "__main__":
+    unittest.main()
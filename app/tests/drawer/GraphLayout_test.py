@@ -0,0 +1,72 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from drawer.GraphLayout import GraphLayout
+from model.DataGeneratorEntities import ClassData
+from model.GraphStore import GraphStore
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@unittest.skipUnless(GraphLayout.available(), "numpy is not installed")
+class TestGraphLayout(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.node_count = 1500
+        self.sources = rng.integers(0, self.node_count, 3000)
+        self.targets = (self.sources + rng.integers(1, 20, 3000)) % self.node_count
+
+    def test_layout_is_finite_and_deterministic(self):
+        first = GraphLayout(self.node_count, self.sources, self.targets).layout()
+        second = GraphLayout(self.node_count, self.sources, self.targets).layout()
+        self.assertEqual(first.shape, (self.node_count, 3))
+        self.assertTrue(np.isfinite(first).all())
+        np.testing.assert_array_equal(first, second)
+        np.testing.assert_allclose(first.mean(axis=0), 0, atol=1e-6)
+
+    def test_linked_nodes_are_closer_than_random_pairs(self):
+        positions = GraphLayout(self.node_count, self.sources, self.targets).layout()
+        linked = np.linalg.norm(
+            positions[self.sources] - positions[self.targets], axis=1
+        )
+        rng = np.random.default_rng(5)
+        pairs = rng.integers(0, self.node_count, (2, 3000))
+        random = np.linalg.norm(positions[pairs[0]] - positions[pairs[1]], axis=1)
+        self.assertLess(np.median(linked) * 4, np.median(random))
+
+    def test_unconnected_and_empty_graphs(self):
+        self.assertEqual(GraphLayout(0, [], []).layout().shape, (0, 3))
+        positions = GraphLayout(200, [], []).layout()
+        self.assertEqual(positions.shape, (200, 3))
+        self.assertEqual(len(np.unique(positions.round(3), axis=0)), 200)
+
+    def test_of_store_and_write(self):
+        graphStore = GraphStore()
+        graphStore.add_node(ClassData(id="a.A"))
+        graphStore.add_node(ClassData(id="a.B"))
+        graphStore.add_link("a.A", "a.B", "depended")
+        # Never written, the link is left out of the layout
+        graphStore.add_link("a.A", "", "depended")
+        graphLayout, ids = GraphLayout.of_store(graphStore)
+        self.assertEqual(ids, ["a.A", "a.B"])
+        self.assertEqual(len(graphLayout.sources), 1)
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, "result.pos.json")
+            GraphLayout.write(path, ids, graphLayout.layout())
+            with open(path) as f:
+                positions = json.load(f)
+            self.assertEqual(set(positions), {"a.A", "a.B"})
+            self.assertEqual(set(positions["a.A"]), {"x", "y", "z"})
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from drawer.PlantUmlRenderer import PlantUmlRenderer
+
+# Stands in for "java -jar plantuml.jar": answers each diagram read from stdin with
+# "IMAGE <first line>" followed by the pipe delimiter, like PlantUML's -pipe mode;
+# with --hang it never answers, until its stdin is closed
+FAKE_PLANTUML = """
+import sys
+args = sys.argv[1:]
+delimiter = args[args.index("-pipedelimitor") + 1] if "-pipedelimitor" in args else None
+if "--crash" in args and delimiter:
+    sys.exit(1)
+lines = []
+for line in sys.stdin.buffer:
+    lines.append(line)
+    if line.strip() == b"@enduml" and "--hang" not in args:
+        sys.stdout.buffer.write(b"IMAGE " + lines[1].strip())
+        if delimiter:
+            sys.stdout.buffer.write(delimiter.encode() + b"\\n")
+        sys.stdout.buffer.flush()
+        lines = []
+"""
+
+
+class TestPlantUmlRenderer(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.puml_paths = []
+        for index in range(3):
+            puml_path = Path(self.temp_dir.name) / f"diagram{index}.puml"
+            puml_path.write_text(f"@startuml\nclass C{index}\n@enduml")
+            self.puml_paths.append(puml_path)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_renderer(self, *args):
+        return PlantUmlRenderer(
+            [sys.executable, "-c", FAKE_PLANTUML, *args], timeout=10
+        )
+
+    def test_renders_queued_diagrams_with_one_process(self):
+        renderer = self.make_renderer()
+        futures = [renderer.render(path) for path in self.puml_paths]
+        outputs = [future.result(timeout=10) for future in futures]
+        process = renderer.process
+        renderer.shutdown()
+
+        self.assertIsNotNone(process)
+        for index, output in enumerate(outputs):
+            self.assertEqual(output, self.puml_paths[index].with_suffix(".png"))
+            self.assertEqual(output.read_bytes(), f"IMAGE class C{index}".encode())
+
+    def test_falls_back_to_single_run_when_pipe_fails(self):
+        renderer = self.make_renderer("--crash")
+        output = renderer.render(self.puml_paths[0]).result(timeout=10)
+        renderer.shutdown()
+        self.assertEqual(output.read_bytes(), b"IMAGE class C0")
+
+    def test_shutdown_cancels_queued_diagrams(self):
+        renderer = self.make_renderer("--hang")
+        futures = [renderer.render(path) for path in self.puml_paths]
+        while not futures[0].running():
+            time.sleep(0.01)
+        start = time.monotonic()
+        renderer.shutdown(cancel_futures=True, timeout=0.5)
+        self.assertLess(time.monotonic() - start, 5)
+        # The running diagram fails once PlantUML is stopped, it is not retried
+        with self.assertRaises(OSError):
+            futures[0].result(timeout=5)
+        self.assertTrue(all(future.cancelled() for future in futures[1:]))
+
+    def test_missing_command_sets_exception(self):
+        renderer = PlantUmlRenderer([os.path.join(self.temp_dir.name, "missing")])
+        with self.assertRaises(OSError):
+            renderer.render(self.puml_paths[0]).result(timeout=10)
+        renderer.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from drawer.SymbolResolver import SymbolResolver
+from model.AnalyzerEntities import (
+    ClassNode,
+    FileTypeEnum,
+    Inheritance,
+    InheritanceEnum,
+)
+
+
+class TestSymbolResolver(unittest.TestCase):
+    def setUp(self):
+        self.order = ClassNode(package="com.shop", name="Order")
+        self.order.relations.append(Inheritance("Customer", InheritanceEnum.DEPENDED))
+        self.order.relations.append(Inheritance("String", InheritanceEnum.DEPENDED))
+        self.order.relations.append(Inheritance("Entity", InheritanceEnum.EXTENDED))
+        self.customer = ClassNode(package="com.shop.model", name="Customer")
+        self.resolver = SymbolResolver([self.order, self.customer], FileTypeEnum.JAVA)
+
+    def test_relations_are_resolved_against_known_classes(self):
+        targets = [
+            (relation.relationship, target)
+            for relation, target in self.resolver.relations_of(self.order)
+        ]
+        self.assertEqual(
+            targets,
+            [
+                (InheritanceEnum.DEPENDED, "com.shop.model.Customer"),
+                (InheritanceEnum.EXTENDED, "com.shop.Entity"),
+            ],
+        )
+
+    def test_each_type_is_resolved_once(self):
+        self.resolver.relations_of(self.order)
+        self.assertIs(
+            self.resolver.relations_of(self.order),
+            self.resolver.relations_of(self.order),
+        )
+        self.assertEqual(
+            set(self.resolver.resolved_targets),
+            {
+                ("Customer", "com.shop", FileTypeEnum.JAVA),
+                ("String", "com.shop", FileTypeEnum.JAVA),
+                ("Entity", "com.shop", FileTypeEnum.JAVA),
+            },
+        )
+
+    def test_cpp_qualified_names(self):
+        node = ClassNode(package="engine", name="Buffer", params=["T"])
+        node.relations.append(Inheritance("std::Allocator*", InheritanceEnum.DEPENDED))
+        resolver = SymbolResolver([node], FileTypeEnum.CPP)
+        self.assertEqual(resolver.get_qualified_name(node), "engine::Buffer<T>")
+        self.assertEqual(resolver.relations_of(node)[0][1], "Allocator")
+
+    def test_partitions_keep_their_language_and_cross_language_edges(self):
+        service = ClassNode(package="com.shop", name="Service")
+        service.relations.append(Inheritance("Repository", InheritanceEnum.DEPENDED))
+        engine = ClassNode(package="native", name="Engine")
+        engine.relations.append(Inheritance("Service", InheritanceEnum.DEPENDED))
+        repository = ClassNode(package="com.shop.data", name="Repository")
+        resolver = SymbolResolver.partitioned(
+            {
+                FileTypeEnum.JAVA: [service, self.order],
+                FileTypeEnum.CPP: [engine],
+                FileTypeEnum.KOTLIN: [repository],
+            }
+        )
+        self.assertEqual(resolver.language, FileTypeEnum.JAVA)
+        self.assertEqual(resolver.get_qualified_name(service), "com.shop.Service")
+        self.assertEqual(resolver.get_qualified_name(engine), "native::Engine")
+        self.assertEqual(
+            [target for _, target in resolver.relations_of(service)],
+            ["com.shop.data::Repository"],
+        )
+        self.assertEqual(
+            [target for _, target in resolver.relations_of(engine)],
+            ["com.shop.Service"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from drawer.TypeFilter import TypeFilter
+from drawer.ClassUmlDrawer import ClassUmlDrawer
+from model.AnalyzerEntities import FileTypeEnum
+
+
+class TestTypeFilter(unittest.TestCase):
+    def test_filter_is_shared_per_language(self):
+        self.assertIs(
+            TypeFilter.of(FileTypeEnum.JAVA), TypeFilter.of(FileTypeEnum.JAVA)
+        )
+        self.assertIsNot(
+            TypeFilter.of(FileTypeEnum.JAVA), TypeFilter.of(FileTypeEnum.CPP)
+        )
+        self.assertIs(
+            ClassUmlDrawer(FileTypeEnum.CPP).typeFilter, TypeFilter.of(FileTypeEnum.CPP)
+        )
+        self.assertIsInstance(TypeFilter.of(FileTypeEnum.CPP).ignoredTypes, frozenset)
+
+    def test_java_types(self):
+        typeFilter = TypeFilter.of(FileTypeEnum.JAVA)
+        self.assertTrue(typeFilter.should_ignore("int"))
+        self.assertTrue(typeFilter.should_ignore("java.lang.String"))
+        self.assertTrue(typeFilter.should_ignore("T"))
+        self.assertFalse(typeFilter.should_ignore("com.sample.Order"))
+        self.assertEqual(typeFilter.clean_type("final String... args"), "String args")
+
+    def test_cpp_types(self):
+        typeFilter = TypeFilter.of(FileTypeEnum.CPP)
+        self.assertTrue(typeFilter.should_ignore("const std::string&"))
+        self.assertFalse(typeFilter.should_ignore("Engine*"))
+        self.assertEqual(typeFilter.clean_type("const Engine *"), "Engine*")
+        self.assertEqual(typeFilter.clean_type("int values[4] = {}"), "int values")
+
+    def test_should_ignore_is_memoized(self):
+        typeFilter = TypeFilter(FileTypeEnum.JAVA)
+        typeFilter.should_ignore("Order")
+        typeFilter.should_ignore("Order")
+        self.assertEqual(typeFilter.should_ignore.cache_info().hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
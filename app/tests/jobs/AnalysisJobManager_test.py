@@ -0,0 +1,79 @@
+import unittest
+import threading
+from jobs.AnalysisJobManager import AnalysisJobManager
+
+
+class FakeAnalyzer:
+    """Reports progress for a few files, waiting on an event before finishing."""
+
+    def __init__(self, progress, release, fail=False):
+        self.progress = progress
+        self.release = release
+        self.fail = fail
+
+    def analyze(self, targetPath):
+        for processed in range(1, 4):
+            self.progress("analyzing", processed, 3)
+        self.release.wait(5)
+        if self.fail:
+            raise ValueError("broken tree")
+        self.progress("generating", 3, 3)
+        return "20250101_000000_project"
+
+
+class TestAnalysisJobManager(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+        self.fail = False
+        self.manager = AnalysisJobManager(
+            lambda progress: FakeAnalyzer(progress, self.release, self.fail)
+        )
+
+    def tearDown(self):
+        self.release.set()
+        self.manager.shutdown()
+
+    def wait_until_finished(self, job):
+        while job["status"] not in ("done", "error"):
+            job = self.manager.wait_for_change(job["id"], job["version"], timeout=5)
+        return job
+
+    def test_progress_is_visible_while_running(self):
+        job = self.manager.submit("/project")
+        self.assertIn(job["status"], ("queued", "running"))
+
+        while job["processed"] < 3:
+            job = self.manager.wait_for_change(job["id"], job["version"], timeout=5)
+        self.assertEqual(job["status"], "running")
+        self.assertEqual(job["phase"], "analyzing")
+        self.assertEqual(job["total"], 3)
+        self.assertIsNotNone(job["eta"])
+
+        self.release.set()
+        job = self.wait_until_finished(job)
+        self.assertEqual(job["status"], "done")
+        self.assertEqual(job["resultFile"], "20250101_000000_project.json")
+        self.assertIsNone(job["eta"])
+
+    def test_failed_analysis_reports_error(self):
+        self.fail = True
+        self.release.set()
+        job = self.wait_until_finished(self.manager.submit("/project"))
+        self.assertEqual(job["status"], "error")
+        self.assertEqual(job["message"], "broken tree")
+
+    def test_jobs_run_concurrently(self):
+        first = self.manager.submit("/first")
+        second = self.manager.submit("/second")
+        for job in (first, second):
+            while job["processed"] < 3:
+                job = self.manager.wait_for_change(job["id"], job["version"], timeout=5)
+            self.assertEqual(job["status"], "running")
+        self.release.set()
+
+    def test_unknown_job(self):
+        self.assertIsNone(self.manager.get("missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import time
+from metrics.RunMetrics import RunMetrics
+
+
+class TestRunMetrics(unittest.TestCase):
+    def test_stages_and_counters_add_up(self):
+        runMetrics = RunMetrics()
+        for _ in range(2):
+            with runMetrics.stage("resolve"):
+                time.sleep(0.001)
+        runMetrics.count("files")
+        runMetrics.count("files", 2)
+        summary = runMetrics.summary()
+        self.assertGreaterEqual(summary["stages"]["resolve"], 0.002)
+        self.assertEqual(summary["counters"], {"files": 3})
+
+    def test_nested_file_stages_are_exclusive(self):
+        RunMetrics.begin_file()
+        with RunMetrics.file_stage("classes"):
+            with RunMetrics.file_stage("comments"):
+                time.sleep(0.02)
+        timings = RunMetrics.end_file()
+        self.assertGreaterEqual(timings["comments"], 0.02)
+        self.assertLess(timings["classes"], 0.01)
+
+        # Outside a file nothing is collected
+        with RunMetrics.file_stage("classes"):
+            pass
+        self.assertEqual(RunMetrics.end_file(), {})
+
+    def test_slowest_files(self):
+        runMetrics = RunMetrics(slowest=2)
+        for index, seconds in enumerate([0.3, 0.1, 0.5, 0.2]):
+            runMetrics.record_file(f"File{index}.java", {"classes": seconds})
+        summary = runMetrics.summary()
+        self.assertEqual(
+            [entry["path"] for entry in summary["slowestFiles"]],
+            ["File2.java", "File0.java"],
+        )
+        self.assertAlmostEqual(summary["fileStages"]["classes"], 1.1)
+
+    def test_skipped_files(self):
+        runMetrics = RunMetrics()
+        runMetrics.skip_file("Slow.java", "timed out after 60s")
+        summary = runMetrics.summary()
+        self.assertEqual(
+            summary["skippedFiles"],
+            [{"path": "Slow.java", "reason": "timed out after 60s"}],
+        )
+        self.assertEqual(summary["counters"]["skippedFiles"], 1)
+
+    def test_write_and_prometheus(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            runMetrics = RunMetrics()
+            runMetrics.add_time("layout", 1.5)
+            runMetrics.count("nodes", 7)
+            path = os.path.join(temp_dir, "result.run.json")
+            runMetrics.write(path)
+            with open(path) as f:
+                self.assertEqual(json.load(f)["stages"], {"layout": 1.5})
+
+            runs = RunMetrics.totals["runs"]
+            layout = RunMetrics.totals["stages"].get("layout", 0)
+            runMetrics.publish()
+            text = RunMetrics.prometheus()
+            self.assertIn(f"kudsight_analysis_runs_total {runs + 1}", text)
+            self.assertIn(
+                f'kudsight_stage_seconds_total{{stage="layout"}} {layout + 1.5:g}',
+                text,
+            )
+            self.assertIn("# TYPE kudsight_last_run_seconds gauge", text)
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
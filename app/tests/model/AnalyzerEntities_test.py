@@ -0,0 +1,44 @@
+import unittest
+import pickle
+from model.AnalyzerEntities import (
+    ClassNode,
+    Inheritance,
+    InheritanceEnum,
+    MethodNode,
+    VariableNode,
+)
+
+
+class TestAnalyzerEntities(unittest.TestCase):
+    def make_class(self, index):
+        classInfo = ClassNode(package="".join(["com.", "sample"]), name=f"C{index}")
+        classInfo.methods.append(
+            MethodNode(name="run", dataType="".join(["Str", "ing"]), params=["int"])
+        )
+        classInfo.variables.append(VariableNode(name="count", dataType="int"))
+        classInfo.relations.append(Inheritance("Base", InheritanceEnum.EXTENDED))
+        classInfo.classes.append(ClassNode(name="Inner"))
+        return classInfo
+
+    def test_models_have_no_instance_dict(self):
+        for model in (ClassNode(), MethodNode(), VariableNode()):
+            self.assertFalse(hasattr(model, "__dict__"))
+        with self.assertRaises(AttributeError):
+            ClassNode().undeclared = True
+
+    def test_compact_interns_strings_and_freezes_lists(self):
+        first = self.make_class(1).compact()
+        second = self.make_class(2).compact()
+        self.assertIs(first.package, second.package)
+        self.assertIs(first.methods[0].dataType, second.methods[0].dataType)
+        self.assertEqual(first.methods[0].params, ("int",))
+        self.assertIsInstance(first.methods, tuple)
+        self.assertIsInstance(first.classes[0].methods, tuple)
+
+    def test_compacted_class_survives_pickling(self):
+        classInfo = self.make_class(1).compact()
+        self.assertEqual(pickle.loads(pickle.dumps(classInfo)), classInfo)
+
+
+if __name__ == "__main__":
+    unittest.main()
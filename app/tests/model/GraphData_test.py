@@ -0,0 +1,41 @@
+import unittest
+import io
+import json
+from model.DataGeneratorEntities import ClassData, Dependency, GraphData
+
+
+class TestGraphData(unittest.TestCase):
+    def setUp(self):
+        self.graphData = GraphData()
+        self.graphData.analysisSourcePath = "/tmp/src"
+        self.graphData.nodes = [
+            ClassData(package="b", id="b.Zeta", methods=["run()"]),
+            ClassData(package="a", id="a.Älpha", attributes=["int count"]),
+        ]
+        self.graphData.links = [
+            Dependency(source="b.Zeta", target="a.Älpha", relation="extends"),
+            Dependency(source="a.Älpha", target="b.Zeta", relation="depends"),
+        ]
+
+    def test_write_json_matches_to_json(self):
+        output = io.StringIO()
+        self.graphData.write_json(output)
+        self.assertEqual(output.getvalue(), self.graphData.to_json())
+
+    def test_write_json_empty_graph(self):
+        graphData = GraphData()
+        output = io.StringIO()
+        graphData.write_json(output)
+        self.assertEqual(output.getvalue(), graphData.to_json())
+
+    def test_write_json_compact(self):
+        output = io.StringIO()
+        self.graphData.write_json(output, compact=True)
+        self.assertNotIn("\n", output.getvalue())
+        self.assertEqual(
+            json.loads(output.getvalue()), json.loads(self.graphData.to_json())
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
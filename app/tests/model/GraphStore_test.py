@@ -0,0 +1,132 @@
+import unittest
+import io
+import random
+from unittest import mock
+from model.AnalyzerEntities import FileTypeEnum
+from model.DataGeneratorEntities import ClassData, Dependency, GraphData
+from model.GraphStore import GraphStore
+
+RELATIONS = ["extended", "implemented", "depended"]
+
+
+class TestGraphStore(unittest.TestCase):
+    def setUp(self):
+        generator = random.Random(7)
+        self.nodes = [
+            ClassData(
+                package="com.sample", id=f"com.sample.Class{i}", methods=["run()"]
+            )
+            for i in range(40)
+        ]
+        # Targets past the defined classes become blank nodes, some links repeat
+        self.links = [
+            (
+                f"com.sample.Class{generator.randrange(40)}",
+                f"com.sample.Class{generator.randrange(60)}",
+                generator.choice(RELATIONS),
+            )
+            for _ in range(300)
+        ]
+        self.links.append(("com.sample.Class0", "Ref", "depended"))
+        self.links.append(("com.sample.Class0", "", "depended"))
+
+    def graph_data_json(self, compact=False):
+        graphData = GraphData(analysisSourcePath="/tmp/src")
+        graphData._language_context = FileTypeEnum.JAVA
+        graphData.nodes = list(self.nodes) + [ClassData(id=self.nodes[0].id)]
+        graphData.links = [Dependency(*link) for link in self.links]
+        graphData.add_blank_classes()
+        graphData.remove_duplicates()
+        output = io.StringIO()
+        graphData.write_json(output, compact)
+        return output.getvalue()
+
+    def graph_store(self):
+        graphStore = GraphStore(FileTypeEnum.JAVA)
+        graphStore.analysisSourcePath = "/tmp/src"
+        for node in self.nodes + [ClassData(id=self.nodes[0].id)]:
+            graphStore.add_node(node)
+        for link in self.links:
+            graphStore.add_link(*link)
+        graphStore.add_blank_classes()
+        graphStore.remove_duplicates()
+        return graphStore
+
+    def graph_store_json(self, compact=False):
+        output = io.StringIO()
+        self.graph_store().write_json(output, compact)
+        return output.getvalue()
+
+    def test_write_json_matches_graph_data(self):
+        self.assertEqual(self.graph_store_json(), self.graph_data_json())
+        self.assertEqual(self.graph_store_json(True), self.graph_data_json(True))
+
+    def test_write_json_matches_graph_data_without_numpy(self):
+        with mock.patch("model.GraphStore.np", None):
+            self.assertEqual(self.graph_store_json(), self.graph_data_json())
+
+    def test_first_node_of_an_id_is_kept(self):
+        graphStore = self.graph_store()
+        self.assertEqual(graphStore.get_node("com.sample.Class0").methods, ["run()"])
+        self.assertIsNone(graphStore.get_node("com.sample.Missing"))
+
+    def test_blank_node_package_guess(self):
+        graphStore = self.graph_store()
+        self.assertEqual(
+            graphStore.get_node("com.sample.Class59").package, "com.sample"
+        )
+        self.assertEqual(graphStore.get_node("Ref").package, "")
+        # Empty ids are not turned into nodes
+        self.assertIsNone(graphStore.get_node(""))
+
+    def test_blank_node_package_in_the_language_of_the_referencing_class(self):
+        def mixed_store():
+            graphStore = GraphStore(FileTypeEnum.JAVA)
+            graphStore.add_node(ClassData(id="com.app.Main"), FileTypeEnum.JAVA)
+            graphStore.add_node(ClassData(id="engine::Core"), FileTypeEnum.CPP)
+            graphStore.add_node(ClassData(id="ui::Widget"), FileTypeEnum.CSHARP)
+            graphStore.add_link("com.app.Main", "com.app.Config", "depended")
+            graphStore.add_link("engine::Core", "engine::io::Stream", "depended")
+            graphStore.add_link("engine::Core", "std.vector", "depended")
+            graphStore.add_link("ui::Widget", "ui::Theme", "depended")
+            # The first class that references an id decides its language
+            graphStore.add_link("engine::Core", "gfx::Canvas", "depended")
+            graphStore.add_link("com.app.Main", "gfx::Canvas", "depended")
+            graphStore.add_blank_classes()
+            return graphStore
+
+        expected = {
+            "com.app.Config": "com.app",
+            "engine::io::Stream": "engine::io",
+            "std.vector": "",
+            "ui::Theme": "ui",
+            "gfx::Canvas": "gfx",
+        }
+        for graphStore in [mixed_store(), self.without_numpy(mixed_store)]:
+            for node_id, package in expected.items():
+                self.assertEqual(graphStore.get_node(node_id).package, package)
+
+    @staticmethod
+    def without_numpy(build):
+        with mock.patch("model.GraphStore.np", None):
+            return build()
+
+    def test_remove_duplicates(self):
+        graphStore = self.graph_store()
+        self.assertEqual(graphStore.link_count(), len(set(self.links)))
+        with mock.patch("model.GraphStore.np", None):
+            self.assertEqual(self.graph_store().link_count(), len(set(self.links)))
+
+    def test_to_graph_data(self):
+        graphData = self.graph_store().to_graph_data()
+        self.assertEqual(len(graphData.links), len(set(self.links)))
+        self.assertEqual(graphData.nodes, sorted(graphData.nodes, key=lambda x: x.id))
+
+    def test_empty_graph(self):
+        output = io.StringIO()
+        GraphStore().write_json(output)
+        self.assertEqual(output.getvalue(), GraphData().to_json())
+
+
+if __name__ == "__main__":
+    unittest.main()
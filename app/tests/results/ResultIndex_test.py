@@ -0,0 +1,114 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from contextlib import closing
+import results.ResultIndex as ResultIndexModule
+from results.ResultIndex import ResultIndex
+
+
+class TestResultIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_result(self, filename, sourcePath="/src", nodes=1, links=0):
+        path = os.path.join(self.temp_dir, filename)
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "nodes": [{"id": str(i)} for i in range(nodes)],
+                    "links": [{} for _ in range(links)],
+                    "analysisSourcePath": sourcePath,
+                },
+                f,
+            )
+        return path
+
+    def test_rebuild_indexes_existing_results(self):
+        self.write_result("a_01-01-2025_10-00-00.json", nodes=3, links=2)
+        self.write_result("a_01-01-2025_10-00-00.pos.json")
+        self.write_result("a_01-01-2025_10-00-00.run.json")
+        with open(os.path.join(self.temp_dir, "broken.json"), "w") as f:
+            f.write("{")
+        results, next_cursor = ResultIndex(self.temp_dir, self.cache_dir).list()
+        self.assertIsNone(next_cursor)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["filename"], "a_01-01-2025_10-00-00.json")
+        self.assertEqual((results[0]["nodes"], results[0]["links"]), (3, 2))
+        self.assertEqual(results[0]["sourcePath"], "/src")
+
+    def test_pages_newest_first(self):
+        resultIndex = ResultIndex(self.temp_dir, self.cache_dir)
+        for i in range(7):
+            path = self.write_result(f"r{i}.json")
+            resultIndex.record(path, "/src", 1, 0, createdAt=1000 + i)
+
+        names = []
+        cursor = None
+        while True:
+            results, cursor = resultIndex.list(limit=3, cursor=cursor)
+            names.extend(result["filename"] for result in results)
+            if cursor is None:
+                break
+        self.assertEqual(names, [f"r{i}.json" for i in reversed(range(7))])
+
+    def test_iter_all_reads_every_page(self):
+        resultIndex = ResultIndex(self.temp_dir, self.cache_dir)
+        for i in range(7):
+            path = self.write_result(f"r{i}.json")
+            resultIndex.record(path, "/src", 1, 0, createdAt=1000 + i)
+        max_limit = ResultIndexModule.MAX_LIMIT
+        ResultIndexModule.MAX_LIMIT = 3
+        try:
+            names = [result["filename"] for result in resultIndex.iter_all()]
+        finally:
+            ResultIndexModule.MAX_LIMIT = max_limit
+        self.assertEqual(names, [f"r{i}.json" for i in reversed(range(7))])
+
+    def test_filters(self):
+        resultIndex = ResultIndex(self.temp_dir, self.cache_dir)
+        resultIndex.record(self.write_result("shop.json"), "/work/shop", createdAt=1)
+        resultIndex.record(self.write_result("blog.json"), "/work/blog", createdAt=2)
+        results, _ = resultIndex.list(source="/work/shop")
+        self.assertEqual([r["filename"] for r in results], ["shop.json"])
+        results, _ = resultIndex.list(query="blog")
+        self.assertEqual([r["filename"] for r in results], ["blog.json"])
+
+    def test_record_replaces_entry(self):
+        resultIndex = ResultIndex(self.temp_dir, self.cache_dir)
+        path = self.write_result("r.json")
+        resultIndex.record(path, "/src", 1, 0)
+        resultIndex.record(path, "/src", 5, 4)
+        results, _ = resultIndex.list()
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["nodes"], 5)
+        resultIndex.remove("r.json")
+        self.assertEqual(resultIndex.list(), ([], None))
+
+    def test_deleted_results_are_dropped(self):
+        resultIndex = ResultIndex(self.temp_dir, self.cache_dir)
+        for i in range(5):
+            path = self.write_result(f"r{i}.json")
+            resultIndex.record(path, "/src", 1, 0, createdAt=1000 + i)
+        for i in (4, 3, 1):
+            os.remove(os.path.join(self.temp_dir, f"r{i}.json"))
+        results, next_cursor = resultIndex.list(limit=2)
+        self.assertEqual([r["filename"] for r in results], ["r2.json", "r0.json"])
+        self.assertIsNone(next_cursor)
+        # The entries are gone from the index, not just hidden
+        with closing(resultIndex.connect()) as connection:
+            count = connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        self.assertEqual(count, 2)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            ResultIndex(self.temp_dir, self.cache_dir).list(cursor="nonsense")
+
+
+if __name__ == "__main__":
+    unittest.main()
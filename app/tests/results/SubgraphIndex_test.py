@@ -0,0 +1,111 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+import results.SubgraphIndex as SubgraphIndexModule
+from results.SubgraphIndex import SubgraphIndex
+
+
+def node(node_id, package):
+    return {"package": package, "id": node_id, "type": "class"}
+
+
+def link(source, target, relation):
+    return {"source": source, "target": target, "relation": relation}
+
+
+class TestSubgraphIndex(unittest.TestCase):
+    def setUp(self):
+        self.graph = {
+            "nodes": [
+                node("a.Base", "a"),
+                node("a.Shape", "a"),
+                node("a.b.Circle", "a.b"),
+                node("a.b.Square", "a.b"),
+                node("c.Canvas", "c"),
+                node("c.Window", "c"),
+            ],
+            "links": [
+                link("a.Shape", "a.Base", "extended"),
+                link("a.b.Circle", "a.Shape", "extended"),
+                link("a.b.Square", "a.Shape", "implemented"),
+                link("c.Canvas", "a.b.Circle", "depended"),
+                link("c.Window", "c.Canvas", "depended"),
+                link("c.Window", "c.Missing", "depended"),
+            ],
+            "analysisSourcePath": "/src",
+        }
+        self.subgraphIndex = SubgraphIndex(self.graph)
+
+    def ids(self, result):
+        return sorted(n["id"] for n in result["nodes"])
+
+    def test_neighborhood(self):
+        result = self.subgraphIndex.neighborhood(["c.Canvas"])
+        self.assertEqual(self.ids(result), ["a.b.Circle", "c.Canvas", "c.Window"])
+        self.assertEqual(len(result["links"]), 2)
+        self.assertEqual(result["analysisSourcePath"], "/src")
+        self.assertFalse(result["truncated"])
+
+        result = self.subgraphIndex.neighborhood(["c.Canvas"], depth=2, direction="out")
+        self.assertEqual(self.ids(result), ["a.Shape", "a.b.Circle", "c.Canvas"])
+
+        result = self.subgraphIndex.neighborhood(
+            ["a.Shape"], depth=3, relations=["implemented"]
+        )
+        self.assertEqual(self.ids(result), ["a.Shape", "a.b.Square"])
+
+    def test_hierarchy(self):
+        self.assertEqual(
+            self.ids(self.subgraphIndex.ancestors("a.b.Circle")),
+            ["a.Base", "a.Shape", "a.b.Circle"],
+        )
+        # Dependencies are not part of the hierarchy
+        self.assertEqual(
+            self.ids(self.subgraphIndex.descendants("a.Shape")),
+            ["a.Shape", "a.b.Circle", "a.b.Square"],
+        )
+
+    def test_package(self):
+        self.assertEqual(
+            self.ids(self.subgraphIndex.package("a")), ["a.Base", "a.Shape"]
+        )
+        self.assertEqual(len(self.subgraphIndex.package("a", True)["nodes"]), 4)
+        with self.assertRaises(KeyError):
+            self.subgraphIndex.package("x")
+
+    def test_unknown_class_and_bad_direction(self):
+        with self.assertRaises(KeyError):
+            self.subgraphIndex.neighborhood(["x.Missing"])
+        with self.assertRaises(ValueError):
+            self.subgraphIndex.neighborhood(["a.Base"], direction="up")
+
+    def test_search(self):
+        self.assertEqual(self.subgraphIndex.search("CANVAS"), ["c.Canvas"])
+        self.assertEqual(len(self.subgraphIndex.search("", limit=2)), 2)
+
+    def test_truncated(self):
+        with mock.patch.object(SubgraphIndexModule, "MAX_SUBGRAPH_NODES", 2):
+            result = self.subgraphIndex.neighborhood(["c.Canvas"])
+        self.assertEqual(len(result["nodes"]), 2)
+        self.assertTrue(result["truncated"])
+
+    def test_of_reuses_index_until_file_changes(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(temp_dir, "result.json")
+            with open(path, "w") as f:
+                json.dump(self.graph, f)
+            self.assertIs(SubgraphIndex.of(path), SubgraphIndex.of(path))
+            self.graph["nodes"].append(node("d.New", "d"))
+            with open(path, "w") as f:
+                json.dump(self.graph, f)
+            self.assertIn("d.New", SubgraphIndex.of(path).index)
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
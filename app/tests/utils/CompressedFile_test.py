@@ -0,0 +1,72 @@
+import unittest
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+from utils.CompressedFile import CompressedFile
+
+
+class TestCompressedFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.data = json.dumps({"nodes": [{"id": f"a.Class{i}"} for i in range(200)]})
+        self.path = self.write(self.data.encode())
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, data, name="result.json"):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_precompress_writes_gzip_sibling(self):
+        with mock.patch("utils.CompressedFile.brotli", None):
+            self.assertEqual(CompressedFile.precompress(self.path), ["gzip"])
+        with open(self.path + ".gz", "rb") as f:
+            self.assertEqual(gzip.decompress(f.read()).decode(), self.data)
+        self.assertFalse(os.path.exists(self.path + ".br"))
+
+    def test_small_files_are_not_compressed(self):
+        path = self.write(b"{}", "small.json")
+        self.assertEqual(CompressedFile.precompress(path), [])
+        self.assertFalse(os.path.exists(path + ".gz"))
+
+    def test_negotiate(self):
+        CompressedFile.precompress(self.path)
+        self.assertEqual(
+            CompressedFile.negotiate(self.path, "gzip, deflate"),
+            (self.path + ".gz", "gzip"),
+        )
+        self.assertEqual(CompressedFile.negotiate(self.path, None), (self.path, None))
+        self.assertEqual(
+            CompressedFile.negotiate(self.path, "gzip;q=0, identity"),
+            (self.path, None),
+        )
+
+    def test_stale_sibling_is_not_served(self):
+        CompressedFile.precompress(self.path)
+        stat = os.stat(self.path)
+        os.utime(self.path + ".gz", ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+        self.assertEqual(CompressedFile.negotiate(self.path, "gzip"), (self.path, None))
+
+    def test_accepted_encodings(self):
+        self.assertEqual(
+            CompressedFile.accepted_encodings("gzip;q=0.5, br ; q=0, *"),
+            {"gzip", "*"},
+        )
+
+    def test_etag_follows_content(self):
+        etag = CompressedFile.etag_of(self.path)
+        self.assertEqual(etag, hashlib.md5(self.data.encode()).hexdigest())
+        with open(self.path, "a") as f:
+            f.write(" ")
+        self.assertNotEqual(CompressedFile.etag_of(self.path), etag)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import codecs
+import hashlib
+import os
+import shutil
+import tempfile
+import utils.SourceFile as SourceFileModule
+from utils.SourceFile import SourceFile
+
+
+class TestSourceFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, data, name="Sample.java"):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_utf8_with_crlf_line_endings(self):
+        data = "class Café {\r\n}\r\n".encode("utf-8")
+        source = SourceFile.read(self.write(data))
+        self.assertEqual(source.text, "class Café {\n}\n")
+        self.assertEqual(source.encoding, "utf-8")
+        self.assertEqual(source.md5, hashlib.md5(data).hexdigest())
+
+    def test_bom_is_detected_and_dropped(self):
+        source = SourceFile.read(self.write(codecs.BOM_UTF8 + b"class A {}"))
+        self.assertEqual(source.text, "class A {}")
+        source = SourceFile.read(self.write("class B {}".encode("utf-16")))
+        self.assertEqual(source.text, "class B {}")
+
+    def test_invalid_utf8_falls_back_to_latin1(self):
+        source = SourceFile.read(self.write("// é\n".encode("latin-1")))
+        self.assertEqual(source.encoding, "latin-1")
+        self.assertEqual(source.text, "// é\n")
+
+    def test_large_files_are_mapped(self):
+        path = self.write(b"class A {}\n" * 100)
+        threshold = SourceFileModule.MMAP_THRESHOLD
+        SourceFileModule.MMAP_THRESHOLD = 1
+        try:
+            source = SourceFile.read(path)
+        finally:
+            SourceFileModule.MMAP_THRESHOLD = threshold
+        self.assertEqual(source.text, "class A {}\n" * 100)
+
+    def test_of_reuses_a_read_source(self):
+        source = SourceFile.read(self.write(b"class A {}"))
+        self.assertIs(SourceFile.of(source), source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import os
+import shutil
+import tempfile
+from utils.SystemUtility import IgnoreRules, SystemUtility
+
+
+class TestSystemUtility(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for rel_path in [
+            "src/Main.java",
+            "src/README.md",
+            "src/gen/Generated.java",
+            "src/gen/Keep.java",
+            "lib/Util.cpp",
+            "lib/Util.h",
+            "node_modules/pkg/Index.java",
+            ".git/objects/Blob.java",
+            "build/Out.java",
+            "tmp.log",
+        ]:
+            path = os.path.join(self.temp_dir, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def rel_paths(self, paths):
+        return [os.path.relpath(path, self.temp_dir) for path in paths]
+
+    def test_walk_files_prunes_ignored_dirs_and_filters_extensions(self):
+        files = SystemUtility.walk_files(self.temp_dir, extensions=[".java", ".h"])
+        self.assertEqual(
+            self.rel_paths(files),
+            [
+                "lib/Util.h",
+                "src/Main.java",
+                "src/gen/Generated.java",
+                "src/gen/Keep.java",
+            ],
+        )
+
+    def test_walk_files_keeps_packages_named_like_output_dirs(self):
+        for rel_path in ["src/com/acme/build/Builder.java", "src/target/T.java"]:
+            path = os.path.join(self.temp_dir, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("")
+        files = SystemUtility.walk_files(self.temp_dir, extensions=[".java"])
+        self.assertEqual(
+            self.rel_paths(files),
+            [
+                "src/Main.java",
+                "src/com/acme/build/Builder.java",
+                "src/gen/Generated.java",
+                "src/gen/Keep.java",
+                "src/target/T.java",
+            ],
+        )
+
+    def test_walk_files_applies_gitignore(self):
+        with open(os.path.join(self.temp_dir, ".gitignore"), "w") as f:
+            f.write("# generated sources\n*.log\n/lib/\n")
+        with open(os.path.join(self.temp_dir, "src", ".gitignore"), "w") as f:
+            f.write("gen/*.java\n!gen/Keep.java\n")
+        files = SystemUtility.walk_files(self.temp_dir, extensions=[".java", ".cpp"])
+        self.assertEqual(self.rel_paths(files), ["src/Main.java", "src/gen/Keep.java"])
+
+    def test_walk_files_is_lazy(self):
+        files = SystemUtility.walk_files(self.temp_dir)
+        self.assertFalse(isinstance(files, list))
+        self.assertEqual(self.rel_paths([next(files)]), ["lib/Util.cpp"])
+
+    def test_get_list_of_files(self):
+        files = SystemUtility.get_list_of_files(self.temp_dir, "*.java")
+        self.assertIn("node_modules/pkg/Index.java", self.rel_paths(files))
+        self.assertEqual(len(files), 6)
+
+    def test_ignore_rules_glob_to_regex(self):
+        rules = IgnoreRules(self.temp_dir, ["**/cache/", "docs/**/*.md"])
+        cache_dir = os.path.join(self.temp_dir, "a", "b", "cache")
+        self.assertTrue(rules.match(cache_dir, True))
+        self.assertIsNone(rules.match(cache_dir, False))
+        self.assertTrue(rules.match(os.path.join(self.temp_dir, "docs/x/y.md"), False))
+        self.assertIsNone(rules.match(os.path.join(self.temp_dir, "src/y.md"), False))
+
+
+if __name__ == "__main__":
+    unittest.main()
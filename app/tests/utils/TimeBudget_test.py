@@ -0,0 +1,55 @@
+import unittest
+import re
+import signal
+import threading
+import time
+from utils.TimeBudget import TimeBudget, AnalysisTimeout
+
+
+@unittest.skipUnless(TimeBudget.available(), "needs SIGALRM interval timers")
+class TestTimeBudget(unittest.TestCase):
+    def test_interrupts_backtracking_regex(self):
+        start = time.perf_counter()
+        with self.assertRaises(AnalysisTimeout):
+            with TimeBudget(0.2):
+                re.match(r"(a+)+$", "a" * 40 + "b")
+        self.assertLess(time.perf_counter() - start, 2)
+        # The timer is stopped and the handler restored
+        self.assertEqual(signal.getitimer(signal.ITIMER_REAL), (0.0, 0.0))
+        self.assertNotIsInstance(
+            signal.getsignal(signal.SIGALRM), type(TimeBudget(1).expire)
+        )
+
+    def test_block_within_budget(self):
+        with TimeBudget(5):
+            total = sum(range(1000))
+        self.assertEqual(total, 499500)
+        self.assertEqual(signal.getitimer(signal.ITIMER_REAL), (0.0, 0.0))
+
+    def test_no_budget_never_expires(self):
+        with TimeBudget(None), TimeBudget(0):
+            time.sleep(0.05)
+
+    def test_outer_budget_keeps_running(self):
+        with self.assertRaises(AnalysisTimeout):
+            with TimeBudget(0.3):
+                with TimeBudget(5):
+                    pass
+                time.sleep(2)
+
+    def test_not_enforced_off_main_thread(self):
+        outcome = []
+
+        def work():
+            with TimeBudget(0.05):
+                time.sleep(0.2)
+            outcome.append(TimeBudget.available())
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+        self.assertEqual(outcome, [False])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import sys
+import gzip
+import hashlib
+from functools import lru_cache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Content-Encoding of each precompressed sibling, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Smaller files are not worth a second request header and sibling file
+MIN_SIZE = 1024
+
+
+class CompressedFile:
+    """Precompressed .gz and .br siblings of the result files, and their ETags.
+
+    Result files are written once, so they are compressed once at write time at the
+    highest level instead of on every request. The .br sibling is only written when
+    the brotli package is installed.
+    """
+
+    @staticmethod
+    def precompress(path):
+        """Writes the compressed siblings of path; returns the encodings written."""
+        with open(path, "rb") as f:
+            data = f.read()
+        written = []
+        if len(data) < MIN_SIZE:
+            return written
+        for encoding, suffix in ENCODINGS:
+            compressed = CompressedFile.compress(data, encoding)
+            if compressed is None or len(compressed) >= len(data):
+                continue
+            # Written next to the target and renamed, readers never see a partial file
+            temp_path = f"{path}{suffix}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(temp_path, path + suffix)
+            written.append(encoding)
+        return written
+
+    @staticmethod
+    def compress(data, encoding):
+        if encoding == "gzip":
+            # mtime=0 keeps the output identical for identical content
+            return gzip.compress(data, compresslevel=9, mtime=0)
+        if encoding == "br" and brotli is not None:
+            return brotli.compress(data, quality=11)
+        return None
+
+    @staticmethod
+    def accepted_encodings(accept_encoding):
+        """Returns the encodings an Accept-Encoding header allows (q > 0)."""
+        accepted = set()
+        for part in (accept_encoding or "").split(","):
+            name, _, params = part.strip().partition(";")
+            quality = 1.0
+            params = params.strip().replace(" ", "")
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            if name and quality > 0:
+                accepted.add(name.strip().lower())
+        return accepted
+
+    @staticmethod
+    def negotiate(path, accept_encoding):
+        """Returns (path to send, Content-Encoding or None) for the request."""
+        accepted = CompressedFile.accepted_encodings(accept_encoding)
+        if not accepted:
+            return path, None
+        original_mtime = os.stat(path).st_mtime_ns
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted and "*" not in accepted:
+                continue
+            try:
+                # A sibling older than the file is stale, e.g. after it was rewritten
+                if os.stat(path + suffix).st_mtime_ns >= original_mtime:
+                    return path + suffix, encoding
+            except OSError:
+                continue
+        return path, None
+
+    @staticmethod
+    def etag_of(path):
+        """Returns a strong ETag value derived from the content hash of path."""
+        stat = os.stat(path)
+        return CompressedFile.content_hash(path, stat.st_size, stat.st_mtime_ns)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def content_hash(path, size, mtime_ns):
+        # size and mtime are part of the key so a rewritten file is hashed again
+        md5 = hashlib.md5()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                md5.update(chunk)
+        return md5.hexdigest()
+
+
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        print(path, CompressedFile.precompress(path), CompressedFile.etag_of(path))
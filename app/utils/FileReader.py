@@ -1,4 +1,5 @@
 import sys
+from utils.SourceFile import SourceFile
 
 
 class FileReader:
@@ -7,11 +8,12 @@ class FileReader:
 
     @staticmethod
     def read_file(file_path):
-        return open(file_path).read()
+        """Returns the decoded text of a file path or of an already read SourceFile."""
+        return SourceFile.of(file_path).text
 
     @staticmethod
     def read_file_lines(file_path):
-        return open(file_path).readlines()
+        return SourceFile.read(file_path).text.splitlines(keepends=True)
 
     @staticmethod
     def remove_comments(lines):
@@ -0,0 +1,69 @@
+import os
+import sys
+import codecs
+import hashlib
+import mmap
+
+# Files from this size on are mapped instead of read into a bytes buffer
+MMAP_THRESHOLD = 8 << 20
+
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+class SourceFile:
+    """The content of a source file, read once and shared by the analyzers.
+
+    The bytes are read (or mapped, for large files) and the handle closed right away.
+    The text is decoded with the encoding given by a BOM, else UTF-8, falling back to
+    Latin-1, and line endings are normalized to "\\n" like open() does. size,
+    mtime and md5 describe the bytes that were read: the mtime is taken from the open
+    handle before reading, so a file changed meanwhile looks changed the next time it
+    is checked.
+    """
+
+    def __init__(self, path, data, mtime=None) -> None:
+        self.path = path
+        self.text, self.encoding = SourceFile.decode(data)
+        self.size = len(data)
+        self.mtime = mtime
+        self.md5 = hashlib.md5(data).hexdigest()
+
+    @staticmethod
+    def read(path):
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size < MMAP_THRESHOLD:
+                return SourceFile(path, f.read(), stat.st_mtime)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return SourceFile(path, data, stat.st_mtime)
+
+    @staticmethod
+    def of(source):
+        """Returns source when it already is a SourceFile, else reads the file at source."""
+        return source if isinstance(source, SourceFile) else SourceFile.read(source)
+
+    @staticmethod
+    def decode(data):
+        """Returns the text of data and the encoding it was decoded with."""
+        head = bytes(data[:3])
+        encoding = next((enc for bom, enc in BOMS if head.startswith(bom)), "utf-8")
+        try:
+            text = codecs.decode(data, encoding)
+        except UnicodeDecodeError:
+            encoding = "latin-1"
+            text = codecs.decode(data, encoding)
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text, encoding
+
+    def __str__(self):
+        return self.path
+
+
+if __name__ == "__main__":
+    source = SourceFile.read(sys.argv[1])
+    print(source.path, source.encoding, source.md5, source.size, "bytes")
@@ -1,7 +1,31 @@
+import fnmatch
+import hashlib
 import os
-import subprocess
+import re
 from dataclasses import dataclass
 
+# Directories that never contain sources worth analyzing
+DEFAULT_IGNORED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".idea",
+        ".vs",
+        ".vscode",
+        ".gradle",
+        ".cache",
+        "__pycache__",
+        "node_modules",
+        "venv",
+        ".venv",
+    }
+)
+# Build output directories, only pruned directly under the analyzed folder: deeper
+# down these are also common package names (com/acme/build). Output folders of
+# nested modules are left to their .gitignore files.
+DEFAULT_IGNORED_ROOT_DIRS = frozenset({"build", "target", "bin", "obj"})
+
 
 @dataclass
 class FileInfo:
@@ -12,21 +36,170 @@ class FileInfo:
     md5: str = ""
 
 
+class IgnoreRules:
+    """Matcher for the patterns of a single .gitignore file."""
+
+    def __init__(self, base_path, lines) -> None:
+        self.base_path = base_path
+        self.rules = []
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.strip("/") if dir_only else line
+            # Patterns with an inner or leading slash are relative to the .gitignore
+            anchored = "/" in line.rstrip("/")
+            line = line.lstrip("/")
+            if not line:
+                continue
+            regex = self.glob_to_regex(line)
+            if not anchored:
+                regex = "(?:.*/)?" + regex
+            self.rules.append((re.compile(regex + "$"), negated, dir_only))
+
+    @staticmethod
+    def from_file(gitignore_path):
+        with open(gitignore_path, encoding="utf-8", errors="replace") as f:
+            return IgnoreRules(os.path.dirname(gitignore_path), f.readlines())
+
+    @staticmethod
+    def glob_to_regex(pattern):
+        regex = ""
+        index = 0
+        while index < len(pattern):
+            char = pattern[index]
+            if pattern.startswith("**/", index):
+                regex += "(?:.*/)?"
+                index += 3
+                continue
+            if pattern.startswith("**", index):
+                regex += ".*"
+                index += 2
+                continue
+            if char == "*":
+                regex += "[^/]*"
+            elif char == "?":
+                regex += "[^/]"
+            elif char == "[":
+                end = pattern.find("]", index + 1)
+                if end == -1:
+                    regex += re.escape(char)
+                else:
+                    regex += "[" + pattern[index + 1 : end].replace("!", "^", 1) + "]"
+                    index = end
+            else:
+                regex += re.escape(char)
+            index += 1
+        return regex
+
+    def match(self, path, is_dir):
+        """Returns True/False when a rule decides the path, None when no rule matches."""
+        rel_path = os.path.relpath(path, self.base_path).replace(os.sep, "/")
+        result = None
+        for regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negated
+        return result
+
+
 class SystemUtility:
     def __init__(self) -> None:
         super().__init__()
 
     @staticmethod
     def get_list_of_files(path, pattern):
-        result = subprocess.Popen(
-            ["find", path, "-name", pattern], stdout=subprocess.PIPE
-        ).communicate()[0]
-        result = str(result, encoding="utf-8").split("\n")
-        result = [item for item in result if item]
-        return result
+        return [
+            file_path
+            for file_path in SystemUtility.walk_files(
+                path, ignored_dirs=(), use_gitignore=False, ignored_root_dirs=()
+            )
+            if fnmatch.fnmatch(os.path.basename(file_path), pattern)
+        ]
 
     @staticmethod
-    def get_file_info(path):
+    def walk_files(
+        path,
+        extensions=None,
+        ignored_dirs=DEFAULT_IGNORED_DIRS,
+        use_gitignore=True,
+        ignored_root_dirs=DEFAULT_IGNORED_ROOT_DIRS,
+    ):
+        """Lazily yields files under path in a stable, sorted depth-first order.
+
+        Directories in ignored_dirs (at any depth) or ignored_root_dirs (directly
+        under path) and paths excluded by .gitignore files are pruned without being
+        descended into, and only files ending with one of the given extensions are
+        yielded when extensions is set.
+        """
+        extensions = tuple(extensions) if extensions else None
+        if os.path.isfile(path):
+            if extensions is None or path.endswith(extensions):
+                yield path
+            return
+        yield from SystemUtility._walk_directory(
+            path, extensions, ignored_dirs, use_gitignore, [], ignored_root_dirs
+        )
+
+    @staticmethod
+    def _walk_directory(
+        path, extensions, ignored_dirs, use_gitignore, ignore_rules, ignored_here=()
+    ):
+        try:
+            with os.scandir(path) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError as e:
+            print(f"Warning: Cannot list directory {path}: {e}")
+            return
+
+        if use_gitignore:
+            gitignore_path = os.path.join(path, ".gitignore")
+            if os.path.isfile(gitignore_path):
+                ignore_rules = ignore_rules + [IgnoreRules.from_file(gitignore_path)]
+
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = not is_dir and entry.is_file()
+            except OSError:
+                continue
+            if is_dir and (entry.name in ignored_dirs or entry.name in ignored_here):
+                continue
+            if not is_dir and not is_file:
+                continue
+            if (
+                is_file
+                and extensions is not None
+                and not entry.name.endswith(extensions)
+            ):
+                continue
+            if SystemUtility._is_ignored(entry.path, is_dir, ignore_rules):
+                continue
+
+            if is_dir:
+                yield from SystemUtility._walk_directory(
+                    entry.path, extensions, ignored_dirs, use_gitignore, ignore_rules
+                )
+            else:
+                yield entry.path
+
+    @staticmethod
+    def _is_ignored(path, is_dir, ignore_rules):
+        ignored = False
+        # Later (deeper) .gitignore files override earlier ones
+        for rules in ignore_rules:
+            result = rules.match(path, is_dir)
+            if result is not None:
+                ignored = result
+        return ignored
+
+    @staticmethod
+    def get_file_info(path, with_md5=False):
         if os.path.islink(path):
             return None
         file_info = FileInfo()
@@ -34,8 +207,18 @@ class SystemUtility:
         file_info.size = os.path.getsize(path)
         file_info.last_modifies = os.path.getmtime(path)
         file_info.created = os.path.getctime(path)
+        if with_md5:
+            file_info.md5 = SystemUtility.get_file_md5(path)
         return file_info
 
+    @staticmethod
+    def get_file_md5(path, chunk_size=1 << 20):
+        md5 = hashlib.md5()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                md5.update(chunk)
+        return md5.hexdigest()
+
     @staticmethod
     def delete_files(path):
         os.remove(path)
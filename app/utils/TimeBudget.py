@@ -0,0 +1,68 @@
+import sys
+import signal
+import threading
+import time
+
+
+class AnalysisTimeout(TimeoutError):
+    """Raised inside a TimeBudget block once its time is used up."""
+
+
+class TimeBudget:
+    """Limits the wall clock time of a block of code.
+
+    The timer is a SIGALRM interval timer, so the block is interrupted wherever it
+    runs, also inside a regex search (the engine checks for signals while it
+    matches), and AnalysisTimeout is raised from there. Signals are only delivered
+    to the main thread: elsewhere, or on platforms without setitimer, the block runs
+    unlimited, available() tells which. A budget of None or 0 never expires. The
+    previous handler and timer are restored when the block ends.
+    """
+
+    def __init__(self, seconds) -> None:
+        self.seconds = seconds
+        self.active = False
+
+    @staticmethod
+    def available():
+        return (
+            hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+        )
+
+    def expire(self, signum, frame):
+        raise AnalysisTimeout(f"time budget of {self.seconds:g}s exceeded")
+
+    def __enter__(self):
+        if not self.seconds or not TimeBudget.available():
+            return self
+        self.started = time.monotonic()
+        self.previous_handler = signal.signal(signal.SIGALRM, self.expire)
+        self.previous_timer = signal.setitimer(signal.ITIMER_REAL, self.seconds)
+        self.active = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if not self.active:
+            return False
+        self.active = False
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        # None when the previous handler was not installed from Python
+        signal.signal(signal.SIGALRM, self.previous_handler or signal.SIG_DFL)
+        delay, interval = self.previous_timer
+        if delay:
+            # An outer timer keeps running for what is left of it
+            remaining = delay - (time.monotonic() - self.started)
+            signal.setitimer(signal.ITIMER_REAL, max(remaining, 1e-6), interval)
+        return False
+
+
+if __name__ == "__main__":
+    import re
+
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    try:
+        with TimeBudget(seconds):
+            re.match(r"(a+)+$", "a" * 40 + "b")
+    except AnalysisTimeout as e:
+        print(f"Interrupted: {e}")